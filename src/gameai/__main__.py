@@ -1,8 +1,213 @@
-from . import game
+import argparse
+import importlib
+import sys
+import time
+from typing import List
 
+from . import config
+from .config.settings_cache import measure_load_times
+from .profiling import FrameProfiler, PhaseTimer
 
-def run():
-    game.Game.load().run()
+# scenes that can be started directly from the command line; these are
+# imported on demand so startup only pays for the scenes it uses
+SCENES = {
+    "menu": ("gameai.scenes.menu", "MainMenu"),
+    "cat": ("gameai.scenes.cat", "CatGame"),
+}
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="gameai")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run a fixed-step simulation without a display or frame cap",
+    )
+    parser.add_argument(
+        "--steps", type=int, default=1000, help="number of headless steps to run"
+    )
+    parser.add_argument(
+        "--render-every",
+        type=int,
+        default=0,
+        metavar="K",
+        help="render every K-th headless step; 0 disables rendering",
+    )
+    parser.add_argument(
+        "--scene",
+        choices=sorted(SCENES),
+        default="cat",
+        help="scene to simulate in headless mode",
+    )
+    parser.add_argument(
+        "--episodes",
+        type=int,
+        default=0,
+        metavar="N",
+        help="run N seeded CatGame episodes of --steps ticks in parallel and exit",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes for --episodes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the first episode for --episodes"
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="record the input of the cat game to an input log at PATH",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="replay an input log headlessly, checking it for divergence, and exit",
+    )
+    parser.add_argument(
+        "--hud",
+        action="store_true",
+        help="show frame phase timings on screen (toggle in game with F3)",
+    )
+    parser.add_argument(
+        "--profile-frames",
+        metavar="PATH",
+        help="time each frame phase and write percentiles to a .csv or .json on exit",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=int,
+        default=0,
+        metavar="N",
+        help="run the first N frames under cProfile and print the top calls",
+    )
+    parser.add_argument(
+        "--cprofile-output",
+        metavar="PATH",
+        help="also write the --cprofile stats to PATH for pstats or snakeviz",
+    )
+    parser.add_argument(
+        "--time-settings",
+        action="store_true",
+        help="report cold (YAML parse) and warm (cached) settings load times",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="break time-to-first-frame down by startup phase and exit",
+    )
+    return parser.parse_args(argv)
+
+
+def _scene_type(name: str):
+    module, cls = SCENES[name]
+    return getattr(importlib.import_module(module), cls)
+
+
+def _profile_startup(headless: bool):
+    timer = PhaseTimer()
+    with timer.phase("import game"):
+        from . import game, scenes
+    with timer.phase("settings"):
+        config.font_registry.warm_up()
+        config.Loadable.preload_settings()
+    with timer.phase("display init"):
+        g = game.Game.load(headless=headless)
+    with timer.phase("main menu load"):
+        menu = scenes.MainMenu.load(screen=g.draw_surface)
+    with timer.phase("first frame"):
+        g._start(menu)
+        g._handle_events()
+        g._tick()
+        g._render()
+
+    print(timer.report())
+    stats = config.font_registry.stats
+    print(
+        f"fonts: {stats.misses} resolved in {stats.resolve_time * 1e3:.2f}ms, "
+        f"index warm-up {stats.warm_up_time * 1e3:.2f}ms"
+    )
+
+
+def _run_episodes(count: int, steps: int, workers: int | None, seed: int):
+    from .episodes import EpisodeRunner, seeded_episodes
+
+    start = time.perf_counter()
+    with EpisodeRunner(workers) as runner:
+        for result in runner.run(seeded_episodes(count, steps, seed)):
+            print(
+                f"seed {result.seed}: position {result.position}, "
+                f"distance {result.distance:.0f}, {result.elapsed * 1e3:.1f}ms "
+                f"(worker {result.worker})"
+            )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{count} episodes on {runner.workers} workers in {elapsed:.2f}s: "
+        f"{count / elapsed:.1f} episodes/s"
+    )
+
+
+def _replay(path: str):
+    from .replay import replay
+
+    result = replay(path)
+    print(result)
+    if result.diverged_at is not None:
+        sys.exit(1)
+
+
+def run(argv: List[str] | None = None):
+    args = _parse_args(argv)
+    if args.time_settings:
+        times = measure_load_times()
+        print(f"cold: {times['cold_ms']:.2f}ms, warm: {times['warm_ms']:.2f}ms")
+        return
+    if args.profile_startup:
+        _profile_startup(args.headless)
+        return
+    if args.episodes:
+        _run_episodes(args.episodes, args.steps, args.workers, args.seed)
+        return
+    if args.replay:
+        _replay(args.replay)
+        return
+
+    # build the system font index while the display and settings load
+    config.font_registry.warm_up()
+    config.Loadable.preload_settings()
+
+    from . import game
+    from .replay import Recorder
+
+    g = game.Game.load(headless=args.headless)
+    if args.hud:
+        g.show_hud()
+    elif args.profile_frames or args.cprofile:
+        g.profiler = FrameProfiler()
+    if args.cprofile:
+        g.profiler.cprofile(args.cprofile, args.cprofile_output)  # type: ignore
+    recorder = None
+    if args.record or (args.headless and args.scene == "cat"):
+        # recorded and headless games must play the same on any machine, so
+        # load the game before the menu can with a time budget for its agents
+        cat_game = _scene_type("cat").load(screen=g.draw_surface, deterministic=True)
+        if args.record:
+            recorder = cat_game.recorder = Recorder.open(args.record, 1 / g.tick_rate)
+
+    if not args.headless:
+        g.run()
+    else:
+        scene = _scene_type(args.scene).load(screen=g.draw_surface)
+        stats = g.simulate(args.steps, render_every=args.render_every, scene=scene)
+        print(stats)
+
+    if recorder is not None:
+        recorder.close()
+        print(f"recorded {recorder.ticks} ticks to {args.record}")
+    if args.profile_frames:
+        g.profiler.export(args.profile_frames)  # type: ignore
+        print(g.profiler.report())  # type: ignore
 
 
 if __name__ == "__main__":
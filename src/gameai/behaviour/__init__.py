@@ -0,0 +1,24 @@
+from .nodes import Action, Check, Guard, OnEvent, WaitFor
+from .runtime import (
+    AgentBehaviour,
+    BehaviourAgent,
+    BehaviourRuntime,
+    BehaviourStats,
+    Blackboard,
+)
+from .scheduler import SchedulerStats, ThinkScheduler
+
+__all__ = [
+    "Action",
+    "AgentBehaviour",
+    "BehaviourAgent",
+    "BehaviourRuntime",
+    "BehaviourStats",
+    "Blackboard",
+    "Check",
+    "Guard",
+    "OnEvent",
+    "SchedulerStats",
+    "ThinkScheduler",
+    "WaitFor",
+]
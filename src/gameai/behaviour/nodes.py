@@ -0,0 +1,206 @@
+from typing import Any, Callable
+
+import pygame
+from edbt import Behaviour, Status
+from edbt.nodes import Decorator
+
+from .runtime import AgentBehaviour, BehaviourAgent
+
+ActionResult = Status | bool | None
+Predicate = Callable[[Any], bool]
+
+
+def _to_status(result: ActionResult) -> Status:
+    if isinstance(result, Status):
+        return result
+    if result is None or result is True:
+        return Status.SUCCESS
+    return Status.FAILURE
+
+
+class Action(AgentBehaviour):
+    """Leaf node that runs a callback against the agent
+
+    The callback may return a Status, or a bool for SUCCESS or FAILURE;
+    returning None counts as SUCCESS. A RUNNING action is not polled: it
+    must subscribe to something, or write to the blackboard, to be woken.
+
+    Args:
+        fn (Callable[[BehaviourAgent], ActionResult]): action to run
+    """
+
+    def __init__(self, fn: Callable[[BehaviourAgent], ActionResult]):
+        super().__init__()
+        self.fn = fn
+
+    def _update(self) -> Status:
+        return _to_status(self.fn(self.agent))
+
+
+class Check(AgentBehaviour):
+    """Leaf node that succeeds if a blackboard value satisfies a predicate
+
+    Args:
+        key (str): blackboard key to check
+        predicate (Predicate): test for the value; defaults to truthiness
+    """
+
+    def __init__(self, key: str, predicate: Predicate = bool):
+        super().__init__()
+        self.key = key
+        self.predicate = predicate
+
+    def _update(self) -> Status:
+        if self.predicate(self.agent.blackboard.get(self.key)):
+            return Status.SUCCESS
+        return Status.FAILURE
+
+
+class WaitFor(AgentBehaviour):
+    """Leaf node that runs until a blackboard value satisfies a predicate
+
+    Observes the key while running and wakes the agent only when a change
+    makes the predicate pass, so waiting costs nothing per tick.
+
+    Args:
+        key (str): blackboard key to observe
+        predicate (Predicate): test for the value; defaults to truthiness
+    """
+
+    def __init__(self, key: str, predicate: Predicate = bool):
+        super().__init__()
+        self.key = key
+        self.predicate = predicate
+        self._observing = False
+
+    def _initialize(self):
+        if not self._observing:
+            self.agent.blackboard.add_observer(self.key, self._on_change)
+            self._observing = True
+
+    def _update(self) -> Status:
+        if self.predicate(self.agent.blackboard.get(self.key)):
+            return Status.SUCCESS
+        return Status.RUNNING
+
+    def _terminate(self):
+        if self._observing:
+            self.agent.blackboard.remove_observer(self.key, self._on_change)
+            self._observing = False
+
+    def abort(self):
+        super().abort()
+        self._terminate()
+
+    def reset(self):
+        super().reset()
+        self._terminate()
+
+    def _on_change(self, value: Any):
+        if self.predicate(value):
+            self.agent.wake()
+
+
+class OnEvent(AgentBehaviour):
+    """Leaf node that runs until the agent receives a pygame event
+
+    Subscribes the agent to the event type while running, so the runtime
+    only wakes it when a matching event is handled.
+
+    Args:
+        event_type (int): pygame event type to wait for
+        predicate (Predicate | None): further test for the event, eg. a
+            check against the key for KEYDOWN events
+    """
+
+    def __init__(self, event_type: int, predicate: Predicate | None = None):
+        super().__init__()
+        self.event_type = event_type
+        self.predicate = predicate
+        self.event: pygame.event.Event | None = None
+        self._subscribed = False
+
+    def _initialize(self):
+        self.event = None
+        runtime = self.agent.runtime
+        if runtime is not None and not self._subscribed:
+            runtime.subscribe_event(self.agent, self.event_type)
+            self._subscribed = True
+
+    def _update(self) -> Status:
+        for event in self.agent.events:
+            if event.type == self.event_type and (
+                self.predicate is None or self.predicate(event)
+            ):
+                self.event = event
+                return Status.SUCCESS
+        return Status.RUNNING
+
+    def _terminate(self):
+        runtime = self.agent.runtime
+        if runtime is not None and self._subscribed:
+            runtime.unsubscribe_event(self.agent, self.event_type)
+        self._subscribed = False
+
+    def abort(self):
+        super().abort()
+        self._terminate()
+
+    def reset(self):
+        super().reset()
+        self._terminate()
+
+
+class Guard(AgentBehaviour, Decorator):
+    """Runs its child while a blackboard value satisfies a predicate
+
+    Unlike `WaitFor`, the key is observed for the lifetime of the tree. When
+    a change flips the predicate, the guard's parent is aborted and the agent
+    woken, so the parent re-selects from its highest priority child: a guard
+    that starts passing preempts lower priority siblings, and one that stops
+    passing interrupts its own running child.
+
+    Args:
+        key (str): blackboard key to observe
+        child (Behaviour): node to run while the predicate passes
+        predicate (Predicate): test for the value; defaults to truthiness
+    """
+
+    def __init__(self, key: str, child: Behaviour, predicate: Predicate = bool):
+        super().__init__(child)
+        self.key = key
+        self.predicate = predicate
+        self._passing = False
+
+    def bind(self, agent: BehaviourAgent, parent: Behaviour | None):
+        super().bind(agent, parent)
+        self._passing = bool(self.predicate(agent.blackboard.get(self.key)))
+        agent.blackboard.add_observer(self.key, self._on_change)
+
+    def _update(self) -> Status:
+        if not self._passing:
+            return Status.FAILURE
+        return self.child.tick()
+
+    def abort(self):
+        super().abort()
+        if self.child.state is Status.RUNNING:
+            self.child.abort()
+
+    def _on_change(self, value: Any):
+        passing = bool(self.predicate(value))
+        if passing is self._passing:
+            return
+        self._passing = passing
+        (self.parent or self).abort()
+        self.agent.wake()
+
+
+__all__ = [
+    "Action",
+    "ActionResult",
+    "Check",
+    "Guard",
+    "OnEvent",
+    "WaitFor",
+]
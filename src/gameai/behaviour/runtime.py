@@ -0,0 +1,229 @@
+import dataclasses
+from typing import Any, Dict, Iterator, List, Tuple
+
+import edbt
+import pygame
+from edbt import Behaviour, BehaviourTree, Status
+
+from gameai.controls import KeyState
+from gameai.sprites import Character2D
+
+from .scheduler import ThinkScheduler
+
+_MISSING = object()
+
+
+class Blackboard(edbt.Blackboard):
+    """Blackboard that only notifies observers when a value actually changes
+
+    Writing the value a key already holds is a no-op, so agents that write
+    their state every frame don't wake the nodes watching it.
+    """
+
+    def __setitem__(self, key, value):
+        if self._values.get(key, _MISSING) == value:
+            return
+        super().__setitem__(key, value)
+
+
+class AgentBehaviour(Behaviour):
+    """Superclass for nodes that need access to the agent running their tree
+
+    The agent is bound when the tree is attached to a `BehaviourAgent`.
+    """
+
+    agent: "BehaviourAgent"
+
+    def bind(self, agent: "BehaviourAgent", parent: Behaviour | None):
+        self.agent = agent
+        self.parent = parent
+
+
+class BehaviourAgent:
+    """Runs a behaviour tree on behalf of a character
+
+    The tree is only ticked when the agent is woken: when a node it is
+    waiting on sees a blackboard change or a pygame event it subscribed to.
+    Composite nodes resume from their running child, so a wake walks a single
+    branch of the tree rather than the whole tree.
+
+    Args:
+        root (Behaviour): root node of the agent's tree
+        character (Character2D | None): character the tree controls
+        blackboard (Blackboard | None): agent state; a new blackboard
+            is created if not set
+        repeat (bool): restart the tree on the next tick after it completes
+    """
+
+    def __init__(
+        self,
+        root: Behaviour,
+        character: Character2D | None = None,
+        blackboard: Blackboard | None = None,
+        repeat: bool = True,
+    ):
+        self.tree = BehaviourTree(root)
+        self.character = character
+        self.blackboard = blackboard if blackboard is not None else Blackboard()
+        self.repeat = repeat
+        # keys the tree's actions press; read by the character each frame
+        self.controls = KeyState()
+        # events delivered since the tree was last ticked
+        self.events: List[pygame.event.Event] = []
+        self.runtime: BehaviourRuntime | None = None
+        for node, parent in _walk(root):
+            if isinstance(node, AgentBehaviour):
+                node.bind(self, parent)
+
+    @property
+    def status(self) -> Status:
+        return self.tree.root.state
+
+    def wake(self):
+        if self.runtime is not None:
+            self.runtime.wake(self)
+
+    def tick(self) -> Status:
+        status = self.tree.tick()
+        self.events.clear()
+        if status is not Status.RUNNING:
+            # start over from the root the next time the agent is woken
+            self.tree.root.reset()
+            if self.repeat:
+                self.wake()
+        return status
+
+
+@dataclasses.dataclass
+class BehaviourStats:
+    """Counters for a behaviour runtime
+
+    Args:
+        ticks (int): number of runtime ticks
+        wakes (int): agent trees ticked, across all runtime ticks
+        events (int): pygame events delivered to at least one agent
+    """
+
+    ticks: int = 0
+    wakes: int = 0
+    events: int = 0
+
+    @property
+    def wakes_per_tick(self) -> float:
+        return self.wakes / self.ticks if self.ticks else 0.0
+
+
+class BehaviourRuntime:
+    """Schedules the behaviour trees of every agent in a scene
+
+    Agents are queued when something their tree is waiting on changes, and
+    each tick only runs the queued agents. An idle agent costs nothing per
+    tick, so the cost of a tick scales with the number of events rather than
+    with the number of agents.
+
+    Args:
+        scheduler (ThinkScheduler | None): limits the time spent ticking
+            trees each frame; if not set, every woken agent runs each tick
+    """
+
+    def __init__(self, scheduler: ThinkScheduler | None = None):
+        self.agents: List[BehaviourAgent] = []
+        self.scheduler = scheduler
+        self.stats = BehaviourStats()
+        # agents to tick next, in the order they were woken
+        self._pending: Dict[BehaviourAgent, None] = {}
+        # subscribed agents per event type, with a count of subscribed nodes
+        self._event_subscribers: Dict[int, Dict[BehaviourAgent, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    def add(self, agent: BehaviourAgent):
+        agent.runtime = self
+        self.agents.append(agent)
+        # give new trees a first tick so their leaves can subscribe
+        self.wake(agent)
+
+    def remove(self, agent: BehaviourAgent):
+        self.agents.remove(agent)
+        self._pending.pop(agent, None)
+        if self.scheduler is not None:
+            self.scheduler.forget(agent)
+        for subscribers in self._event_subscribers.values():
+            subscribers.pop(agent, None)
+        agent.runtime = None
+
+    def clear(self):
+        for agent in self.agents:
+            agent.runtime = None
+        self.agents.clear()
+        self._pending.clear()
+        if self.scheduler is not None:
+            self.scheduler.clear()
+        self._event_subscribers.clear()
+
+    def wake(self, agent: BehaviourAgent):
+        self._pending[agent] = None
+
+    def subscribe_event(self, agent: BehaviourAgent, event_type: int):
+        subscribers = self._event_subscribers.setdefault(event_type, {})
+        subscribers[agent] = subscribers.get(agent, 0) + 1
+
+    def unsubscribe_event(self, agent: BehaviourAgent, event_type: int):
+        subscribers = self._event_subscribers.get(event_type)
+        if not subscribers or agent not in subscribers:
+            return
+        subscribers[agent] -= 1
+        if subscribers[agent] <= 0:
+            del subscribers[agent]
+
+    def handle_event(self, event: pygame.event.Event):
+        subscribers = self._event_subscribers.get(event.type)
+        if not subscribers:
+            return
+        self.stats.events += 1
+        for agent in subscribers:
+            agent.events.append(event)
+            self._pending[agent] = None
+
+    def tick(self) -> int:
+        """Ticks the trees of agents woken since the last tick
+
+        Agents woken while this tick runs are deferred to the next one, as
+        are any the scheduler holds back for budget or LOD.
+
+        Returns:
+            int: number of agent trees ticked
+        """
+        pending, self._pending = self._pending, {}
+        if self.scheduler is None:
+            for agent in pending:
+                agent.tick()
+            ran = len(pending)
+        else:
+            for agent in pending:
+                self.scheduler.request(agent)
+            ran = self.scheduler.run(BehaviourAgent.tick)
+        self.stats.ticks += 1
+        self.stats.wakes += ran
+        return ran
+
+
+def _walk(
+    node: Behaviour, parent: Behaviour | None = None
+) -> Iterator[Tuple[Behaviour, Behaviour | None]]:
+    yield node, parent
+    for child in getattr(node, "children", ()):
+        yield from _walk(child, node)
+    child: Any = getattr(node, "child", None)
+    if isinstance(child, Behaviour):
+        yield from _walk(child, node)
+
+
+__all__ = [
+    "AgentBehaviour",
+    "BehaviourAgent",
+    "BehaviourRuntime",
+    "BehaviourStats",
+    "Blackboard",
+]
@@ -0,0 +1,234 @@
+import dataclasses
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Sequence, Tuple
+
+from gameai.config import LODLevel
+from gameai.types import Coordinate
+
+# default share of a 60fps frame (~16.7ms) to spend on agent think calls
+DEFAULT_THINK_BUDGET_MS = 2.0
+DEFAULT_LOD_LEVELS = (
+    LODLevel(distance=320, interval=1),
+    LODLevel(distance=960, interval=4),
+    LODLevel(distance=math.inf, interval=15),
+)
+
+# level marker for queued agents that are waiting out their LOD interval
+_DELAYED = -1
+
+Locator = Callable[[Any], Coordinate | None]
+
+
+def _character_position(agent: Any) -> Coordinate | None:
+    character = getattr(agent, "character", None)
+    return character.rect.center if character is not None else None
+
+
+@dataclasses.dataclass
+class SchedulerStats:
+    """Counters for a think scheduler
+
+    Args:
+        frames (int): number of frames run
+        thinks (int): think calls made
+        deferred (int): due think calls pushed to a later frame by the budget
+        lod_skipped (int): think requests delayed by an agent's LOD interval
+        overruns (int): frames that went over budget
+        overrun_time (float): seconds spent over budget, across all frames
+        think_time (float): seconds spent thinking, across all frames
+    """
+
+    frames: int = 0
+    thinks: int = 0
+    deferred: int = 0
+    lod_skipped: int = 0
+    overruns: int = 0
+    overrun_time: float = 0
+    think_time: float = 0
+
+    @property
+    def average_ms(self) -> float:
+        return self.think_time / self.frames * 1e3 if self.frames else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.thinks} thinks over {self.frames} frames "
+            f"({self.average_ms:.3f}ms/frame): {self.deferred} deferred, "
+            f"{self.lod_skipped} held by LOD, {self.overruns} overruns"
+        )
+
+
+class ThinkScheduler:
+    """Spreads agent think calls across frames within a budget
+
+    Agents are queued when they need to think and are run oldest first, with
+    agents near the focus point (eg. the player or camera) ahead of distant
+    ones. Distance also selects an LOD level that limits how often an agent
+    may think, so a far agent woken every frame only thinks every few frames.
+    Due work left when the budget runs out is deferred to the next frame. At
+    least one agent thinks each frame, so a slow agent can't stall the queue.
+
+    `run` is called once per tick. The time budget is shared by every tick
+    in a rendered frame, until `end_frame` is called. Which agents think
+    within a time budget depends on how fast the machine is, so games that
+    must be reproducible, such as replays and seeded episodes, should set
+    `budget_ms` to None and limit each tick with `max_thinks` alone.
+
+    Agents are bucketed by LOD level when they're queued, so the cost of a
+    frame depends on the number of think calls made rather than on the
+    length of the queue.
+
+    Args:
+        budget_ms (float | None): time to spend on think calls each frame,
+            or None for no time limit
+        lod_levels (Sequence[LODLevel]): think intervals by distance from
+            the focus point; uses `DEFAULT_LOD_LEVELS` if empty
+        locate (Locator): returns an agent's position, or None for agents
+            that should always use the nearest LOD level
+        max_thinks (int | None): most think calls to make each tick, or
+            None for no limit
+    """
+
+    def __init__(
+        self,
+        budget_ms: float | None = DEFAULT_THINK_BUDGET_MS,
+        lod_levels: Sequence[LODLevel] = DEFAULT_LOD_LEVELS,
+        locate: Locator = _character_position,
+        max_thinks: int | None = None,
+    ):
+        self.budget_ms = budget_ms
+        self.max_thinks = max_thinks
+        lod_levels = lod_levels or DEFAULT_LOD_LEVELS
+        self.lod_levels = sorted(lod_levels, key=lambda lod: lod.distance)
+        self.locate = locate
+        self.focus: Coordinate | None = None
+        self.frame = 0
+        self.stats = SchedulerStats()
+        # queued agents, mapped to their LOD level or _DELAYED
+        self._queued: Dict[Hashable, int] = {}
+        # agents due to think, per LOD level, in the order they were queued
+        self._due: List[Deque[Hashable]] = [deque() for _ in self.lod_levels]
+        # heap of (frame, order, agent) for agents waiting out their interval
+        self._delayed: List[Tuple[int, int, Hashable]] = []
+        self._order = itertools.count()
+        self._last_think: Dict[Hashable, int] = {}
+        # seconds of the time budget used by earlier ticks this frame
+        self._spent = 0.0
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def __contains__(self, agent: Hashable) -> bool:
+        return agent in self._queued
+
+    def request(self, agent: Hashable):
+        """Queues an agent to think; agents already queued keep their place"""
+        if agent not in self._queued:
+            self._enqueue(agent, self.frame + 1)
+
+    def forget(self, agent: Hashable):
+        # stale entries left in the due queues or heap are skipped when popped
+        self._queued.pop(agent, None)
+        self._last_think.pop(agent, None)
+
+    def clear(self):
+        self._queued.clear()
+        for due in self._due:
+            due.clear()
+        self._delayed.clear()
+        self._last_think.clear()
+
+    def lod_level(self, agent: Hashable) -> int:
+        """Returns the index of the LOD level for an agent's distance"""
+        pos = self.locate(agent)
+        if pos is None or self.focus is None:
+            return 0
+        distance = math.dist(pos, self.focus)
+        for i, lod in enumerate(self.lod_levels):
+            if distance <= lod.distance:
+                return i
+        return len(self.lod_levels) - 1
+
+    def run(self, think: Callable[[Any], Any]) -> int:
+        """Makes due think calls for a tick until the budget is spent
+
+        Args:
+            think (Callable[[Any], Any]): called with each agent to run
+
+        Returns:
+            int: number of think calls made
+        """
+        self.frame += 1
+        start = time.perf_counter()
+        # earlier ticks this frame may have used some of the time budget
+        allowed = deadline = None
+        if self.budget_ms is not None:
+            allowed = self.budget_ms / 1e3 - self._spent
+            deadline = start + allowed
+        limit = self.max_thinks
+
+        delayed = self._delayed
+        while delayed and delayed[0][0] <= self.frame:
+            _, _, agent = heapq.heappop(delayed)
+            if self._queued.get(agent) == _DELAYED:
+                # the agent may have moved further away while it waited
+                self._enqueue(agent, self.frame)
+
+        ran = 0
+        for level, due in enumerate(self._due):
+            while due:
+                if ran and (
+                    ran == limit
+                    or (deadline is not None and time.perf_counter() >= deadline)
+                ):
+                    break
+                agent = due.popleft()
+                if self._queued.get(agent) != level:
+                    continue  # forgotten since it was queued
+                # dequeue first so the agent can queue itself again while thinking
+                del self._queued[agent]
+                self._last_think[agent] = self.frame
+                think(agent)
+                ran += 1
+
+        elapsed = time.perf_counter() - start
+        stats = self.stats
+        stats.frames += 1
+        stats.thinks += ran
+        stats.deferred += sum(len(due) for due in self._due)
+        stats.think_time += elapsed
+        if allowed is not None:
+            self._spent += elapsed
+            overrun = elapsed - max(allowed, 0.0)
+            if overrun > 0:
+                stats.overruns += 1
+                stats.overrun_time += overrun
+        return ran
+
+    def end_frame(self):
+        """Gives the ticks of the next frame a fresh time budget"""
+        self._spent = 0.0
+
+    def _enqueue(self, agent: Hashable, frame: int):
+        level = self.lod_level(agent)
+        last = self._last_think.get(agent)
+        ready = frame if last is None else last + self.lod_levels[level].interval
+        if ready <= frame:
+            self._queued[agent] = level
+            self._due[level].append(agent)
+        else:
+            self.stats.lod_skipped += 1
+            self._queued[agent] = _DELAYED
+            heapq.heappush(self._delayed, (ready, next(self._order), agent))
+
+
+__all__ = [
+    "DEFAULT_LOD_LEVELS",
+    "DEFAULT_THINK_BUDGET_MS",
+    "SchedulerStats",
+    "ThinkScheduler",
+]
@@ -0,0 +1,812 @@
+# Times the game's hot paths under SDL's dummy video driver, saves the results
+# as JSON and compares them against a stored baseline. Each case reports the
+# best time per call across several rounds, which is less noisy than the mean
+# on a busy machine. Exits non-zero if any case is slower than its baseline by
+# more than the threshold.
+#
+# Run with `python -m gameai.benchmarks.suite`, or `python -m gameai.benchmarks`
+import argparse
+import atexit
+import dataclasses
+import datetime
+import itertools
+import json
+import os
+import pathlib
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pygame
+import yaml
+from edbt.nodes import Selector, Sequencer
+
+from gameai import config, game, scenes, tilemap
+from gameai.behaviour import (
+    Action,
+    BehaviourAgent,
+    BehaviourRuntime,
+    Check,
+    Guard,
+    ThinkScheduler,
+    WaitFor,
+)
+from gameai.controls import KeyState
+from gameai.drawing import draw_text
+from gameai.env import NUM_ACTIONS, VectorCatGameEnv
+from gameai.episodes import Episode, EpisodeRunner, run_episode, seeded_episodes
+from gameai.scenes.cat import CatGame
+from gameai.sprites import (
+    BatchedDirty,
+    Collision2D,
+    PhysicsWorld,
+    SpatialHash,
+    StaticLayer,
+    Surface2D,
+    cat,
+)
+from gameai.types import ScaleMode
+
+# a case is slower than its baseline if it takes this much longer
+DEFAULT_THRESHOLD = 0.1
+ROUNDS = 5
+RESULTS_FORMAT_VERSION = 1
+# collision levels keep the same density as they grow: each surface gets its
+# own tile
+TILE_SIZE = 64
+SURFACE_SIZE = (48, 16)
+# blackboard changes per behaviour runtime tick
+BEHAVIOUR_EVENTS = 20
+# scheduled agents are scattered around a level this size, with the focus
+# point at its centre, so distant agents fall into the lower LOD levels
+SCHEDULER_LEVEL_SIZE = 4000
+# simulated work per think call, eg. a path query
+THINK_COST_S = 10e-6
+# ticks per benchmark episode
+EPISODE_STEPS = 600
+# physics levels are a floor with platforms scattered above it
+PHYSICS_PLATFORMS = 200
+PHYSICS_LEVEL_WIDTH = 20_000
+# sprites in drawing benchmarks, scattered over the game surface
+DRAW_SPRITES = 5_000
+DRAW_SPRITE_SIZE = (16, 16)
+# static layers bake surfaces from a level this many game surfaces wide
+STATIC_LEVEL_SCREENS = 10
+STATIC_CHUNK_SIZE = 64
+# camera levels keep the same number of characters and platforms per screen
+# as they grow, so culled frames should cost the same however wide they are
+CAMERA_CHARACTERS_PER_SCREEN = 20
+CAMERA_PLATFORMS_PER_SCREEN = 8
+CAMERA_PLATFORM_SIZE = (64, 12)
+# tilemap levels have a floor every 20 rows and platforms in between
+TILEMAP_PLATFORMS_PER_SCREEN = 8
+# pixels the streamed area moves per update
+TILEMAP_SPEED = 8
+
+
+@dataclasses.dataclass
+class Case:
+    """A single timed hot path
+
+    Args:
+        name (str): unique name the case is saved and compared under
+        setup (Callable[[], Callable[[], Any]]): builds the case's state and
+            returns the call to time
+        number (int): calls per round
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    number: int
+
+
+@dataclasses.dataclass
+class Comparison:
+    """Result of a case compared against its baseline
+
+    Args:
+        name (str): case name
+        ms (float): current time per call
+        baseline_ms (float | None): baseline time per call, or None if the
+            case isn't in the baseline
+    """
+
+    name: str
+    ms: float
+    baseline_ms: float | None
+
+    @property
+    def ratio(self) -> float | None:
+        return self.ms / self.baseline_ms if self.baseline_ms else None
+
+    def regressed(self, threshold: float) -> bool:
+        return self.ratio is not None and self.ratio > 1 + threshold
+
+
+class _Collidable:
+    """Minimal SupportsCollision implementation without an image"""
+
+    def __init__(self, rect: pygame.Rect):
+        self.rect = rect
+        self.collision_box = config.CollisionBox(True, True, True, True, rect.copy())
+        self.last_pos = self.collision_box.rect.topleft
+
+
+def _collision_level(count: int, rng: random.Random) -> List[_Collidable]:
+    columns = max(1, int(count**0.5))
+    surfaces = []
+    for i in range(count):
+        row, col = divmod(i, columns)
+        x = col * TILE_SIZE + rng.randrange(TILE_SIZE - SURFACE_SIZE[0])
+        y = row * TILE_SIZE + rng.randrange(TILE_SIZE - SURFACE_SIZE[1])
+        surfaces.append(_Collidable(pygame.Rect((x, y), SURFACE_SIZE)))
+    return surfaces
+
+
+def _collision(count: int, hashed: bool) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        rng = random.Random(0)
+        surfaces = _collision_level(count, rng)
+        target = _Collidable(pygame.Rect(0, 0, 32, 32))
+        objects: Any = surfaces
+        if hashed:
+            objects = SpatialHash()
+            objects.insert(*surfaces)
+
+        def between():
+            # jump the target to a random surface each call so every call
+            # hits a different part of the level
+            dest = rng.choice(surfaces).collision_box.rect
+            target.last_pos = (dest.x, dest.y - 20)
+            target.collision_box.rect.topleft = (dest.x, dest.y - 10)
+            Collision2D.between(target, objects)
+
+        return between
+
+    return setup
+
+
+def _character_move():
+    floor = cat.Floor.new()
+    player = cat.Player.new()
+    rng = random.Random(0)
+    keys = [KeyState(rng.getrandbits(3)) for _ in range(256)]
+    i = 0
+
+    def move():
+        nonlocal i
+        i = (i + 1) & 255
+        player.move(keys[i])
+        c = Collision2D.between(player, [floor])
+        if c:
+            player.handle_collision(c)
+        if player.rect.top > game.GAME_HEIGHT:
+            player._reset()
+
+    return move
+
+
+def _physics_level(rng: random.Random) -> List[cat.Floor]:
+    surfaces = []
+    for i in range(PHYSICS_PLATFORMS):
+        floor = cat.Floor.new()
+        if i:
+            floor.collision_box.rect.update(
+                rng.randrange(PHYSICS_LEVEL_WIDTH), rng.randrange(0, 240), 96, 16
+            )
+        else:
+            floor.collision_box.rect.width = PHYSICS_LEVEL_WIDTH
+        surfaces.append(floor)
+    return surfaces
+
+
+def _physics_cats(count: int, rng: random.Random) -> List[cat.Player]:
+    cats = []
+    for _ in range(count):
+        c = cat.Player.new()
+        c.rect = c.rect.move(rng.randrange(PHYSICS_LEVEL_WIDTH - 64), 0)
+        c.collision_box.rect.move_ip(c.rect.x, 0)
+        c.last_pos = c.collision_box.rect.topleft
+        cats.append(c)
+    return cats
+
+
+def _physics_loop(count: int):
+    def setup():
+        rng = random.Random(0)
+        index = SpatialHash()
+        index.insert(*_physics_level(rng))
+        cats = _physics_cats(count, rng)
+
+        def step():
+            # what a tick costs without batching: each cat moves on its own
+            for c in cats:
+                c.move(KeyState(rng.getrandbits(3)))
+                c.handle_collision(Collision2D.between(c, index))
+
+        return step
+
+    return setup
+
+
+def _physics_world(count: int):
+    def setup():
+        rng = random.Random(0)
+        keys = np.random.default_rng(0)
+        world = PhysicsWorld(count)
+        for surface in _physics_level(rng):
+            world.add_surface(surface)
+        for c in _physics_cats(count, rng):
+            world.add(c)
+        # the first step builds the surface grid, which is only done once
+        world.step()
+
+        def step():
+            # batched callers set every character's keys in one operation
+            world.controls[:count] = keys.integers(8, size=count)
+            world.step()
+
+        return step
+
+    return setup
+
+
+def _draw_text():
+    opts = scenes.MainMenu._load_settings().play_button
+    screen = pygame.Surface((opts.width, opts.height))
+    hovered = False
+
+    def draw():
+        nonlocal hovered
+        # alternate colours so both cached renders are used
+        hovered = not hovered
+        draw_text(opts.text, screen, opts.text_opts, hovered)  # type: ignore
+
+    return draw
+
+
+def _button_update(dirty: bool):
+    def setup():
+        screen = pygame.Surface((game.GAME_WIDTH, game.GAME_HEIGHT))
+        menu = scenes.MainMenu.new(screen=screen)
+        buttons = menu.buttons.sprites()
+        menu.draw()
+
+        def update():
+            # buttons are blitted by their group, so time drawing the group
+            for button in buttons:
+                button.dirty = dirty
+            menu.buttons.update()
+            menu.buttons.draw(screen)
+
+        return update
+
+    return setup
+
+
+@dataclasses.dataclass
+class _LevelSettings(config.Configurable):
+    surfaces: List[config.SurfaceSettings] = dataclasses.field(default_factory=list)
+
+
+def _make_level(count: int, seed: int = 0) -> str:
+    """Generates YAML for a level with count platforms"""
+    rng = random.Random(seed)
+    surfaces = [
+        {
+            "topleft": [rng.randrange(10_000), rng.randrange(10_000)],
+            "layer": rng.randrange(3),
+            "width": rng.randrange(16, 256),
+            "height": 16,
+            "friction_coefficient": round(rng.random(), 2),
+            "collision_box": {"top": True, "left": True, "right": True, "bottom": True},
+        }
+        for _ in range(count)
+    ]
+    return yaml.safe_dump({"surfaces": surfaces})
+
+
+def _from_config(count: int):
+    def setup():
+        data = yaml.safe_load(_make_level(count))
+        return lambda: _LevelSettings.from_config(data)
+
+    return setup
+
+
+def _eat(agent: BehaviourAgent):
+    agent.blackboard["meals"] = agent.blackboard.get("meals", 0) + 1
+    agent.blackboard["hungry"] = False
+
+
+def _flee(agent: BehaviourAgent):
+    agent.blackboard["fled"] = agent.blackboard.get("fled", 0) + 1
+
+
+def _composite(cls, *children):
+    node = cls()
+    for child in children:
+        node.add_child(child)
+    return node
+
+
+def _behaviour_tree():
+    return _composite(
+        Selector,
+        Guard("threatened", _composite(Sequencer, Action(_flee), WaitFor("safe"))),
+        _composite(Sequencer, WaitFor("hungry"), Check("hungry"), Action(_eat)),
+    )
+
+
+def _behaviour(count: int, poll: bool):
+    def setup():
+        rng = random.Random(0)
+        runtime = BehaviourRuntime()
+        for _ in range(count):
+            runtime.add(BehaviourAgent(_behaviour_tree()))
+        runtime.tick()  # let every tree reach its first waiting leaf
+        agents = runtime.agents
+
+        def tick():
+            # the same number of changes every tick, so event-driven ticks
+            # should cost the same however many agents there are
+            for agent in rng.sample(agents, BEHAVIOUR_EVENTS):
+                agent.blackboard["hungry"] = True
+            if poll:
+                # what a tick costs without events: every tree, every tick
+                for agent in agents:
+                    runtime.wake(agent)
+            runtime.tick()
+
+        return tick
+
+    return setup
+
+
+class _Located:
+    """Stands in for a character so the scheduler can locate its agent"""
+
+    def __init__(self, pos):
+        self.rect = pygame.Rect(pos, (32, 32))
+
+
+def _think(agent: BehaviourAgent):
+    end = time.perf_counter() + THINK_COST_S
+    while time.perf_counter() < end:
+        pass
+
+
+def _idle(agent: BehaviourAgent):
+    pass
+
+
+def _scheduler(count: int, budget_ms: float | None, max_thinks: int | None):
+    def setup():
+        rng = random.Random(0)
+        scheduler = ThinkScheduler(budget_ms, max_thinks=max_thinks)
+        scheduler.focus = (SCHEDULER_LEVEL_SIZE // 2, SCHEDULER_LEVEL_SIZE // 2)
+        runtime = BehaviourRuntime(scheduler)
+        # without a time budget, thinks are free so only scheduling is timed
+        think = _think if budget_ms is not None else _idle
+        for _ in range(count):
+            pos = (
+                rng.randrange(SCHEDULER_LEVEL_SIZE),
+                rng.randrange(SCHEDULER_LEVEL_SIZE),
+            )
+            # repeating single-action trees wake themselves again every frame
+            agent = BehaviourAgent(Action(think), character=_Located(pos))  # type: ignore
+            runtime.add(agent)
+
+        def frame():
+            runtime.tick()
+            scheduler.end_frame()
+
+        return frame
+
+    return setup
+
+
+def _episode():
+    return lambda: run_episode(Episode(0, EPISODE_STEPS))
+
+
+def _episode_runner(workers: int):
+    def setup():
+        # the pool is shut down when the interpreter exits
+        runner = EpisodeRunner(workers)
+        # start the pool and let every worker initialize before timing
+        list(runner.run(seeded_episodes(workers, steps=1)))
+        return lambda: list(runner.run(seeded_episodes(workers * 2, EPISODE_STEPS)))
+
+    return setup
+
+
+def _env_step(num_envs: int, pixels: bool):
+    def setup():
+        rng = np.random.default_rng(0)
+        env = VectorCatGameEnv(num_envs, pixels=pixels)
+        env.reset(0)
+        return lambda: env.step(rng.integers(NUM_ACTIONS, size=num_envs))
+
+    return setup
+
+
+class _Sprite(pygame.sprite.DirtySprite):
+    def __init__(self, image: pygame.Surface, topleft):
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect(topleft=topleft)
+
+
+class _LegacySprite(_Sprite):
+    def update(self, *, screen: pygame.Surface):
+        screen.blit(self.image, self.rect)
+
+
+def _draw(moving: float, batched: bool):
+    def setup():
+        rng = random.Random(0)
+        screen = pygame.Surface((game.GAME_WIDTH, game.GAME_HEIGHT))
+        image = pygame.Surface(DRAW_SPRITE_SIZE, pygame.SRCALPHA)
+        pygame.draw.circle(image, "black", (8, 8), 7)
+        cls = _Sprite if batched else _LegacySprite
+        sprites = [
+            cls(
+                image, (rng.randrange(game.GAME_WIDTH), rng.randrange(game.GAME_HEIGHT))
+            )
+            for _ in range(DRAW_SPRITES)
+        ]
+        moved = sprites[: int(DRAW_SPRITES * moving)]
+
+        def move():
+            for sprite in moved:
+                sprite.rect.move_ip(rng.randint(-2, 2), rng.randint(-2, 2))
+                sprite.dirty = 1
+
+        if not batched:
+            # the previous approach: fill the screen, blit every sprite in
+            # update, then again in LayeredDirty.draw
+            group = pygame.sprite.LayeredDirty(*sprites)
+
+            def frame():
+                move()
+                screen.fill("white")
+                group.update(screen=screen)
+                group.draw(screen)
+
+            return frame
+
+        group = BatchedDirty(*sprites, background="white")
+        group.draw(screen)
+
+        def frame():
+            move()
+            group.update()
+            group.draw(screen)
+
+        return frame
+
+    return setup
+
+
+def _static_layer(change: str | None, chunk_size: int | None = STATIC_CHUNK_SIZE):
+    def setup():
+        rng = random.Random(0)
+        width = game.GAME_WIDTH * STATIC_LEVEL_SCREENS
+        image = pygame.Surface(SURFACE_SIZE)
+        image.fill("black")
+        sprites = [
+            _Sprite(image, (rng.randrange(width), rng.randrange(game.GAME_HEIGHT)))
+            for _ in range(DRAW_SPRITES)
+        ]
+        layer = StaticLayer(
+            (game.GAME_WIDTH, game.GAME_HEIGHT),
+            *sprites,
+            background="white",
+            chunk_size=chunk_size,
+        )
+        layer.refresh()
+        view = layer.image.get_rect()
+        edited = next(sprite for sprite in sprites if view.contains(sprite.rect))
+        steps = itertools.cycle((1, -1))
+
+        def frame():
+            if change == "edit":
+                edited.rect.move_ip(next(steps), 0)
+            elif change == "scroll":
+                x, y = layer.origin
+                layer.scroll_to(((x + 4) % (width - game.GAME_WIDTH), y))
+            return layer.refresh()
+
+        return frame
+
+    return setup
+
+
+def _surface(rect: pygame.Rect) -> Surface2D:
+    box = config.CollisionBox(True, True, True, True)
+    return Surface2D(
+        config.SurfaceSettings(
+            topleft=rect.topleft,
+            width=rect.width,
+            height=rect.height,
+            collision_box=box,
+        )
+    )
+
+
+def _camera(screens: int):
+    def setup():
+        rng = random.Random(0)
+        width = screens * game.GAME_WIDTH
+        camera = config.CameraSettings(
+            pygame.Rect(0, 0, game.GAME_WIDTH, game.GAME_HEIGHT),
+            bounds=pygame.Rect(0, 0, width, game.GAME_HEIGHT),
+        )
+        settings = dataclasses.replace(CatGame._load_settings(), camera=camera)
+        g = CatGame(settings, pygame.Surface((game.GAME_WIDTH, game.GAME_HEIGHT)))
+        floor = pygame.Rect(0, game.GAME_HEIGHT - 40, width, 20)
+        g.add_surface(_surface(floor))
+        for _ in range(screens * CAMERA_PLATFORMS_PER_SCREEN):
+            x = rng.randrange(width - CAMERA_PLATFORM_SIZE[0])
+            y = rng.randrange(100, game.GAME_HEIGHT - 80)
+            g.add_surface(_surface(pygame.Rect((x, y), CAMERA_PLATFORM_SIZE)))
+        for _ in range(screens * CAMERA_CHARACTERS_PER_SCREEN - 1):
+            character = cat.Player.new()
+            character.rect = character.rect.move(rng.randrange(width), 0)
+            g.characters.add(character)
+            g.physics.add(character)
+        # everyone presses keys at random, so characters are mid-move and
+        # every frame draws them at a different point between ticks
+        for _ in range(10):
+            for character in g.physics.characters:
+                character.body.controls.mask = rng.getrandbits(3)
+            g.physics.step()
+        alphas = itertools.cycle((0.25, 0.75))
+
+        def frame():
+            g.interpolate(next(alphas))
+            return g.draw()
+
+        return frame
+
+    return setup
+
+
+def _tilemap_level(size: int) -> pathlib.Path:
+    rng = np.random.default_rng(0)
+    tiles = np.zeros((size, size), np.uint8)
+    tiles[19::20] = 1
+    screen_tiles = (game.GAME_WIDTH // tilemap.DEFAULT_TILE_SIZE) * (
+        game.GAME_HEIGHT // tilemap.DEFAULT_TILE_SIZE
+    )
+    count = size * size * TILEMAP_PLATFORMS_PER_SCREEN // screen_tiles
+    rows = rng.integers(0, size, count)
+    cols = rng.integers(0, size - 8, count)
+    for width in range(2, 9):
+        tiles[rows, cols + width - 2] = 2
+    # removed when the interpreter exits
+    directory = tempfile.mkdtemp(prefix="gameai-benchmarks-")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    path = pathlib.Path(directory) / f"level{size}.map"
+    tilemap.save(path, tiles)
+    return path
+
+
+def _tilemap_open(size: int):
+    def setup():
+        path = _tilemap_level(size)
+        area = pygame.Rect(0, 0, game.GAME_WIDTH, game.GAME_HEIGHT)
+
+        def open_level():
+            # open the map and build the chunks the starting area needs
+            streamer = tilemap.ChunkStreamer(tilemap.TileMap(path), background=False)
+            streamer.update(area)
+            return streamer.close()
+
+        return open_level
+
+    return setup
+
+
+def _tilemap_stream(size: int):
+    def setup():
+        level = tilemap.TileMap(_tilemap_level(size))
+        streamer = tilemap.ChunkStreamer(level)
+        area = pygame.Rect(0, 0, game.GAME_WIDTH, game.GAME_HEIGHT)
+        streamer.update(area)
+        bounds = level.rect
+        # sweep diagonally back and forth across the level
+        velocity = [TILEMAP_SPEED, TILEMAP_SPEED // 2]
+
+        def update():
+            moved = area.move(velocity)
+            if not bounds.contains(moved):
+                velocity[0], velocity[1] = -velocity[0], -velocity[1]
+                moved = area.move(velocity)
+            area.topleft = moved.topleft
+            return streamer.update(area)
+
+        return update
+
+    return setup
+
+
+def _render(size, mode: ScaleMode, full: bool = True):
+    def setup():
+        settings = config.GameSettings(60, size[0], size[1], False, mode)
+        g = game.Game(settings, headless=True)
+        g._start(scenes.MainMenu.new(screen=g.draw_surface))
+
+        def render():
+            # idle frames have nothing dirty, so only the scene's draw runs
+            g._full_redraw = full
+            g._render()
+
+        return render
+
+    return setup
+
+
+CASES = [
+    Case("collision.linear.1000", _collision(1_000, hashed=False), 200),
+    Case("collision.hashed.1000", _collision(1_000, hashed=True), 2_000),
+    Case("collision.hashed.100000", _collision(100_000, hashed=True), 2_000),
+    Case("character.move", _character_move, 5_000),
+    Case("physics.loop.1000", _physics_loop(1_000), 10),
+    Case("physics.world.1", _physics_world(1), 2_000),
+    Case("physics.world.1000", _physics_world(1_000), 50),
+    Case("physics.world.10000", _physics_world(10_000), 10),
+    Case("text.draw", _draw_text, 2_000),
+    Case("button.update.clean", _button_update(dirty=False), 2_000),
+    Case("button.update.dirty", _button_update(dirty=True), 500),
+    Case("config.from_config.1000", _from_config(1_000), 5),
+    Case("config.from_config.10000", _from_config(10_000), 1),
+    Case("behaviour.events.100", _behaviour(100, poll=False), 200),
+    Case("behaviour.events.10000", _behaviour(10_000, poll=False), 200),
+    Case("behaviour.polled.1000", _behaviour(1_000, poll=True), 20),
+    # a budgeted frame should take about the budget, however many agents wake
+    Case("scheduler.budget.5000", _scheduler(5_000, 2.0, None), 50),
+    # scheduling overhead alone, with deterministic no-op thinks
+    Case("scheduler.max_thinks.5000", _scheduler(5_000, None, 200), 50),
+    Case("episode.600", _episode, 2),
+    # compare against episode.600 for how well episodes scale across workers
+    Case("episodes.runner.2", _episode_runner(2), 1),
+    Case("env.step.state.8", _env_step(8, pixels=False), 100),
+    Case("env.step.pixels.8", _env_step(8, pixels=True), 50),
+    Case("draw.legacy.5000", _draw(0.01, batched=False), 20),
+    Case("draw.batched.5000.idle", _draw(0.0, batched=True), 200),
+    Case("draw.batched.5000", _draw(0.01, batched=True), 100),
+    Case("draw.batched.5000.moving", _draw(0.1, batched=True), 20),
+    Case("static.clean", _static_layer(None), 2_000),
+    Case("static.edit", _static_layer("edit"), 500),
+    Case("static.edit.whole", _static_layer("edit", None), 50),
+    Case("static.scroll", _static_layer("scroll"), 50),
+    # stepping physics isn't timed; only culling, positioning and drawing
+    Case("camera.draw.1", _camera(1), 500),
+    Case("camera.draw.10", _camera(10), 500),
+    Case("camera.draw.100", _camera(100), 500),
+    # opening a level should take the same time however large it is
+    Case("tilemap.open.100", _tilemap_open(100), 100),
+    Case("tilemap.open.4000", _tilemap_open(4_000), 100),
+    Case("tilemap.stream.4000", _tilemap_stream(4_000), 1_000),
+    Case("render.720p.smooth", _render((1280, 720), ScaleMode.SMOOTH), 20),
+    Case("render.1080p.smooth", _render((1920, 1080), ScaleMode.SMOOTH), 10),
+    Case("render.1080p.nearest", _render((1920, 1080), ScaleMode.NEAREST), 20),
+    Case("render.1080p.integer", _render((1920, 1080), ScaleMode.INTEGER), 20),
+    Case("render.1440p.smooth", _render((2560, 1440), ScaleMode.SMOOTH), 10),
+    Case("render.1440p.nearest", _render((2560, 1440), ScaleMode.NEAREST), 10),
+    Case("render.1440p.integer", _render((2560, 1440), ScaleMode.INTEGER), 20),
+    Case("render.4K.smooth", _render((3840, 2160), ScaleMode.SMOOTH), 5),
+    Case("render.4K.nearest", _render((3840, 2160), ScaleMode.NEAREST), 5),
+    Case("render.4K.integer", _render((3840, 2160), ScaleMode.INTEGER), 5),
+    Case(
+        "render.1080p.idle",
+        _render((1920, 1080), ScaleMode.SMOOTH, full=False),
+        2_000,
+    ),
+]
+
+
+def _init_headless():
+    os.environ["SDL_VIDEODRIVER"] = game.HEADLESS_VIDEO_DRIVER
+    pygame.display.init()
+    pygame.font.init()
+    # rendering needs a display surface, and images need it to convert
+    pygame.display.set_mode((game.GAME_WIDTH, game.GAME_HEIGHT))
+    config.Loadable.preload_settings()
+
+
+def run(cases: List[Case] = CASES, rounds: int = ROUNDS) -> List[Dict]:
+    _init_headless()
+    results = []
+    for case in cases:
+        timer = timeit.Timer(case.setup())
+        best = min(timer.repeat(rounds, case.number))
+        results.append({"name": case.name, "ms": best / case.number * 1e3})
+    return results
+
+
+def save(results: List[Dict], path: str | pathlib.Path):
+    """Writes results as JSON, along with the environment they were run in"""
+    data = {
+        "version": RESULTS_FORMAT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": {r["name"]: r["ms"] for r in results},
+    }
+    pathlib.Path(path).write_text(json.dumps(data, indent=2) + "\n")
+
+
+def load(path: str | pathlib.Path) -> Dict[str, float]:
+    """Reads saved results as a dict of case name to milliseconds per call"""
+    data = json.loads(pathlib.Path(path).read_text())
+    if data.get("version") != RESULTS_FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark results version in {path}")
+    return data["results"]
+
+
+def compare(results: List[Dict], baseline: Dict[str, float]) -> List[Comparison]:
+    return [Comparison(r["name"], r["ms"], baseline.get(r["name"])) for r in results]
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m gameai.benchmarks")
+    parser.add_argument("-o", "--output", help="save results as JSON to this path")
+    parser.add_argument("-b", "--baseline", help="compare against saved results")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fraction slower than the baseline that counts as a regression "
+        f"(default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="only run cases whose names contain this string",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=ROUNDS, help="timed rounds per case"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = _parse_args(argv)
+    cases = [case for case in CASES if args.filter in case.name]
+    results = run(cases, args.rounds)
+    if args.output:
+        save(results, args.output)
+
+    baseline = load(args.baseline) if args.baseline else {}
+    comparisons = compare(results, baseline)
+    print(f"{'case':<26} {'ms/call':>10} {'baseline':>10} {'change':>8}")
+    for c in comparisons:
+        if c.ratio is None:
+            print(f"{c.name:<26} {c.ms:>10.4f} {'-':>10} {'-':>8}")
+            continue
+        flag = "  REGRESSED" if c.regressed(args.threshold) else ""
+        print(
+            f"{c.name:<26} {c.ms:>10.4f} {c.baseline_ms:>10.4f} "
+            f"{c.ratio - 1:>+8.1%}{flag}"
+        )
+
+    regressions = [c.name for c in comparisons if c.regressed(args.threshold)]
+    if regressions:
+        print(f"{len(regressions)} regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import pygame
+
+from . import config
+from .types import Coordinate
+
+# distance outside the viewport that objects are still treated as visible,
+# so sprites drawn between ticks don't pop in at the edges
+CULL_MARGIN = 32
+
+
+class Camera:
+    """Scrolling view onto a scene's world
+
+    The viewport is the area of the world drawn to the screen. Scenes move
+    it with `look_at`, and draw sprites offset by `offset`. Objects outside
+    `visible_area` can be skipped when updating and drawing, so that the
+    cost of a frame depends on what's on screen rather than on the size of
+    the level.
+
+    Args:
+        settings (CameraSettings): viewport and bounds to scroll within
+    """
+
+    def __init__(self, settings: config.CameraSettings):
+        self.viewport = pygame.Rect(settings.viewport)
+        self.bounds = pygame.Rect(settings.bounds) if settings.bounds else None
+
+    @property
+    def offset(self) -> Coordinate:
+        """Translation from world to screen coordinates"""
+        return (-self.viewport.x, -self.viewport.y)
+
+    @property
+    def visible_area(self) -> pygame.Rect:
+        """Viewport plus the cull margin, in world coordinates"""
+        return self.viewport.inflate(2 * CULL_MARGIN, 2 * CULL_MARGIN)
+
+    def look_at(self, pos: Coordinate) -> bool:
+        """Centres the viewport on pos, within bounds
+
+        Returns:
+            bool: whether the viewport moved
+        """
+        topleft = self.viewport.topleft
+        self.viewport.center = (round(pos[0]), round(pos[1]))
+        if self.bounds is not None:
+            self.viewport.clamp_ip(self.bounds)
+        return self.viewport.topleft != topleft
+
+
+__all__ = [
+    "CULL_MARGIN",
+    "Camera",
+]
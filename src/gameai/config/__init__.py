@@ -1,4 +1,7 @@
+from .cache import CacheEntryStats, LoadableCache, loadable_cache
+from .fonts import FontRegistry, font_registry
 from .io import Configurable, Loadable
+from .resources import ASSETS_DIR, AssetManager, asset_manager, surface_bytes
 from .settings import (
     ButtonOptions,
     CameraSettings,
@@ -8,12 +11,14 @@ from .settings import (
     CollidableSettings,
     CollisionBox,
     GameSettings,
+    LODLevel,
     MainMenuSettings,
     OptionsMenuSettings,
     SpriteOptions,
     SurfaceSettings,
     TextOptions,
 )
+from .settings_cache import SettingsCache, settings_cache
 
 # settings file names; keep these in one place so it's easier to
 # update them all if we change the config language, for example
@@ -25,11 +30,23 @@ OPTIONS_MENU_SETTINGS_FILE = "options_menu.yml"
 __all__ = [
     "Configurable",
     "Loadable",
+    "CacheEntryStats",
+    "LoadableCache",
+    "loadable_cache",
+    "FontRegistry",
+    "font_registry",
+    "ASSETS_DIR",
+    "AssetManager",
+    "asset_manager",
+    "surface_bytes",
+    "SettingsCache",
+    "settings_cache",
     "CameraSettings",
     "CharacterSettings",
     "CollidableSettings",
     "CollisionBox",
     "GameSettings",
+    "LODLevel",
     "TextOptions",
     "SpriteOptions",
     "ButtonOptions",
@@ -0,0 +1,219 @@
+import collections
+import dataclasses
+import sys
+import threading
+from typing import Any, Dict, List
+
+from .settings_cache import settings_cache
+
+INSTANCE = "instance"
+SETTINGS = "settings"
+
+
+@dataclasses.dataclass
+class CacheEntryStats:
+    """Memory use of a cached object
+
+    Args:
+        key (str): class name for instances, or file name for settings
+        kind (str): "instance" or "settings"
+        resident_bytes (int): estimated memory held by the object
+        pinned (bool): whether the object is in use and can't be evicted
+    """
+
+    key: str
+    kind: str
+    resident_bytes: int
+    pinned: bool
+
+
+@dataclasses.dataclass
+class _Entry:
+    value: Any
+    kind: str
+    # settings trees don't change once parsed, so they're measured once
+    size: int | None = None
+
+
+class LoadableCache:
+    """Least recently used cache of loaded instances and settings trees
+
+    Loadable singletons and parsed settings are kept here so they're only
+    loaded once. When the estimated memory held by cached entries goes over
+    `budget_bytes`, the least recently used are evicted until it fits again.
+    Pinned instances, such as scenes on the scene stack, are never evicted,
+    and nor are instances without an `unload` method. Evicted instances are
+    unloaded to release their surfaces, and are loaded again from scratch
+    next time they're needed.
+
+    Instances report their size with a `resident_bytes` property; surfaces
+    shared through the asset manager are counted by its stats rather than
+    here.
+
+    Args:
+        budget_bytes (int | None): memory to keep cached entries within, or
+            None for no limit
+    """
+
+    def __init__(self, budget_bytes: int | None = None):
+        self.budget_bytes = budget_bytes
+        self.evictions = 0
+        self._entries: collections.OrderedDict[str, _Entry] = collections.OrderedDict()
+        # pin counts by object id, as a scene can be on the stack twice
+        self._pins: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns a cached object, marking it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def put(self, key: str, value: Any, kind: str = INSTANCE):
+        """Caches an object, evicting others if it takes the cache over budget
+
+        Args:
+            key (str): class name for instances, or file name for settings
+            value (Any): object to cache
+            kind (str): "instance" or "settings"
+        """
+        with self._lock:
+            self._entries[key] = _Entry(value, kind)
+            self._entries.move_to_end(key)
+        # never evict what was just loaded, even if it's over budget alone
+        self.trim(keep=key)
+
+    def is_cached(self, value: Any) -> bool:
+        """Returns whether the object itself is still cached"""
+        with self._lock:
+            return any(entry.value is value for entry in self._entries.values())
+
+    def pin(self, value: Any):
+        """Keeps an object from being evicted until it's unpinned"""
+        with self._lock:
+            self._pins[id(value)] = self._pins.get(id(value), 0) + 1
+
+    def unpin(self, value: Any):
+        """Undoes a pin
+
+        Nothing is evicted until the next load, so a scene can be ended and
+        another pushed without either being evicted in between.
+        """
+        with self._lock:
+            count = self._pins.get(id(value), 0) - 1
+            if count > 0:
+                self._pins[id(value)] = count
+            else:
+                self._pins.pop(id(value), None)
+
+    def evict(self, value: Any) -> bool:
+        """Evicts and unloads an object now, unless it's pinned
+
+        Returns:
+            bool: whether the object was cached and has been evicted
+        """
+        with self._lock:
+            if id(value) in self._pins:
+                return False
+            key = next((k for k, e in self._entries.items() if e.value is value), None)
+            if key is None:
+                return False
+            entry = self._entries.pop(key)
+            self.evictions += 1
+        self._unload(key, entry)
+        return True
+
+    def trim(self, keep: str | None = None):
+        """Evicts least recently used entries until the cache is within budget
+
+        Args:
+            keep (str | None): key of an entry not to evict
+        """
+        if self.budget_bytes is None:
+            return
+        evicted = []
+        with self._lock:
+            total = sum(self._size(e) for e in self._entries.values())
+            for key, entry in list(self._entries.items()):
+                if total <= self.budget_bytes:
+                    break
+                if key == keep or not self._evictable(entry):
+                    continue
+                total -= self._size(entry)
+                del self._entries[key]
+                evicted.append((key, entry))
+            self.evictions += len(evicted)
+        # unload outside the lock, as unloading can take a while
+        for key, entry in evicted:
+            self._unload(key, entry)
+
+    def clear(self):
+        """Drops every entry without unloading anything"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> List[CacheEntryStats]:
+        """Returns the size of each entry, least recently used first"""
+        with self._lock:
+            return [
+                CacheEntryStats(
+                    key, entry.kind, self._size(entry), id(entry.value) in self._pins
+                )
+                for key, entry in self._entries.items()
+            ]
+
+    @property
+    def resident_bytes(self) -> int:
+        """Estimated memory held by every cached entry"""
+        with self._lock:
+            return sum(self._size(e) for e in self._entries.values())
+
+    def _evictable(self, entry: _Entry) -> bool:
+        if entry.kind == SETTINGS:
+            return True
+        return id(entry.value) not in self._pins and hasattr(entry.value, "unload")
+
+    def _size(self, entry: _Entry) -> int:
+        if entry.kind == SETTINGS:
+            if entry.size is None:
+                entry.size = _tree_size(entry.value)
+            return entry.size
+        # instances change size as they run, so ask them each time
+        return getattr(entry.value, "resident_bytes", 0)
+
+    def _unload(self, key: str, entry: _Entry):
+        if entry.kind == SETTINGS:
+            # the settings cache holds the same tree, so let it go too
+            settings_cache.forget(key)
+        else:
+            entry.value.unload()
+
+
+def _tree_size(value: Any) -> int:
+    """Estimates the memory held by a parsed settings tree"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_tree_size(k) + _tree_size(v) for k, v in value.items())
+    elif isinstance(value, list):
+        size += sum(_tree_size(v) for v in value)
+    return size
+
+
+# shared cache of Loadable instances and settings
+loadable_cache = LoadableCache()
+
+
+__all__ = [
+    "CacheEntryStats",
+    "LoadableCache",
+    "loadable_cache",
+]
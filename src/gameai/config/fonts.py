@@ -0,0 +1,125 @@
+import dataclasses
+import threading
+import time
+from typing import Dict, Hashable, Iterable, Tuple
+
+import pygame
+
+FontName = str | bytes | Iterable[str] | None
+FontSpec = Tuple[Hashable, int, bool, bool]
+
+
+@dataclasses.dataclass
+class FontRegistryStats:
+    """Counters for font registry lookups
+
+    Args:
+        hits (int): lookups served by an already resolved font
+        misses (int): lookups that had to resolve a new system font
+        resolve_time (float): seconds spent resolving new fonts
+        warm_up_time (float): seconds spent building the system font index
+    """
+
+    hits: int = 0
+    misses: int = 0
+    resolve_time: float = 0
+    warm_up_time: float = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+
+class FontRegistry:
+    """Process-wide registry of shared system fonts
+
+    `pygame.font.SysFont` looks the font up in the system font index and
+    opens the font file on every call, and the first call also has to scan
+    the system font directories to build that index. The registry resolves
+    each (name, size, bold, italic) spec once and returns the same `Font`
+    for every identical request.
+    """
+
+    def __init__(self):
+        self.stats = FontRegistryStats()
+        self._fonts: Dict[FontSpec, pygame.font.Font] = {}
+        self._lock = threading.Lock()
+        self._warm_up_thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+    def get(
+        self, name: FontName, size: int, bold: bool = False, italic: bool = False
+    ) -> pygame.font.Font:
+        spec = (_name_key(name), size, bold, italic)
+        font = self._fonts.get(spec)
+        if font is not None:
+            with self._lock:
+                self.stats.hits += 1
+            return font
+
+        # resolving a font needs the system font index, so let an in-progress
+        # warm-up finish rather than scanning the font directories twice
+        self._wait_for_warm_up()
+        with self._lock:
+            font = self._fonts.get(spec)
+            if font is not None:
+                self.stats.hits += 1
+                return font
+
+            start = time.perf_counter()
+            # pass the key, as building it may have used up an iterator
+            font = pygame.font.SysFont(spec[0], size, bold, italic)
+            self.stats.resolve_time += time.perf_counter() - start
+            self.stats.misses += 1
+            self._fonts[spec] = font
+            return font
+
+    def warm_up(self, background: bool = True):
+        """Builds the system font index ahead of the first font lookup
+
+        Args:
+            background (bool): scan on a daemon thread rather than blocking
+        """
+        if self._warm_up_thread is not None:
+            return
+        if not background:
+            self._warm_up()
+            return
+        self._warm_up_thread = threading.Thread(
+            target=self._warm_up, name="font-warm-up", daemon=True
+        )
+        self._warm_up_thread.start()
+
+    def clear(self):
+        with self._lock:
+            self._fonts.clear()
+
+    def _warm_up(self):
+        start = time.perf_counter()
+        pygame.font.get_fonts()
+        self.stats.warm_up_time = time.perf_counter() - start
+
+    def _wait_for_warm_up(self):
+        thread = self._warm_up_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+def _name_key(name: FontName) -> Hashable:
+    # SysFont accepts iterables of names, which may not be hashable
+    if name is None or isinstance(name, (str, bytes)):
+        return name
+    return tuple(name)
+
+
+# shared registry used when decoding font settings
+font_registry = FontRegistry()
+
+
+__all__ = [
+    "FontRegistry",
+    "FontRegistryStats",
+    "font_registry",
+]
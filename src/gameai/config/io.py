@@ -1,20 +1,51 @@
 import dataclasses
 import enum
-import pathlib
 from inspect import isclass, signature
 from types import UnionType
-from typing import Any, Protocol, Type, TypeVar, Union, get_args, get_origin
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Protocol,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
 
 import pygame
-import yaml
 
-RESOURCE_DIR = pathlib.Path(__file__).parent
-SETTINGS_DIR = RESOURCE_DIR / "settings"
-ASSETS_DIR = RESOURCE_DIR / "assets"
+from .cache import SETTINGS, loadable_cache
+from .fonts import font_registry
+from .resources import asset_manager
+from .settings_cache import SETTINGS_DIR, SettingsParseError, settings_cache
 
 ConfigurableT_co = TypeVar("ConfigurableT_co", bound="Configurable")
 
 
+Converter = Callable[[Any], Any]
+
+
+@dataclasses.dataclass
+class _DecoderPlan:
+    """Reflection results for decoding a Configurable class
+
+    Args:
+        params (frozenset[str]): names accepted by the class constructor
+        converters (List[Tuple[str, Converter]]): per-field value decoders
+    """
+
+    params: frozenset[str]
+    converters: List[Tuple[str, Converter]]
+
+
+# decoder plans are compiled once per class on first use
+_plans: Dict[type, _DecoderPlan] = {}
+
+
 # XXX: this whole module uses a lot of reflection magic
 @dataclasses.dataclass
 class Configurable:
@@ -25,12 +56,13 @@ class Configurable:
 
     @classmethod
     def from_config(cls: Type[ConfigurableT_co], data: dict) -> ConfigurableT_co:
-        cls_fields = {field for field in signature(cls).parameters}
+        plan = _plans.get(cls) or _compile_plan(cls)
+        params = plan.params
 
         data = data or {}
         defined_params, undefined_params = {}, {}
         for k, v in data.items():
-            if k in cls_fields:
+            if k in params:
                 defined_params[k] = v
             else:
                 undefined_params[k] = v
@@ -40,59 +72,75 @@ class Configurable:
         for k, v in undefined_params.items():
             setattr(o, k, v)
 
-        o._unmarshal_complex_types()
+        values = o.__dict__
+        for name, convert in plan.converters:
+            values[name] = convert(values[name])
         return o
 
-    def _unmarshal_complex_types(self) -> None:
-        for field in dataclasses.fields(self):
-            value = getattr(self, field.name)
-            unmarshalled_value = self._unmarshal_field(field.type, value)
-            setattr(self, field.name, unmarshalled_value)
 
-    def _unmarshal_field(self, type_, value) -> Any:
-        if value is None:
-            return None
-
-        if isinstance(value, Configurable):
-            # if the value is already a Loadable type
+def _compile_plan(cls: type) -> _DecoderPlan:
+    plan = _DecoderPlan(
+        params=frozenset(signature(cls).parameters),
+        converters=[
+            (f.name, _compile_converter(f.type)) for f in dataclasses.fields(cls)
+        ],
+    )
+    _plans[cls] = plan
+    return plan
+
+
+def _compile_converter(type_) -> Converter:
+    """Resolves the decode logic for a field type ahead of time"""
+    decode_class = None
+    if get_origin(type_) in (Union, UnionType):
+        # the first special case class in a union always wins
+        for t in get_args(type_):
+            if isclass(t):
+                decode_class = _class_decoder(t)
+                if decode_class is not None:
+                    break
+    elif isclass(type_):
+        decode_class = _class_decoder(type_)
+
+    # container values are decoded using the type's own parameters, eg.
+    # List[T] decodes each element as T and Dict[K, V] decodes values as V
+    args = getattr(type_, "__args__", None) or ()
+    decode_item = _compile_converter(args[0]) if args else None
+    decode_value = _compile_converter(args[1]) if len(args) == 2 else None
+
+    def convert(value: Any) -> Any:
+        if value is None or isinstance(value, Configurable):
+            # if the value is already a Configurable type
             # instance, no need to continue
             return value
-        elif get_origin(type_) in (Union, UnionType):
-            for t in get_args(type_):
-                if isclass(t):
-                    o = self._unmarshal_class(t, value)
-                    if o is not None:
-                        return o
-        elif isclass(type_):
-            instance = self._unmarshal_class(type_, value)
-            if instance is not None:
-                return instance
-
+        if decode_class is not None:
+            return decode_class(value)
         if isinstance(value, list):
-            # if the value is a list, expect the field type to be List[T]
-            type_ = type_.__args__[0]
-            return list(self._unmarshal_field(type_, o) for o in value)
-        elif isinstance(value, dict):
-            if hasattr(type_, "__args__") and len(type_.__args__) == 2:
-                return {
-                    k: self._unmarshal_field(type_.__args__[1], v)
-                    for k, v in value.items()
-                }
-            else:
-                return {k: v for k, v in value.items()}
+            if decode_item is None:
+                return list(value)
+            return [decode_item(o) for o in value]
+        if isinstance(value, dict):
+            if decode_value is None:
+                return dict(value)
+            return {k: decode_value(v) for k, v in value.items()}
         return value
 
-    def _unmarshal_class(self, type_: type, value: Any) -> Any:
-        # decode logic for special case clases
-        if issubclass(type_, enum.Enum):
-            return type_(value)
-        elif issubclass(type_, Configurable):
-            return type_.from_config(value)
-        elif type_ is pygame.font.Font:
-            return pygame.font.SysFont(**value)
-        elif type_ is pygame.Surface:
-            return pygame.image.load(ASSETS_DIR / value)
-        return None
+    return convert
+
+
+def _class_decoder(type_: type) -> Converter | None:
+    # decode logic for special case clases
+    if issubclass(type_, enum.Enum):
+        return type_
+    elif issubclass(type_, Configurable):
+        return type_.from_config
+    elif type_ is pygame.font.Font:
+        return lambda value: font_registry.get(**value)
+    elif type_ is pygame.Surface:
+        return asset_manager.get
+    elif type_ is pygame.Rect:
+        return pygame.Rect
+    return None
 
 
 # pyright (and thus pylance) has a strict approach to abstract property types,
@@ -115,9 +163,11 @@ LoadableT = TypeVar("LoadableT", bound=SupportsLoad[Configurable])
 
 
 class Loadable:
-    """Mixin to mark scenes as loadable from YAML"""
+    """Mixin to mark scenes as loadable from YAML
 
-    __loaded = {}
+    Loaded instances and settings are kept in `loadable_cache`, which may
+    evict and unload them once they're no longer in use.
+    """
 
     # needed for mixin as otherwise we may have super() conflicts with
     # subclasses that also inherit from another parent
@@ -128,33 +178,61 @@ class Loadable:
     def load(cls: Type[LoadableT], *args, **kwargs) -> LoadableT:
         """Loads referencing class from settings file
 
-        Passes arguments to the class constructor.
-        Caches classes and files so they are only loaded once.
+        Passes arguments to the class constructor. Settings that have
+        already been loaded can be passed in as `settings`.
+        Caches classes and files so they are only loaded once, or again
+        after being evicted from the cache.
         """
-        # XXX: this works well for singleton classes like menus, but there may
-        # be future classes that require a new instance on load()
-        if cls.__name__ in Loadable.__loaded:
-            return Loadable.__loaded[cls.__name__]
-
-        settings = cls._load_settings()
-        o = cls(*args, **kwargs, settings=settings)
-        Loadable.__loaded[cls.__name__] = o
+        # this works well for singleton classes like menus; classes that need
+        # an independent instance per caller should use new() instead
+        o = loadable_cache.get(cls.__name__)
+        if o is not None:
+            return o
+
+        if "settings" not in kwargs:
+            kwargs["settings"] = cls._load_settings()
+        o = cls(*args, **kwargs)
+        loadable_cache.put(cls.__name__, o)
         return o
 
+    @classmethod
+    def new(cls: Type[LoadableT], *args, **kwargs) -> LoadableT:
+        """Creates a new instance of the referencing class from its settings file
+
+        Unlike `load`, the instance isn't cached, so every call returns an
+        independent object with its own copy of the settings.
+        """
+        return cls(*args, **kwargs, settings=cls._load_settings())
+
+    @staticmethod
+    def preload_settings():
+        """Reads every file in the settings directory in a single pass
+
+        Settings trees are cached so later loads don't touch the disk.
+        """
+        try:
+            for filename, settings in settings_cache.load_all().items():
+                loadable_cache.put(filename, settings, SETTINGS)
+        except SettingsParseError as e:
+            print(f"Failed to read YAML from {SETTINGS_DIR}: {e}")
+            raise pygame.error(
+                f"Failed to read configuration from {SETTINGS_DIR}"
+            ) from e
+
     @classmethod
     def _load_settings(cls: Type[LoadableT]) -> Configurable:
         filename = cls.settings_file
         # cache the settings file - useful for future objects that
         # may load multiple instances from the same settings
-        if filename in Loadable.__loaded:
-            return Loadable.__loaded[filename]
+        settings = loadable_cache.get(filename)
+        if settings is not None:
+            return cls.settings_type.from_config(settings)
 
         try:
-            with open(SETTINGS_DIR / filename) as f:
-                settings = yaml.safe_load(f)
-                Loadable.__loaded[filename] = settings
-                return cls.settings_type.from_config(settings)
-        except yaml.YAMLError as e:
+            settings = settings_cache.load(filename)
+            loadable_cache.put(filename, settings, SETTINGS)
+            return cls.settings_type.from_config(settings)
+        except SettingsParseError as e:
             # TODO: log yaml load error
             print(f"Failed to read YAML from {filename}: {e}")
         except IOError as e:
@@ -0,0 +1,175 @@
+import dataclasses
+import pathlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable
+
+import pygame
+
+RESOURCE_DIR = pathlib.Path(__file__).parent
+ASSETS_DIR = RESOURCE_DIR / "assets"
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Returns the pixel memory held by a surface"""
+    return surface.get_pitch() * surface.get_height()
+
+
+@dataclasses.dataclass
+class AssetStats:
+    """Counters and memory use for an asset manager
+
+    Args:
+        hits (int): requests served from the cache
+        misses (int): requests that had to load the file on the caller's thread
+        preloaded (int): files loaded by the background worker
+        load_time (float): seconds spent decoding files, on any thread
+        resident_bytes (int): pixel memory held by cached surfaces
+    """
+
+    hits: int = 0
+    misses: int = 0
+    preloaded: int = 0
+    load_time: float = 0
+    resident_bytes: int = 0
+
+
+class AssetManager:
+    """Shared cache of image assets
+
+    Each file is loaded once and converted to the display's pixel format as
+    soon as a display exists, so blits don't convert every pixel. Surfaces are
+    shared between everything that requests the same file, so callers that
+    need to draw onto an asset must copy it first.
+
+    Args:
+        assets_dir (pathlib.Path): directory asset names are relative to
+    """
+
+    def __init__(self, assets_dir: pathlib.Path = ASSETS_DIR):
+        self.assets_dir = assets_dir
+        self._hits = 0
+        self._misses = 0
+        self._preloaded = 0
+        self._load_time = 0.0
+        self._surfaces: Dict[str, pygame.Surface] = {}
+        # names of surfaces that have been converted to the display format
+        self._converted: set[str] = set()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._surfaces or name in self._pending
+
+    def get(self, name: str) -> pygame.Surface:
+        surface = self._surfaces.get(name)
+        if surface is None:
+            surface = self._resolve(name)
+        else:
+            with self._lock:
+                self._hits += 1
+
+        if name not in self._converted and pygame.display.get_surface() is not None:
+            surface = self._convert(name, surface)
+        return surface
+
+    def preload(self, names: Iterable[str], background: bool = True):
+        """Loads a list of assets ahead of their first use
+
+        Args:
+            names (Iterable[str]): asset file names to load
+            background (bool): decode files on a worker thread; they are
+                converted to the display format on first `get`
+        """
+        names = [n for n in names if n not in self]
+        if not background:
+            for name in names:
+                self.get(name)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="asset-loader")
+        with self._lock:
+            for name in names:
+                self._pending[name] = self._executor.submit(self._preload, name)
+
+    def stats(self) -> AssetStats:
+        with self._lock:
+            surfaces = list(self._surfaces.values())
+        return AssetStats(
+            hits=self._hits,
+            misses=self._misses,
+            preloaded=self._preloaded,
+            load_time=self._load_time,
+            resident_bytes=sum(surface_bytes(s) for s in surfaces),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._surfaces.clear()
+            self._converted.clear()
+
+    def _resolve(self, name: str) -> pygame.Surface:
+        with self._lock:
+            # the worker may have finished since the caller looked
+            surface = self._surfaces.get(name)
+            if surface is not None:
+                self._hits += 1
+                return surface
+            future = self._pending.get(name)
+        if future is not None:
+            # wait for the worker rather than decoding the same file twice;
+            # if it failed, the error is raised here and the next get retries
+            future.result()
+            with self._lock:
+                self._hits += 1
+                return self._surfaces[name]
+
+        with self._lock:
+            self._misses += 1
+        return self._load(name)
+
+    def _preload(self, name: str):
+        self._load(name, preloaded=True)
+
+    def _load(self, name: str, preloaded: bool = False) -> pygame.Surface:
+        start = time.perf_counter()
+        surface = None
+        try:
+            surface = pygame.image.load(self.assets_dir / name)
+        finally:
+            with self._lock:
+                self._load_time += time.perf_counter() - start
+                if surface is not None:
+                    self._surfaces[name] = surface
+                    self._preloaded += preloaded
+                # drop failed loads too, so they aren't reported as present
+                # and the next get or preload tries again
+                self._pending.pop(name, None)
+        return surface
+
+    def _convert(self, name: str, surface: pygame.Surface) -> pygame.Surface:
+        if surface.get_flags() & pygame.SRCALPHA:
+            surface = surface.convert_alpha()
+        else:
+            surface = surface.convert()
+        with self._lock:
+            self._surfaces[name] = surface
+            self._converted.add(name)
+        return surface
+
+
+# shared manager used when decoding image settings
+asset_manager = AssetManager()
+
+
+__all__ = [
+    "ASSETS_DIR",
+    "RESOURCE_DIR",
+    "AssetManager",
+    "AssetStats",
+    "asset_manager",
+    "surface_bytes",
+]
@@ -1,8 +1,9 @@
 import dataclasses
+from typing import List
 
 import pygame
 
-from gameai.types import Align, ColorValue, Coordinate, VerticalAlign
+from gameai.types import Align, ColorValue, Coordinate, ScaleMode, VerticalAlign
 
 from . import io
 
@@ -38,15 +39,29 @@ class ButtonOptions(SpriteOptions):
 
 @dataclasses.dataclass
 class GameSettings(io.Configurable):
+    # frames rendered per second, at most
     framerate: int
     screen_width: int
     screen_height: int
     fullscreen: bool
+    scale_mode: ScaleMode = ScaleMode.SMOOTH
+    # fixed simulation steps per second, independent of the framerate
+    tick_rate: int = 60
+    # most simulation steps to run in one frame when rendering falls behind
+    max_catch_up_steps: int = 5
+    # image assets to load in the background while the main menu is showing
+    preload_assets: List[str] = dataclasses.field(default_factory=list)
+    # memory that loaded scenes and settings are kept within, or None to
+    # keep everything loaded
+    cache_budget_mb: float | None = 64
 
 
 @dataclasses.dataclass
 class CameraSettings(io.Configurable):
+    # area of the world shown on screen, which should match the screen size
     viewport: pygame.Rect
+    # area of the world the viewport is kept within, or None to scroll freely
+    bounds: pygame.Rect | None = None
 
 
 @dataclasses.dataclass
@@ -54,6 +69,9 @@ class MainMenuSettings(io.Configurable):
     play_button: ButtonOptions
     options_button: ButtonOptions
     exit_button: ButtonOptions
+    # show a progress bar if the game is still loading when play is clicked,
+    # rather than waiting on the menu
+    show_loading_scene: bool = True
 
 
 @dataclasses.dataclass
@@ -93,9 +111,29 @@ class CharacterSettings(CollidableSettings):
     acceleration_frames = DEFAULT_ACCELERATION_FRAMES
 
 
+@dataclasses.dataclass
+class LODLevel(io.Configurable):
+    # agents within this distance of the player think at most once
+    # every `interval` frames
+    distance: float
+    interval: int = 1
+
+
 @dataclasses.dataclass
 class CatGameSettings(io.Configurable):
-    pass
+    # time each frame may spend running agent behaviour trees
+    ai_budget_ms: float = 2.0
+    ai_lod_levels: List[LODLevel] = dataclasses.field(default_factory=list)
+    # most agents that may think each tick; headless and replayed games use
+    # this limit alone, so they think the same however fast the machine is
+    ai_max_thinks: int | None = 16
+    # size of the areas of the static background re-baked independently
+    background_chunk_size: int | None = 256
+    # follows the player; the viewport defaults to the whole screen
+    camera: CameraSettings | None = None
+    # tilemap file to stream the level from, relative to the assets
+    # directory; the level is a single floor if not set
+    level: str | None = None
 
 
 @dataclasses.dataclass
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import time
+from typing import Any, Dict
+
+from .resources import RESOURCE_DIR
+
+SETTINGS_DIR = RESOURCE_DIR / "settings"
+SETTINGS_EXTENSIONS = (".yml", ".yaml")
+
+# set to override where parsed settings are cached
+CACHE_DIR_ENV = "GAMEAI_CACHE_DIR"
+# bump when the layout of the cache file changes to invalidate old caches
+CACHE_FORMAT_VERSION = 2
+
+CacheEntry = Dict[str, Any]
+
+
+class SettingsParseError(ValueError):
+    """Raised when a settings file isn't valid YAML"""
+
+
+def default_cache_dir() -> pathlib.Path:
+    if CACHE_DIR_ENV in os.environ:
+        return pathlib.Path(os.environ[CACHE_DIR_ENV])
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = pathlib.Path(xdg_cache) if xdg_cache else pathlib.Path.home() / ".cache"
+    return base / "gameai"
+
+
+class SettingsCache:
+    """Cache of parsed settings trees, stored in a JSON file
+
+    Parsing YAML is slow, so parsed trees for every file in a settings
+    directory are stored together in one cache file. Entries are valid
+    while the source file's mtime and size are unchanged; if they do
+    change, the entry is still reused if the content hash matches. Trees
+    that JSON can't represent exactly, such as ones with dates or
+    non-string keys, are parsed every time instead.
+
+    Args:
+        settings_dir (pathlib.Path): directory containing settings files
+        cache_dir (pathlib.Path | None): directory to store the cache file in
+    """
+
+    def __init__(
+        self,
+        settings_dir: pathlib.Path = SETTINGS_DIR,
+        cache_dir: pathlib.Path | None = None,
+    ):
+        self.settings_dir = settings_dir
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, CacheEntry] | None = None
+        self._dirty = False
+
+    @property
+    def cache_file(self) -> pathlib.Path:
+        # key the cache file on the source directory so that different
+        # installs (or settings directories) don't share entries
+        digest = hashlib.sha256(str(self.settings_dir.resolve()).encode()).hexdigest()
+        return self.cache_dir / f"settings-{digest[:12]}.json"
+
+    def load(self, filename: str) -> Any:
+        """Returns the parsed settings tree for a file in the settings dir"""
+        data = self._lookup(filename)
+        self._flush()
+        return data
+
+    def load_all(self) -> Dict[str, Any]:
+        """Returns parsed trees for every settings file, keyed by filename
+
+        Reads the cache file at most once and writes it back at most once,
+        however many source files have changed.
+        """
+        data = {
+            path.name: self._lookup(path.name)
+            for path in sorted(self.settings_dir.iterdir())
+            if path.suffix in SETTINGS_EXTENSIONS
+        }
+        self._flush()
+        return data
+
+    def forget(self, filename: str):
+        """Drops a file's entry from memory, keeping it in the cache file
+
+        The next load of the file reads it again, and is a miss if the file
+        has changed since it was last written to the cache file.
+        """
+        if self._entries is not None:
+            self._entries.pop(filename, None)
+
+    def clear(self):
+        """Drops all cached entries, in memory and on disk"""
+        self._entries = {}
+        self._dirty = False
+        self.cache_file.unlink(missing_ok=True)
+
+    def _lookup(self, filename: str) -> Any:
+        entries = self._load_entries()
+        path = self.settings_dir / filename
+        stat = path.stat()
+        entry = entries.get(filename)
+        if (
+            entry is not None
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            self.hits += 1
+            return entry["data"]
+
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        if entry is not None and entry["sha256"] == digest:
+            # the file was touched but not changed; refresh the stat
+            # info so we can skip hashing it next time
+            self.hits += 1
+            data = entry["data"]
+        else:
+            self.misses += 1
+            data = _parse_yaml(content)
+            if not _json_exact(data):
+                entries.pop(filename, None)
+                return data
+
+        entries[filename] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "data": data,
+        }
+        self._dirty = True
+        return data
+
+    def _load_entries(self) -> Dict[str, CacheEntry]:
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        try:
+            with open(self.cache_file, "rb") as f:
+                cached = json.load(f)
+            if cached.get("version") == CACHE_FORMAT_VERSION:
+                self._entries = cached["entries"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass  # treat a missing or unreadable cache as empty
+        return self._entries
+
+    def _flush(self):
+        if not self._dirty or self._entries is None:
+            return
+        cached = {"version": CACHE_FORMAT_VERSION, "entries": self._entries}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so that a concurrent reader
+            # never sees a partially written cache
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(cached, f, separators=(",", ":"))
+            os.replace(tmp, self.cache_file)
+            self._dirty = False
+        except OSError:
+            pass  # caching is best effort; keep going if we can't write
+
+
+def _parse_yaml(content: bytes) -> Any:
+    # import yaml lazily, as warm starts don't need to parse anything
+    import yaml
+
+    # prefer the libyaml bindings where they're available
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    try:
+        return yaml.load(content, Loader=SafeLoader)
+    except yaml.YAMLError as e:
+        raise SettingsParseError(str(e)) from e
+
+
+def _json_exact(data: Any) -> bool:
+    """Returns whether a parsed tree reads back from JSON unchanged"""
+    try:
+        return json.loads(json.dumps(data)) == data
+    except (TypeError, ValueError):
+        return False
+
+
+def measure_load_times(
+    settings_dir: pathlib.Path = SETTINGS_DIR, rounds: int = 20
+) -> Dict[str, float]:
+    """Times loading every settings file cold (parsing YAML) and warm
+
+    Uses a temporary cache directory so the real cache is left untouched.
+
+    Returns:
+        Dict[str, float]: best time in milliseconds for each case
+    """
+    cold = warm = float("inf")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for _ in range(rounds):
+            cache = SettingsCache(settings_dir, pathlib.Path(cache_dir))
+            cache.clear()
+            start = time.perf_counter()
+            cache.load_all()
+            cold = min(cold, time.perf_counter() - start)
+
+            # a fresh instance has to read the cache file back from disk
+            cache = SettingsCache(settings_dir, pathlib.Path(cache_dir))
+            start = time.perf_counter()
+            cache.load_all()
+            warm = min(warm, time.perf_counter() - start)
+    return {"cold_ms": cold * 1e3, "warm_ms": warm * 1e3}
+
+
+# shared cache used to load Loadable settings
+settings_cache = SettingsCache()
+
+
+__all__ = [
+    "CACHE_DIR_ENV",
+    "SETTINGS_DIR",
+    "SettingsCache",
+    "SettingsParseError",
+    "default_cache_dir",
+    "measure_load_times",
+    "settings_cache",
+]
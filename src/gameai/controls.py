@@ -0,0 +1,72 @@
+from typing import Dict, Sequence
+
+import pygame
+
+# keys that characters read when moving, mapped to their bit in a KeyState
+CONTROL_KEYS: Dict[int, int] = {
+    pygame.K_LEFT: 1 << 0,
+    pygame.K_RIGHT: 1 << 1,
+    pygame.K_SPACE: 1 << 2,
+}
+
+
+class KeyState:
+    """Pressed state of the character control keys, packed into a bitmask
+
+    Indexes like the wrapper returned by `pygame.key.get_pressed()`, so it
+    can be passed to `Character2D.move` in its place. Keys outside of
+    `CONTROL_KEYS` always read as released.
+
+    Args:
+        mask (int): bitmask of pressed keys
+    """
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask: int = 0):
+        self.mask = mask
+
+    @classmethod
+    def from_pressed(cls, pressed: Sequence[bool]) -> "KeyState":
+        """Packs the control keys from a `pygame.key.get_pressed()` result"""
+        mask = 0
+        for key, bit in CONTROL_KEYS.items():
+            if pressed[key]:
+                mask |= bit
+        return cls(mask)
+
+    def __getitem__(self, key: int) -> bool:
+        return bool(self.mask & CONTROL_KEYS.get(key, 0))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, KeyState) and self.mask == other.mask
+
+    # key states are changed in place, so they can't be dict keys or in sets
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        pressed = [
+            pygame.key.name(k) for k, bit in CONTROL_KEYS.items() if self.mask & bit
+        ]
+        return f"KeyState({', '.join(pressed)})"
+
+    def press(self, key: int):
+        self.mask |= CONTROL_KEYS[key]
+
+    def release(self, key: int):
+        self.mask &= ~CONTROL_KEYS[key]
+
+    def set(self, key: int, pressed: bool):
+        if pressed:
+            self.press(key)
+        else:
+            self.release(key)
+
+    def clear(self):
+        self.mask = 0
+
+
+__all__ = [
+    "CONTROL_KEYS",
+    "KeyState",
+]
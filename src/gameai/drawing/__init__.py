@@ -1,3 +1,4 @@
-from .text import draw_text
+from .hud import PerformanceHUD
+from .text import TextCache, draw_text, text_cache
 
-__all__ = ["draw_text"]
+__all__ = ["PerformanceHUD", "TextCache", "draw_text", "text_cache"]
@@ -0,0 +1,75 @@
+import time
+
+import pygame
+
+from gameai.config import font_registry
+from gameai.profiling import FrameProfiler
+from gameai.types import Coordinate
+
+# monospaced fonts keep the columns lined up; SysFont takes the first found
+HUD_FONT = "dejavusansmono,consolas,menlo,couriernew"
+HUD_FONT_SIZE = 14
+HUD_MARGIN = 4
+# seconds between refreshes of the HUD text; rendering text every frame
+# would show up in the timings it reports
+HUD_REFRESH_INTERVAL = 0.5
+
+
+class PerformanceHUD:
+    """Overlay of per-phase frame timings from a frame profiler
+
+    Shows the p50, p95 and p99 of each phase over the profiler's window. The
+    text is only re-rendered every `refresh` seconds; in between, drawing
+    the HUD is a single blit.
+
+    Args:
+        profiler (FrameProfiler): profiler to report on
+        topleft (Coordinate): position of the overlay on the draw surface
+        refresh (float): seconds between text refreshes
+    """
+
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        topleft: Coordinate = (HUD_MARGIN, HUD_MARGIN),
+        refresh: float = HUD_REFRESH_INTERVAL,
+    ):
+        self.profiler = profiler
+        self.refresh = refresh
+        self.font = font_registry.get(HUD_FONT, HUD_FONT_SIZE)
+        self.image: pygame.Surface | None = None
+        self.rect = pygame.Rect(topleft, (0, 0))
+        self._rendered_at = 0.0
+
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
+        """Draws the overlay and returns the area it covers"""
+        now = time.perf_counter()
+        if self.image is None or now - self._rendered_at >= self.refresh:
+            self._render()
+            self._rendered_at = now
+        screen.blit(self.image, self.rect)  # type: ignore
+        return self.rect
+
+    def _render(self):
+        lines = [f"{'phase':<8}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, s in self.profiler.summary().items():
+            lines.append(
+                f"{name:<8}{s['p50_ms']:>7.2f}{s['p95_ms']:>7.2f}{s['p99_ms']:>7.2f}"
+            )
+        images = [self.font.render(line, True, "white") for line in lines]
+        line_height = self.font.get_linesize()
+        # never shrink, so longer text drawn earlier is always covered
+        text_width = max(img.get_width() for img in images)
+        width = max(self.rect.width, text_width + 2 * HUD_MARGIN)
+        height = max(self.rect.height, line_height * len(images) + 2 * HUD_MARGIN)
+        self.rect.size = (width, height)
+
+        self.image = pygame.Surface(self.rect.size)
+        self.image.fill("black")
+        for i, img in enumerate(images):
+            self.image.blit(img, (HUD_MARGIN, HUD_MARGIN + i * line_height))
+
+
+__all__ = [
+    "PerformanceHUD",
+]
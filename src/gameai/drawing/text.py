@@ -1,12 +1,83 @@
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
 import pygame
 
 from gameai.config import TextOptions
-from gameai.types import Align, VerticalAlign
+from gameai.types import Align, ColorValue, VerticalAlign
+
+DEFAULT_TEXT_CACHE_SIZE = 256
+
+TextCacheKey = Tuple[str, pygame.font.Font, bool, Hashable]
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces
+
+    Rendering text rasterises every glyph, so cache the resulting surfaces
+    keyed on everything that affects the output. Returned surfaces are
+    shared and must not be modified.
+
+    Args:
+        maxsize (int): maximum number of surfaces to keep
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: OrderedDict[TextCacheKey, pygame.Surface] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(
+        self, text: str, font: pygame.font.Font, antialias: bool, color: ColorValue
+    ) -> pygame.Surface:
+        key = (text, font, antialias, _color_key(color))
+        img = self._surfaces.get(key)
+        if img is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return img
+
+        self.misses += 1
+        img = font.render(text, antialias, color)
+        self._surfaces[key] = img
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return img
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _color_key(color: ColorValue) -> Hashable:
+    # pygame.Color and lists aren't hashable, so key on the RGBA values
+    if isinstance(color, (str, int)):
+        return color
+    return tuple(color)
+
+
+# shared cache used by draw_text unless another is given
+text_cache = TextCache()
 
 
-def draw_text(text: str, screen: pygame.Surface, opts: TextOptions, hovered: bool):
+def draw_text(
+    text: str,
+    screen: pygame.Surface,
+    opts: TextOptions,
+    hovered: bool,
+    cache: TextCache = text_cache,
+):
     color = opts.hover_color if hovered else opts.color
-    img = opts.font.render(text, opts.antialias, color)
+    img = cache.render(text, opts.font, opts.antialias, color)
     rect = screen.get_rect()
     x = y = 0
 
@@ -24,5 +95,8 @@ def draw_text(text: str, screen: pygame.Surface, opts: TextOptions, hovered: boo
 
 
 __all__ = [
+    "DEFAULT_TEXT_CACHE_SIZE",
+    "TextCache",
     "draw_text",
+    "text_cache",
 ]
@@ -0,0 +1,195 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from .controls import CONTROL_KEYS, KeyState
+from .episodes import DEFAULT_EPISODE_STEPS
+from .game import GAME_HEIGHT, GAME_WIDTH
+from .scenes.cat import CatGame
+
+# state observations are float32 vectors of these fields
+STATE_FIELDS = ("x", "y", "velocity_x", "velocity_y", "standing", "jumping")
+STATE_SIZE = len(STATE_FIELDS)
+# actions are bitmasks of the control keys, see controls.CONTROL_KEYS
+NUM_ACTIONS = 1 << len(CONTROL_KEYS)
+# frames are rendered into RGBX buffers so surfaces can draw into them directly
+FRAME_SHAPE = (GAME_HEIGHT, GAME_WIDTH, 4)
+
+Observation = Dict[str, np.ndarray]
+
+
+def _frame_surface(frame: np.ndarray) -> pygame.Surface:
+    # the surface draws straight into the array's memory, so the array
+    # always holds the last rendered frame without copying it out
+    return pygame.image.frombuffer(frame, (GAME_WIDTH, GAME_HEIGHT), "RGBX")
+
+
+class CatGameEnv:
+    """Gym-style reset/step interface over a CatGame
+
+    Observations are dicts with a "state" vector (see `STATE_FIELDS`) and,
+    if `pixels` is set, a (height, width, 3) "pixels" array of the rendered
+    frame. Both are views of buffers the environment reuses on every step,
+    so copy them to keep them past the next call. Actions are integers in
+    `range(NUM_ACTIONS)` whose bits press the keys in `CONTROL_KEYS`, and
+    the reward is the distance the player moved right.
+
+    Args:
+        pixels (bool): render each step and include the frame in observations
+        max_steps (int): steps before an episode is truncated
+        state (np.ndarray | None): STATE_SIZE float32 buffer for state
+            observations; allocated if not set
+        frame (np.ndarray | None): uint8 buffer of `FRAME_SHAPE` to render
+            into; allocated if not set and `pixels` is set
+    """
+
+    def __init__(
+        self,
+        pixels: bool = False,
+        max_steps: int = DEFAULT_EPISODE_STEPS,
+        state: np.ndarray | None = None,
+        frame: np.ndarray | None = None,
+    ):
+        self.pixels = pixels
+        self.max_steps = max_steps
+        self.steps = 0
+        self.game: CatGame | None = None
+        self._state = state if state is not None else np.zeros(STATE_SIZE, np.float32)
+        self._frame: np.ndarray | None = None
+        if pixels:
+            self._frame = (
+                frame if frame is not None else np.zeros(FRAME_SHAPE, np.uint8)
+            )
+            self.screen = _frame_surface(self._frame)
+        else:
+            self.screen = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
+
+    def reset(self, seed: int | None = None) -> Tuple[Observation, Dict]:
+        """Starts a new episode in a new game
+
+        CatGame has no randomness of its own, so `seed` is accepted for
+        compatibility with other environments but has no effect.
+        """
+        # release the last episode's game, or its chunk streamer keeps running
+        self.close()
+        self.game = CatGame.new(screen=self.screen, deterministic=True)
+        self.steps = 0
+        return self._observe(), {}
+
+    def step(self, action: int) -> Tuple[Observation, float, bool, bool, Dict]:
+        """Advances the game one tick with the keys for `action` pressed
+
+        Returns:
+            Tuple[Observation, float, bool, bool, Dict]: observation, reward,
+                whether the episode ended, whether it was truncated, and info
+        """
+        if self.game is None:
+            raise pygame.error("reset() must be called before step()")
+        player = self.game.player
+        x = player.rect.x
+        self.game.step(KeyState(action))
+        self.steps += 1
+
+        obs = self._observe()
+        reward = float(player.rect.x - x)
+        # there's no way to win or lose yet, other than falling out of the world
+        terminated = player.rect.top > GAME_HEIGHT
+        truncated = self.steps >= self.max_steps
+        return obs, reward, terminated, truncated, {}
+
+    def close(self):
+        """Unloads the current game"""
+        if self.game is not None:
+            self.game.unload()
+            self.game = None
+
+    def _observe(self) -> Observation:
+        player = self.game.player  # type: ignore
+        state = self._state
+        state[0], state[1] = player.rect.topleft
+        state[2], state[3] = player.velocity
+        state[4] = player.standing_on is not None
+        state[5] = player.jumping
+        if self._frame is None:
+            return {"state": state}
+        self.game.draw()  # type: ignore
+        return {"state": state, "pixels": self._frame[..., :3]}
+
+
+class VectorCatGameEnv:
+    """Steps a batch of CatGame environments in one call
+
+    Sub-environments write their observations into rows of shared batch
+    arrays, so batched observations are never assembled by copying. Episodes
+    that end are reset automatically; their final state is returned in the
+    info dict under "final_state", keyed by environment index.
+
+    Args:
+        num_envs (int): number of games to run
+        pixels (bool): include rendered frames in observations
+        max_steps (int): steps before an episode is truncated
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        pixels: bool = False,
+        max_steps: int = DEFAULT_EPISODE_STEPS,
+    ):
+        self.num_envs = num_envs
+        self.states = np.zeros((num_envs, STATE_SIZE), np.float32)
+        self.frames = np.zeros((num_envs, *FRAME_SHAPE), np.uint8) if pixels else None
+        self.rewards = np.zeros(num_envs, np.float32)
+        self.terminated = np.zeros(num_envs, bool)
+        self.truncated = np.zeros(num_envs, bool)
+        self.envs: List[CatGameEnv] = [
+            CatGameEnv(
+                pixels,
+                max_steps,
+                state=self.states[i],
+                frame=self.frames[i] if self.frames is not None else None,
+            )
+            for i in range(num_envs)
+        ]
+
+    def reset(self, seed: int | None = None) -> Tuple[Observation, Dict]:
+        for i, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + i)
+        return self._observation(), {}
+
+    def step(
+        self, actions: Sequence[int] | np.ndarray
+    ) -> Tuple[Observation, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        final_states = {}
+        for i, (env, action) in enumerate(zip(self.envs, actions, strict=True)):
+            _, reward, terminated, truncated, _ = env.step(int(action))
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            if terminated or truncated:
+                final_states[i] = self.states[i].copy()
+                env.reset()
+
+        infos = {"final_state": final_states} if final_states else {}
+        return self._observation(), self.rewards, self.terminated, self.truncated, infos
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+    def _observation(self) -> Observation:
+        if self.frames is None:
+            return {"state": self.states}
+        return {"state": self.states, "pixels": self.frames[..., :3]}
+
+
+__all__ = [
+    "FRAME_SHAPE",
+    "NUM_ACTIONS",
+    "STATE_FIELDS",
+    "STATE_SIZE",
+    "CatGameEnv",
+    "Observation",
+    "VectorCatGameEnv",
+]
@@ -0,0 +1,167 @@
+import dataclasses
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Tuple
+
+import pygame
+
+from . import config
+from .controls import KeyState
+from .game import GAME_HEIGHT, GAME_WIDTH, HEADLESS_VIDEO_DRIVER
+from .scenes.cat import CatGame
+
+DEFAULT_EPISODE_STEPS = 600
+
+# policies are called once per step with the game and the episode's seeded
+# random generator, and return the keys to press; they must be picklable
+# (eg. module-level functions) to be sent to worker processes
+Policy = Callable[[CatGame, random.Random], KeyState]
+
+
+def random_policy(game: CatGame, rng: random.Random) -> KeyState:
+    """Presses a random combination of the control keys each step"""
+    return KeyState(rng.getrandbits(3))
+
+
+@dataclasses.dataclass
+class Episode:
+    """A single simulated CatGame run
+
+    Args:
+        seed (int): seed for the policy's random generator
+        steps (int): number of fixed-step ticks to run
+    """
+
+    seed: int
+    steps: int = DEFAULT_EPISODE_STEPS
+
+
+@dataclasses.dataclass
+class EpisodeResult:
+    """Outcome of a simulated episode
+
+    Args:
+        seed (int): seed the episode ran with
+        steps (int): number of ticks run
+        score (int): final game score
+        position (Tuple[int, int]): final player position
+        distance (float): total horizontal distance the player moved
+        elapsed (float): wall-clock seconds the episode took to simulate
+        worker (int): process ID of the worker that ran the episode
+    """
+
+    seed: int
+    steps: int
+    score: int
+    position: Tuple[int, int]
+    distance: float
+    elapsed: float
+    worker: int
+
+
+def init_headless():
+    """Initializes the pygame modules episodes need, without a window"""
+    os.environ["SDL_VIDEODRIVER"] = HEADLESS_VIDEO_DRIVER
+    pygame.display.init()
+    config.Loadable.preload_settings()
+
+
+def run_episode(episode: Episode, policy: Policy = random_policy) -> EpisodeResult:
+    """Runs an episode in a new CatGame, isolated from any loaded scenes"""
+    rng = random.Random(episode.seed)
+    game = CatGame.new(
+        screen=pygame.Surface((GAME_WIDTH, GAME_HEIGHT)), deterministic=True
+    )
+    player = game.player
+
+    try:
+        start = time.perf_counter()
+        distance = 0.0
+        for _ in range(episode.steps):
+            x = player.rect.x
+            game.step(policy(game, rng))
+            distance += abs(player.rect.x - x)
+        elapsed = time.perf_counter() - start
+
+        return EpisodeResult(
+            seed=episode.seed,
+            steps=episode.steps,
+            score=game.score,
+            position=player.rect.topleft,
+            distance=distance,
+            elapsed=elapsed,
+            worker=os.getpid(),
+        )
+    finally:
+        # workers run many episodes, so don't leave each one's streamer behind
+        game.unload()
+
+
+class EpisodeRunner:
+    """Runs CatGame episodes in parallel worker processes
+
+    Each worker initializes its own headless pygame, and every episode gets a
+    new CatGame, so episodes share no state with each other or with the
+    parent process. Results are yielded as soon as each episode finishes.
+
+    Workers are started on the first call to `run` and kept until `close`,
+    so they only pay pygame's startup cost once. Use the runner as a context
+    manager to close it automatically.
+
+    Args:
+        workers (int | None): number of worker processes; defaults to the
+            number of CPUs
+        policy (Policy): chooses the keys to press each step
+    """
+
+    def __init__(self, workers: int | None = None, policy: Policy = random_policy):
+        self.workers = workers or os.cpu_count() or 1
+        self.policy = policy
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "EpisodeRunner":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, episodes: Iterable[Episode]) -> Iterator[EpisodeResult]:
+        if self._pool is None:
+            # spawn rather than fork so workers don't inherit the parent's
+            # pygame state, which may include an open display
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_headless,
+            )
+        futures = [self._pool.submit(run_episode, e, self.policy) for e in episodes]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+def seeded_episodes(
+    count: int, steps: int = DEFAULT_EPISODE_STEPS, seed: int = 0
+) -> Iterator[Episode]:
+    """Generates episodes with consecutive seeds starting from `seed`"""
+    return (Episode(seed + i, steps) for i in range(count))
+
+
+__all__ = [
+    "DEFAULT_EPISODE_STEPS",
+    "Episode",
+    "EpisodeResult",
+    "EpisodeRunner",
+    "Policy",
+    "init_headless",
+    "random_policy",
+    "run_episode",
+    "seeded_episodes",
+]
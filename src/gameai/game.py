@@ -1,31 +1,123 @@
-from typing import Type
+import dataclasses
+import math
+import os
+import time
+from typing import Callable, List, Tuple, Type
 
 import pygame
 
 from . import config, scenes, types
+from .drawing import PerformanceHUD
+from .profiling import FrameProfiler
 
 GAME_WIDTH = 640
 GAME_HEIGHT = 360
 
+# SDL video driver used for headless runs; it needs no window or display server
+HEADLESS_VIDEO_DRIVER = "dummy"
+
+# draw surface pixels to pad dirty rects by when scaling them, so the smoothing
+# filter has the same neighbouring pixels to sample as in a full-frame scale
+DIRTY_RECT_PADDING = 2
+# once the dirty rects cover this fraction of the draw surface, it's cheaper
+# to rescale the whole frame than each rect individually
+FULL_FRAME_DIRTY_RATIO = 0.5
+# toggles the performance HUD
+HUD_KEY = pygame.K_F3
+
+
+@dataclasses.dataclass
+class SimulationStats:
+    """Throughput report for a headless simulation run
+
+    Args:
+        steps (int): number of fixed-step ticks run
+        frames_rendered (int): number of ticks that were also rendered
+        sim_time (float): total simulated time in seconds
+        elapsed (float): wall-clock time in seconds spent running
+    """
+
+    steps: int = 0
+    frames_rendered: int = 0
+    sim_time: float = 0
+    elapsed: float = 0
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.steps} steps ({self.sim_time:.2f}s simulated) in "
+            f"{self.elapsed:.3f}s: {self.steps_per_second:.1f} steps/s, "
+            f"{self.frames_rendered} frames rendered"
+        )
+
+
+def _scale_span(start: int, end: int, src_size: int, dst_size: int):
+    """Maps a span of draw surface pixels to the target of a patch rescale
+
+    Returns the source span to scale, grown if needed, and its target span.
+    """
+    if dst_size > src_size:
+        # when enlarging, smoothscale samples destination pixel x at
+        # x * (src_size - 1) / dst_size
+        ratio = (src_size - 1) / dst_size
+        last = -1
+    else:
+        # when shrinking, it averages the source pixels each one covers
+        ratio = src_size / dst_size
+        last = 0
+    while True:
+        # round both ends rather than the length, so neither drifts by more
+        # than half a pixel from where a full-frame scale puts it
+        first = round(start / ratio)
+        length = round((end + last) / ratio) - first
+        # patches rounded to their own size are copied rather than filtered,
+        # so grow them until they scale the same way as a full frame. this
+        # always stops, as the whole span scales exactly like a full frame
+        growth = (length > end - start) - (length < end - start)
+        if growth == (dst_size > src_size) - (dst_size < src_size):
+            return start, end, first, length
+        pad = end - start
+        start, end = max(0, start - pad), min(src_size, end + pad)
+
+
+def _integer_scale_factor(width: int, height: int) -> int:
+    return max(1, min(width // GAME_WIDTH, height // GAME_HEIGHT))
+
 
 class Game(config.Loadable):
     """Game runtime class
 
     Controls display settings and rendering, handles system events, and
-    triggers per-frame tick.
+    ticks the active scene. Scenes tick at a fixed rate regardless of the
+    framerate: each frame runs however many ticks the elapsed time covers,
+    and rendering is interpolated between the last two.
 
     Args:
         settings (GameSettings): game configuration settings
+        headless (bool): run without a window using SDL's dummy video driver
     """
 
     settings_file: str = config.GAME_SETTINGS_FILE
     settings_type: Type[config.GameSettings] = config.GameSettings
 
-    def __init__(self, settings: config.GameSettings):
-        pygame.init()
+    def __init__(self, settings: config.GameSettings, headless: bool = False):
+        self.headless = headless
+        if headless:
+            # SDL reads the driver hint when the display is initialised
+            os.environ["SDL_VIDEODRIVER"] = HEADLESS_VIDEO_DRIVER
+
+        # only bring up the SDL subsystems we use; pygame.init() would also
+        # start audio, joystick and others that slow startup down
+        pygame.display.init()
+        pygame.font.init()
 
         screen_size = (settings.screen_width, settings.screen_height)
         flags = pygame.RESIZABLE | (settings.fullscreen and pygame.FULLSCREEN)
+        if headless:
+            flags = 0
         self.screen = pygame.display.set_mode(screen_size, flags=flags)
         # create two surfaces to use for scaling purposes: the draw surface is
         # a fixed size, and all scenes draw to it. the aspect surface maintains
@@ -33,24 +125,148 @@ class Game(config.Loadable):
         # as a target for scaling the draw surface on update
         self._draw_surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
         self._aspect_surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
+        # backing surface for integer scaling; aspect surfaces are views into it
+        self._integer_surface: pygame.Surface | None = None
+
+        self.scale_mode = settings.scale_mode
+        if self.scale_mode is types.ScaleMode.SMOOTH:
+            self._scale = pygame.transform.smoothscale
+        else:
+            self._scale = pygame.transform.scale
 
         self.clock = pygame.time.Clock()
         self.framerate = settings.framerate
+        self.tick_rate = settings.tick_rate
+        self.max_catch_up_steps = settings.max_catch_up_steps
+        # frame time not yet simulated, always less than a tick when drawing
+        self._accumulator = 0.0
+        # ticks run and simulated seconds dropped when frames fall behind
+        self.ticks = 0
+        self.dropped_time = 0.0
+        self.preload_assets = settings.preload_assets
+        # scenes and settings that aren't in use are unloaded past the budget
+        budget = settings.cache_budget_mb
+        if budget is not None:
+            budget = int(budget * 2**20)
+        config.loadable_cache.budget_bytes = budget
         self._running = False
+        # the scene rendered last frame, and whether the next frame needs a
+        # full rescale rather than only updating the scene's dirty rects
+        self._rendered_scene: scenes.Scene | None = None
+        self._full_redraw = True
+        # frame phase timings; None unless profiling, so frames skip the marks
+        self.profiler: FrameProfiler | None = None
+        self.hud: PerformanceHUD | None = None
+
+    @property
+    def draw_surface(self) -> pygame.Surface:
+        """Fixed-size surface that all scenes draw to"""
+        return self._draw_surface
 
     def run(self):
-        self._running = True
-        main_menu = scenes.MainMenu.load(screen=self._draw_surface)
-        scenes.new_scene(main_menu)
-        self._rescale()
+        self._start()
+        # load assets for later scenes while the player is in the menu
+        config.asset_manager.preload(self.preload_assets)
 
         while self._running:
-            self._handle_events()
-            self._tick()
-            self._render()
+            if self.profiler is None:
+                self._handle_events()
+                self._tick()
+                self._render()
+            else:
+                self._profiled_frame(self.profiler)
 
         pygame.quit()
 
+    def show_hud(self, show: bool = True):
+        """Shows or hides the performance HUD, starting the profiler if needed"""
+        if show and self.hud is None:
+            if self.profiler is None:
+                self.profiler = FrameProfiler()
+            self.hud = PerformanceHUD(self.profiler)
+        elif not show and self.hud is not None:
+            # scenes only redraw their sprites, so clear what the HUD covered
+            self._draw_surface.fill("black", self.hud.rect)
+            scenes.get_active_scene().dirty_all_sprites()
+            self._full_redraw = True
+            self.hud = None
+
+    def simulate(
+        self,
+        steps: int | None = None,
+        until: Callable[[scenes.Scene], bool] | None = None,
+        render_every: int = 0,
+        scene: scenes.Scene | None = None,
+    ) -> SimulationStats:
+        """Ticks the active scene at a fixed timestep as fast as possible
+
+        Each step is one `1 / tick_rate` tick, the same as in `run`. Frame
+        rate capping is skipped entirely, and rendering (including the
+        scaling step) only happens every `render_every` steps, so the result
+        measures raw simulation throughput.
+
+        Args:
+            steps (int | None): maximum number of steps to run
+            until (Callable | None): stop condition, called with the active
+                scene after each step
+            render_every (int): render every k-th step; 0 disables rendering
+            scene (Scene | None): scene to start; defaults to the main menu
+
+        Returns:
+            SimulationStats: step counts and wall-clock timing for the run
+        """
+        if steps is None and until is None:
+            raise ValueError("simulate requires a step limit or stop condition")
+
+        dt = 1 / self.tick_rate
+        stats = SimulationStats()
+        self._start(scene)
+
+        profiler = self.profiler
+        start = time.perf_counter()
+        while self._running and (steps is None or stats.steps < steps):
+            if profiler is not None:
+                profiler.start_frame()
+            self._handle_events()
+            if profiler is not None:
+                profiler.mark("events")
+            active_scene = scenes.get_active_scene()
+            active_scene.tick(dt)
+            stats.steps += 1
+            if profiler is not None:
+                profiler.mark("tick")
+
+            if render_every and stats.steps % render_every == 0:
+                scenes.get_active_scene().interpolate(1.0)
+                self._render()
+                stats.frames_rendered += 1
+            if profiler is not None:
+                profiler.end_frame()
+
+            if until is not None and until(active_scene):
+                break
+
+        stats.elapsed = time.perf_counter() - start
+        stats.sim_time = stats.steps * dt
+        return stats
+
+    def _start(self, scene: scenes.Scene | None = None):
+        self._running = True
+        self._accumulator = 0.0
+        if scene is None:
+            scene = scenes.MainMenu.load(screen=self._draw_surface)
+        scenes.new_scene(scene)
+        self._rescale()
+
+    def _profiled_frame(self, profiler: FrameProfiler):
+        profiler.start_frame()
+        self._handle_events()
+        profiler.mark("events")
+        # _tick and _render mark their own phases
+        self._tick()
+        self._render()
+        profiler.end_frame()
+
     def _handle_events(self):
         scene = scenes.get_active_scene()
 
@@ -64,6 +280,8 @@ class Game(config.Loadable):
                 case pygame.WINDOWMAXIMIZED:
                     pygame.display.toggle_fullscreen()
                     self._rescale()
+                case pygame.KEYDOWN if event.key == HUD_KEY:
+                    self.show_hud(self.hud is None)
                 case pygame.MOUSEBUTTONDOWN | pygame.MOUSEBUTTONUP | pygame.MOUSEMOTION:
                     # adjust the position of mouse events by the window scale factor
                     event.pos = self._scale_pos(event.pos)
@@ -74,33 +292,193 @@ class Game(config.Loadable):
     def _render(self):
         # XXX: should we be drawing all/some scenes, not just the active one?
         scene = scenes.get_active_scene()
-        scene.draw()
+        if scene is not self._rendered_scene:
+            # nothing from the new scene is on screen yet, so draw all of it
+            scene.dirty_all_sprites()
+            self._rendered_scene = scene
+            self._full_redraw = True
+        dirty_rects = scene.draw()
+        if self.profiler is not None:
+            self.profiler.mark("draw")
+        if self.hud is not None:
+            dirty_rects.append(self.hud.draw(self._draw_surface))
+            self.profiler.mark("hud")  # type: ignore
+
+        if self._full_redraw or self._covers_frame(dirty_rects):
+            self._render_full_frame()
+        elif dirty_rects:
+            self._render_dirty_rects(dirty_rects)
+        if self.profiler is not None:
+            # scaling to the window and presenting the frame
+            self.profiler.mark("scale")
 
-        # FIXME: this is really, really slow in fullscreen mode
+    def _render_full_frame(self):
+        # smoothscale is really, really slow in fullscreen mode; prefer the
+        # nearest or integer scale modes on large displays
         size = self._aspect_surface.get_size()
-        pygame.transform.smoothscale(self._draw_surface, size, self._aspect_surface)
+        self._scale(self._draw_surface, size, self._aspect_surface)
 
-        aspect_rect = self._aspect_surface.get_rect()
-        aspect_rect.center = self.screen.get_rect().center
+        aspect_rect = self._get_aspect_rect()
         self.screen.blit(self._aspect_surface, aspect_rect)
-        # XXX: is it possible to still limit the redraw surface despite
-        # scaling? could potentially scale the rects returned from draw(),
-        # though may not be precise enough
         pygame.display.update(aspect_rect)
+        self._full_redraw = False
+
+    def _render_dirty_rects(self, dirty_rects: List[pygame.Rect]):
+        aspect_rect = self._get_aspect_rect()
+        bounds = self._draw_surface.get_rect()
+        smooth = self.scale_mode is types.ScaleMode.SMOOTH
+        updated = []
+
+        for rect in dirty_rects:
+            rect = rect.clip(bounds)
+            if not rect:
+                continue
+            if smooth:
+                # the filter blends neighbouring pixels, so a change also shows
+                # in the pixels around it. scale a padded patch, then present
+                # the changed area and the pixels it bleeds into
+                padded, padded_dest = self._to_scaled_patch(rect)
+                dest = self._to_screen_space(rect.inflate(2, 2).clip(bounds))
+                dest = dest.clip(padded_dest)
+            else:
+                # nearest-neighbour sampling doesn't bleed, but patches only
+                # sample the same pixels as a full-frame scale if they map to
+                # whole destination pixels
+                padded = self._align_to_scale(rect)
+                dest = padded_dest = self._to_screen_space(padded)
+
+            scaled = self._scale(
+                self._draw_surface.subsurface(padded), padded_dest.size
+            )
+            area = dest.move(-padded_dest.x, -padded_dest.y)
+            dest.move_ip(aspect_rect.topleft)
+            self.screen.blit(scaled, dest, area)
+            updated.append(dest)
+
+        pygame.display.update(updated)
+
+    def _covers_frame(self, dirty_rects: List[pygame.Rect]) -> bool:
+        dirty_area = sum(r.width * r.height for r in dirty_rects)
+        return dirty_area >= GAME_WIDTH * GAME_HEIGHT * FULL_FRAME_DIRTY_RATIO
+
+    def _to_screen_space(self, rect: pygame.Rect) -> pygame.Rect:
+        """Maps a draw surface rect onto the aspect surface
+
+        Rounds outwards so the mapped rect covers every partially
+        covered destination pixel.
+        """
+        aspect_w, aspect_h = self._aspect_surface.get_size()
+        x_scale = aspect_w / GAME_WIDTH
+        y_scale = aspect_h / GAME_HEIGHT
+        left = math.floor(rect.left * x_scale)
+        top = math.floor(rect.top * y_scale)
+        right = min(math.ceil(rect.right * x_scale), aspect_w)
+        bottom = min(math.ceil(rect.bottom * y_scale), aspect_h)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def _align_to_scale(self, rect: pygame.Rect) -> pygame.Rect:
+        """Grows a draw surface rect to the nearest whole destination pixels
+
+        Aligns rect to a grid of the smallest blocks of draw surface pixels
+        that scale to a whole number of aspect surface pixels.
+        """
+        aspect_w, aspect_h = self._aspect_surface.get_size()
+        x_step = GAME_WIDTH // math.gcd(GAME_WIDTH, aspect_w)
+        y_step = GAME_HEIGHT // math.gcd(GAME_HEIGHT, aspect_h)
+        left = rect.left - rect.left % x_step
+        top = rect.top - rect.top % y_step
+        right = rect.right + -rect.right % x_step
+        bottom = rect.bottom + -rect.bottom % y_step
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def _to_scaled_patch(
+        self, rect: pygame.Rect
+    ) -> Tuple[pygame.Rect, pygame.Rect]:
+        """Pads a draw surface rect and maps it to the target of a rescale
+
+        Patches are padded so smoothscale samples the same neighbouring
+        pixels as a full-frame rescale, and positioned and sized so it
+        samples them on (close to) the same grid, otherwise the scaled
+        pixels drift by up to half a source pixel across a patch.
+
+        Returns:
+            Tuple[pygame.Rect, pygame.Rect]: the padded rect and its target
+        """
+        aspect_w, aspect_h = self._aspect_surface.get_size()
+        padded = rect.inflate(DIRTY_RECT_PADDING * 2, DIRTY_RECT_PADDING * 2)
+        padded = padded.clip(self._draw_surface.get_rect())
+        left, right, x, width = _scale_span(
+            padded.left, padded.right, GAME_WIDTH, aspect_w
+        )
+        top, bottom, y, height = _scale_span(
+            padded.top, padded.bottom, GAME_HEIGHT, aspect_h
+        )
+        return (
+            pygame.Rect(left, top, right - left, bottom - top),
+            pygame.Rect(x, y, width, height),
+        )
+
+    def _get_aspect_rect(self) -> pygame.Rect:
+        aspect_rect = self._aspect_surface.get_rect()
+        aspect_rect.center = self.screen.get_rect().center
+        return aspect_rect
 
     def _tick(self):
-        dt = self.clock.tick(self.framerate) / 1000
-        scene = scenes.get_active_scene()
-        scene.tick(dt)
+        frame_time = self.clock.tick(self.framerate) / 1000
+        if self.profiler is not None:
+            self.profiler.mark("wait", idle=True)
+        dt = 1 / self.tick_rate
+        self._accumulator += frame_time
+
+        steps = 0
+        while self._accumulator >= dt:
+            if steps == self.max_catch_up_steps:
+                # if ticks take longer than the time they simulate, catching
+                # up only puts us further behind; slow the game down instead
+                dropped = self._accumulator - self._accumulator % dt
+                self.dropped_time += dropped
+                self._accumulator -= dropped
+                break
+            scenes.get_active_scene().tick(dt)
+            self._accumulator -= dt
+            steps += 1
+        self.ticks += steps
+
+        scenes.get_active_scene().interpolate(self._accumulator / dt)
+        if self.profiler is not None:
+            self.profiler.mark("tick")
 
     def _rescale(self):
         scale_factor = self.get_scale_factor()
-        size = (GAME_WIDTH * scale_factor, GAME_HEIGHT * scale_factor)
-        self._aspect_surface = pygame.transform.smoothscale(self._aspect_surface, size)
-        # mark all sprites in the scene dirty so everything gets redrawn on resize
+        size = (int(GAME_WIDTH * scale_factor), int(GAME_HEIGHT * scale_factor))
+        if self._aspect_surface.get_size() != size:
+            self._aspect_surface = self._new_aspect_surface(size)
+        # mark all sprites in the scene dirty so everything gets redrawn on
+        # resize, and clear any stale pixels left around the aspect surface
         scenes.get_active_scene().dirty_all_sprites()
+        self._full_redraw = True
+        self.screen.fill("black")
         pygame.display.update()
 
+    def _new_aspect_surface(self, size: Tuple[int, int]) -> pygame.Surface:
+        if self.scale_mode is not types.ScaleMode.INTEGER:
+            return pygame.Surface(size)
+
+        # there are only a few integer scales that fit on the display, so
+        # allocate a target for the largest once and hand out views into it
+        target = self._integer_surface
+        if target is None or not target.get_rect().contains(((0, 0), size)):
+            factor = max(
+                [int(size[0] / GAME_WIDTH)]
+                + [
+                    _integer_scale_factor(w, h)
+                    for w, h in pygame.display.get_desktop_sizes()
+                ]
+            )
+            target = pygame.Surface((GAME_WIDTH * factor, GAME_HEIGHT * factor))
+            self._integer_surface = target
+        return target.subsurface(((0, 0), size))
+
     def _scale_pos(self, pos: types.Coordinate) -> types.Coordinate:
         x, y = pos
         aspect_w, aspect_h = self._aspect_surface.get_size()
@@ -112,4 +490,9 @@ class Game(config.Loadable):
     def get_scale_factor(self) -> float:
         width_scale = self.screen.get_width() / GAME_WIDTH
         height_scale = self.screen.get_height() / GAME_HEIGHT
-        return min(width_scale, height_scale)
+        scale_factor = min(width_scale, height_scale)
+        # windows smaller than the draw surface can't be integer scaled, so
+        # fall back to shrinking the frame to fit
+        if self.scale_mode is types.ScaleMode.INTEGER and scale_factor >= 1:
+            return _integer_scale_factor(*self.screen.get_size())
+        return scale_factor
@@ -0,0 +1,200 @@
+import contextlib
+import cProfile
+import csv
+import json
+import pathlib
+import pstats
+import time
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+# frames of samples kept for each phase; 10s at 60fps
+DEFAULT_PROFILE_WINDOW = 600
+PERCENTILES = (50, 95, 99)
+# total busy time per frame, ie. excluding time spent waiting on the frame cap
+FRAME_PHASE = "frame"
+
+
+class PhaseTimer:
+    """Records wall-clock durations of named, sequential phases"""
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    @property
+    def total(self) -> float:
+        return sum(elapsed for _, elapsed in self.phases)
+
+    def report(self) -> str:
+        total = self.total
+        width = max((len(name) for name, _ in self.phases), default=0)
+        lines = [
+            f"{name:<{width}} {elapsed * 1e3:>9.2f}ms {elapsed / total:>6.1%}"
+            for name, elapsed in self.phases
+        ]
+        lines.append(f"{'total':<{width}} {total * 1e3:>9.2f}ms")
+        return "\n".join(lines)
+
+
+class RollingSamples:
+    """Fixed-size ring buffer of the most recent samples of a timing
+
+    Args:
+        size (int): number of samples to keep
+    """
+
+    def __init__(self, size: int = DEFAULT_PROFILE_WINDOW):
+        self._samples = np.zeros(size)
+        self._next = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, len(self._samples))
+
+    def add(self, sample: float):
+        self._samples[self._next] = sample
+        self._next = (self._next + 1) % len(self._samples)
+        self.count += 1
+
+    def values(self) -> np.ndarray:
+        return self._samples[: len(self)]
+
+    def summary(self) -> Dict[str, float]:
+        """Returns percentiles, mean and max of the kept samples in ms"""
+        values = self.values() * 1e3
+        if not len(values):
+            return {}
+        summary = {
+            f"p{p}_ms": float(v)
+            for p, v in zip(
+                PERCENTILES, np.percentile(values, PERCENTILES), strict=True
+            )
+        }
+        summary["mean_ms"] = float(values.mean())
+        summary["max_ms"] = float(values.max())
+        return summary
+
+
+class FrameProfiler:
+    """Times each phase of every frame, keeping a rolling window of samples
+
+    The game loop calls `start_frame`, then `mark` as each phase ends, then
+    `end_frame`. A phase's time runs from the previous mark, so marks cost a
+    single clock read. Idle phases, like waiting on the frame cap, are kept
+    but left out of the frame's busy time.
+
+    Args:
+        window (int): number of frames to keep samples for
+    """
+
+    def __init__(self, window: int = DEFAULT_PROFILE_WINDOW):
+        self.window = window
+        self.frames = 0
+        self.phases: Dict[str, RollingSamples] = {}
+        self._start = self._last = self._idle = 0.0
+        # marks are ignored outside of a frame, eg. if profiling starts mid-frame
+        self._in_frame = False
+        self._cprofile: cProfile.Profile | None = None
+        self._cprofile_frames = 0
+        self._cprofile_path: str | None = None
+
+    def start_frame(self):
+        if self._cprofile_frames and self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._start = self._last = time.perf_counter()
+        self._idle = 0.0
+        self._in_frame = True
+
+    def mark(self, phase: str, idle: bool = False):
+        if not self._in_frame:
+            return
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        if idle:
+            self._idle += elapsed
+        self._add(phase, elapsed)
+
+    def end_frame(self):
+        if not self._in_frame:
+            return
+        self._in_frame = False
+        self._add(FRAME_PHASE, time.perf_counter() - self._start - self._idle)
+        self.frames += 1
+        if self._cprofile is not None and self.frames >= self._cprofile_frames:
+            self._dump_cprofile()
+
+    def cprofile(self, frames: int, path: str | None = None):
+        """Runs the next `frames` frames under cProfile
+
+        The stats are written to `path` if set, and the most expensive calls
+        printed, once the frames have run.
+        """
+        self._cprofile_frames = self.frames + frames
+        self._cprofile_path = path
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Returns each phase's timing summary, keyed by phase name"""
+        # list phases in the order they run, with the frame total last
+        names = sorted(self.phases, key=lambda name: name == FRAME_PHASE)
+        return {name: self.phases[name].summary() for name in names}
+
+    def report(self) -> str:
+        width = max((len(name) for name in self.phases), default=0)
+        lines = [f"{'phase':<{width}} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+        for name, s in self.summary().items():
+            lines.append(
+                f"{name:<{width}} {s['p50_ms']:>6.2f}ms {s['p95_ms']:>6.2f}ms "
+                f"{s['p99_ms']:>6.2f}ms {s['max_ms']:>6.2f}ms"
+            )
+        return "\n".join(lines)
+
+    def export(self, path: str | pathlib.Path):
+        """Writes the phase summaries to a .csv or .json file"""
+        path = pathlib.Path(path)
+        summary = self.summary()
+        if path.suffix == ".csv":
+            with path.open("w", newline="") as f:
+                writer = csv.writer(f)
+                columns = [f"p{p}_ms" for p in PERCENTILES] + ["mean_ms", "max_ms"]
+                writer.writerow(["phase", *columns, "samples"])
+                for name, s in summary.items():
+                    samples = len(self.phases[name])
+                    writer.writerow([name, *(s[c] for c in columns), samples])
+        elif path.suffix == ".json":
+            data = {"frames": self.frames, "window": self.window, "phases": summary}
+            path.write_text(json.dumps(data, indent=2) + "\n")
+        else:
+            raise ValueError(f"Can't export frame profiles as {path.suffix}")
+
+    def _add(self, phase: str, sample: float):
+        samples = self.phases.get(phase)
+        if samples is None:
+            samples = self.phases[phase] = RollingSamples(self.window)
+        samples.add(sample)
+
+    def _dump_cprofile(self):
+        profile, self._cprofile = self._cprofile, None
+        self._cprofile_frames = 0
+        profile.disable()  # type: ignore
+        if self._cprofile_path:
+            profile.dump_stats(self._cprofile_path)  # type: ignore
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(20)  # type: ignore
+
+
+__all__ = [
+    "DEFAULT_PROFILE_WINDOW",
+    "FrameProfiler",
+    "PhaseTimer",
+    "RollingSamples",
+]
@@ -0,0 +1,253 @@
+import dataclasses
+import json
+import pathlib
+import struct
+import time
+from typing import IO, Any, Dict, List
+
+import pygame
+
+from .controls import KeyState
+from .game import GAME_HEIGHT, GAME_WIDTH
+
+# a log is a header followed by one record per tick; each tick record is
+# followed by the events handled before that tick
+MAGIC = b"GAIR"
+FORMAT_VERSION = 2
+# magic, format version, simulated seconds per tick
+_HEADER = struct.Struct("<4sHd")
+# pressed control keys, number of events, state hash after the tick
+_TICK = struct.Struct("<BHI")
+# event type, length of the JSON-encoded event attributes
+_EVENT = struct.Struct("<IH")
+
+# event attribute types that can be written to a log
+_ATTRIBUTE_TYPES = (bool, int, float, str, tuple, type(None))
+
+
+class ReplayFormatError(ValueError):
+    """Raised when a file isn't a valid input log"""
+
+
+@dataclasses.dataclass
+class TickRecord:
+    """Input for a single recorded tick
+
+    Args:
+        keys (KeyState): control keys pressed during the tick
+        events (List[pygame.event.Event]): events handled before the tick
+        state_hash (int): `CatGame.state_hash` after the tick
+    """
+
+    keys: KeyState
+    events: List[pygame.event.Event]
+    state_hash: int
+
+
+def _encode_event(event: pygame.event.Event) -> bytes:
+    # drop attributes like `window` that can't be replayed anyway
+    attrs = {k: v for k, v in event.dict.items() if isinstance(v, _ATTRIBUTE_TYPES)}
+    payload = json.dumps(attrs, separators=(",", ":")).encode()
+    return _EVENT.pack(event.type, len(payload)) + payload
+
+
+def _tuples(value: Any) -> Any:
+    # JSON has no tuples, and events only ever hold tuples, never lists
+    if isinstance(value, list):
+        return tuple(_tuples(v) for v in value)
+    return value
+
+
+def _decode_attributes(payload: bytes) -> Dict[str, Any]:
+    attrs = json.loads(payload)
+    if not isinstance(attrs, dict):
+        raise ValueError("Event attributes must be an object")
+    return {k: _tuples(v) for k, v in attrs.items()}
+
+
+class Recorder:
+    """Writes the input a CatGame receives to a compact binary log
+
+    Attach a recorder to a game with `CatGame.recorder`. Events are buffered
+    until the next tick and written with it, along with the keys pressed and
+    a hash of the game state after the tick, so a replay can check that it
+    reproduces each tick exactly. Events handled after the last tick never
+    affected the game and are dropped.
+
+    Args:
+        file (IO[bytes]): binary file to write the log to
+        dt (float): simulated seconds per tick
+    """
+
+    def __init__(self, file: IO[bytes], dt: float):
+        self.file = file
+        self.ticks = 0
+        self._events: List[bytes] = []
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, dt))
+
+    @classmethod
+    def open(cls, path: str | pathlib.Path, dt: float) -> "Recorder":
+        return cls(open(path, "wb"), dt)
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def event(self, event: pygame.event.Event):
+        self._events.append(_encode_event(event))
+
+    def tick(self, keys: KeyState, state_hash: int):
+        self.file.write(_TICK.pack(keys.mask, len(self._events), state_hash))
+        self.file.writelines(self._events)
+        self._events.clear()
+        self.ticks += 1
+
+    def close(self):
+        self._events.clear()
+        self.file.close()
+
+
+@dataclasses.dataclass
+class Replay:
+    """Recorded input log
+
+    Args:
+        dt (float): simulated seconds per tick
+        ticks (List[TickRecord]): recorded ticks, in order
+    """
+
+    dt: float
+    ticks: List[TickRecord]
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path) -> "Replay":
+        return cls.from_bytes(pathlib.Path(path).read_bytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        if len(data) < _HEADER.size:
+            raise ReplayFormatError("Input log is truncated")
+        magic, version, dt = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayFormatError("Not an input log")
+        if version != FORMAT_VERSION:
+            raise ReplayFormatError(f"Unsupported input log version {version}")
+
+        ticks = []
+        offset = _HEADER.size
+        try:
+            while offset < len(data):
+                mask, count, state_hash = _TICK.unpack_from(data, offset)
+                offset += _TICK.size
+                events = []
+                for _ in range(count):
+                    event_type, length = _EVENT.unpack_from(data, offset)
+                    offset += _EVENT.size
+                    attrs = _decode_attributes(data[offset : offset + length])
+                    offset += length
+                    events.append(pygame.event.Event(event_type, attrs))
+                ticks.append(TickRecord(KeyState(mask), events, state_hash))
+        except (struct.error, ValueError) as e:
+            raise ReplayFormatError(f"Input log is corrupt at byte {offset}") from e
+        return cls(dt, ticks)
+
+
+@dataclasses.dataclass
+class ReplayResult:
+    """Outcome of replaying an input log
+
+    Args:
+        ticks (int): number of ticks replayed
+        elapsed (float): wall-clock seconds the replay took
+        diverged_at (int | None): index of the first tick whose state hash
+            didn't match the recording, or None if all of them did
+        expected_hash (int): recorded hash of the diverging tick
+        actual_hash (int): replayed hash of the diverging tick
+    """
+
+    ticks: int
+    elapsed: float
+    diverged_at: int | None = None
+    expected_hash: int = 0
+    actual_hash: int = 0
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        timing = (
+            f"{self.ticks} ticks in {self.elapsed:.3f}s: "
+            f"{self.ticks_per_second:.1f} ticks/s"
+        )
+        if self.diverged_at is None:
+            return f"{timing}, no divergence"
+        return (
+            f"{timing}, diverged at tick {self.diverged_at} "
+            f"(expected {self.expected_hash:08x}, got {self.actual_hash:08x})"
+        )
+
+
+def replay(
+    log: Replay | str | pathlib.Path, stop_on_divergence: bool = True
+) -> ReplayResult:
+    """Feeds an input log to a new headless CatGame as fast as possible
+
+    Each tick's events and keys are fed to the game in the order they were
+    recorded, and the game state is checked against the recorded hash after
+    every tick.
+
+    Args:
+        log (Replay | str | Path): input log, or the path to one
+        stop_on_divergence (bool): stop at the first tick that diverges;
+            otherwise run to the end to measure the full log
+
+    Returns:
+        ReplayResult: tick count and timing, and the first divergence
+    """
+    # the game scene records through this module, so import it lazily
+    from .episodes import init_headless
+    from .scenes.cat import CatGame
+
+    if not isinstance(log, Replay):
+        log = Replay.load(log)
+    if not pygame.display.get_init():
+        init_headless()
+    game = CatGame.new(
+        screen=pygame.Surface((GAME_WIDTH, GAME_HEIGHT)), deterministic=True
+    )
+    result = ReplayResult(ticks=0, elapsed=0.0)
+
+    try:
+        start = time.perf_counter()
+        for i, record in enumerate(log.ticks):
+            for event in record.events:
+                game.handle_event(event)
+            game.step(record.keys)
+            result.ticks += 1
+
+            state_hash = game.state_hash()
+            if state_hash != record.state_hash and result.diverged_at is None:
+                result.diverged_at = i
+                result.expected_hash = record.state_hash
+                result.actual_hash = state_hash
+                if stop_on_divergence:
+                    break
+        result.elapsed = time.perf_counter() - start
+    finally:
+        game.unload()
+    return result
+
+
+__all__ = [
+    "FORMAT_VERSION",
+    "MAGIC",
+    "Recorder",
+    "Replay",
+    "ReplayFormatError",
+    "ReplayResult",
+    "TickRecord",
+    "replay",
+]
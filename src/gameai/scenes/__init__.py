@@ -1,3 +1,4 @@
+from .loader import LoadingScene, LoadProgress, SceneLoader, load_scene
 from .menu import MainMenu, Menu
 from .scene import Scene, end_current_scene, get_active_scene, new_scene
 
@@ -5,6 +6,10 @@ __all__ = [
     "Scene",
     "Menu",
     "MainMenu",
+    "LoadingScene",
+    "LoadProgress",
+    "SceneLoader",
+    "load_scene",
     "end_current_scene",
     "get_active_scene",
     "new_scene",
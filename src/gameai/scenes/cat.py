@@ -1,54 +1,243 @@
 from typing import List, Type
 
+import numpy as np
 import pygame
 
 from gameai import config
-from gameai.sprites import Collision2D, cat
+from gameai.behaviour import BehaviourAgent, BehaviourRuntime, ThinkScheduler
+from gameai.camera import Camera
+from gameai.controls import KeyState
+from gameai.replay import Recorder
+from gameai.sprites import (
+    BatchedDirty,
+    Character2D,
+    PhysicsWorld,
+    StaticLayer,
+    Surface2D,
+    cat,
+)
+from gameai.tilemap import ChunkStreamer, TileMap
 
+from .loader import ReportStage
 from .scene import Scene, end_current_scene
 
+# share of a game's own load spent on sprite settings and images; the rest
+# goes to registering the level's collision boxes
+ASSETS_FRACTION = 0.5
+
 
 class CatGame(config.Loadable, Scene):
 
     settings_file: str = config.CAT_GAME_SETTINGS_FILE
     settings_type: Type[config.CatGameSettings] = config.CatGameSettings
 
-    def __init__(self, settings: config.CatGameSettings, screen: pygame.Surface):
+    def __init__(
+        self,
+        settings: config.CatGameSettings,
+        screen: pygame.Surface,
+        deterministic: bool = False,
+        report: ReportStage | None = None,
+    ):
         super().__init__(screen)
+        report = report or _ignore_progress
         self.surfaces = pygame.sprite.LayeredDirty()
         self.characters = pygame.sprite.LayeredDirty()
-        self.player = cat.Player.load()
+        # the camera follows the player, and only what's in view is drawn
+        camera = settings.camera or config.CameraSettings(screen.get_rect())
+        self.camera = Camera(camera)
+        # surfaces never move, so they're baked into the background once and
+        # only the characters are drawn each frame
+        self.background = StaticLayer(
+            screen.get_size(),
+            background="white",
+            chunk_size=settings.background_chunk_size,
+        )
+        # characters in view, which are the only ones in the sprites group
+        self.visible: List[Character2D] = []
+        self.sprites = BatchedDirty(background=self.background.image)
+        # fraction of a tick to draw characters ahead of their last position
+        self._alpha = 1.0
+        # every character is stepped in one batch
+        self.physics = PhysicsWorld()
+        # chunks of a tilemap level are streamed in around the player as it
+        # moves; see _stream_level
+        self.level: ChunkStreamer | None = None
+        report("assets", 0.0)
+        if settings.level is not None:
+            tilemap = TileMap(config.ASSETS_DIR / settings.level)
+            self.level = ChunkStreamer(tilemap)
+        else:
+            # use new instances so each game has its own independent world
+            self.add_surface(cat.Floor.new())
+        report("assets", ASSETS_FRACTION / 2)
+        self.player = cat.Player.new()
         self.characters.add(self.player)
-        self.surfaces.add(cat.Floor.load())
+        self.physics.add(self.player)
+        # a time budget thinks less on slower machines, so games that must be
+        # reproducible, like replays and episodes, only limit think counts
+        self.scheduler = ThinkScheduler(
+            None if deterministic else settings.ai_budget_ms,
+            settings.ai_lod_levels,
+            max_thinks=settings.ai_max_thinks,
+        )
+        self.behaviours = BehaviourRuntime(self.scheduler)
         self.score = 0
+        # set to record the game's input; see gameai.replay
+        self.recorder: Recorder | None = None
+        report("colliders", ASSETS_FRACTION)
+        if self.level is not None:
+            # load the level around the player now rather than on the first tick
+            self._stream_level(report)
+
+    def add_surface(self, surface: Surface2D):
+        """Adds a static surface such as a floor or platform to the scene"""
+        self.surfaces.add(surface)
+        self.background.add(surface)
+        self.physics.add_surface(surface)
+
+    def remove_surface(self, surface: Surface2D):
+        """Removes a surface added with add_surface"""
+        self.surfaces.remove(surface)
+        self.background.remove(surface)
+        self.physics.remove_surface(surface)
+
+    def add_agent(self, agent: BehaviourAgent):
+        """Adds a behaviour tree controlled agent to the scene"""
+        if agent.character is not None:
+            self.characters.add(agent.character)
+            # let the agent's tree press keys directly in the physics world
+            agent.controls = self.physics.add(agent.character).controls
+        self.behaviours.add(agent)
 
     def draw(self) -> List[pygame.Rect]:
-        # TODO: use a background surface instead
-        self.screen.fill("white")
-        self.surfaces.update(screen=self.screen)
-        self.characters.update(screen=self.screen)
-        return self.characters.draw(self.screen) + self.surfaces.draw(self.screen)
+        self._cull()
+        # re-bakes static sprites that changed or scrolled into view, and
+        # repaints what's over them
+        self.background.scroll_to(self.camera.viewport.topleft)
+        self.sprites.repaint(*self.background.refresh())
+        # characters dirty themselves if they've moved since the last frame
+        offset = self.camera.offset
+        for character in self.visible:
+            character.update(offset)
+        return self.sprites.draw(self.screen)
 
     def handle_event(self, event: pygame.event.Event):
+        if self.recorder is not None:
+            self.recorder.event(event)
+        self.behaviours.handle_event(event)
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
+                # a recording covers a single play session
+                if self.recorder is not None:
+                    self.recorder.close()
+                    self.recorder = None
                 # TODO: show game menu
                 self._wipe()
                 end_current_scene()
 
     def tick(self, dt: float):
-        self.player.move(pygame.key.get_pressed())
-        visible_surfaces = [s for s in self.surfaces if s.visible]
-        # detect collisions between the player and visible objects
-        # XXX: it's expensive to handle collisions on every frame
-        coll = Collision2D.between(self.player, visible_surfaces)  # type: ignore
-        self.player.handle_collision(coll)
+        self.step(pygame.key.get_pressed())
+
+    def step(self, keys: pygame.key.ScancodeWrapper | KeyState):
+        """Advances the game by one tick with the given player input"""
+        if self.level is not None:
+            self._stream_level()
+        # only agents woken by an event or blackboard change run their trees,
+        # favouring those nearest the player
+        self.scheduler.focus = self.player.rect.center
+        self.behaviours.tick()
+        if not isinstance(keys, KeyState):
+            keys = KeyState.from_pressed(keys)
+        self.player.body.controls.mask = keys.mask  # type: ignore
+        self.physics.step()
+        if self.recorder is not None:
+            self.recorder.tick(keys, self.state_hash())
+
+    def _stream_level(self, report: ReportStage | None = None):
+        # the area the camera will show around the player must be loaded
+        # before the player can collide with it
+        area = self.camera.viewport.copy()
+        area.center = self.player.rect.center
+        update = self.level.update(area)  # type: ignore
+        for chunk in update.evicted:
+            if chunk.image is not None:
+                self.background.remove(chunk)
+            for collider in chunk.colliders:
+                self.physics.remove_surface(collider)
+        total = sum(len(chunk.colliders) for chunk in update.loaded)
+        added = 0
+        for chunk in update.loaded:
+            if chunk.image is not None:
+                self.background.add(chunk)
+            for collider in chunk.colliders:
+                self.physics.add_surface(collider)
+                added += 1
+                if report is not None:
+                    fraction = added / total
+                    report(
+                        "colliders", ASSETS_FRACTION + (1 - ASSETS_FRACTION) * fraction
+                    )
+
+    def state_hash(self) -> int:
+        """Returns a hash of the simulation state, for checking replays"""
+        return self.physics.checksum()
+
+    def interpolate(self, alpha: float):
+        # characters are positioned when drawing, once the camera knows
+        # which ones are in view
+        self._alpha = alpha
+        # this frame's ticks are done, so the next share a new think budget
+        self.scheduler.end_frame()
+
+    def _cull(self):
+        """Follows the player and positions the characters in view"""
+        physics = self.physics
+        player = self.player
+        indices = np.array([player.body.index])
+        x, y = physics.interpolate(self._alpha, indices)[0].tolist()
+        width, height = player.rect.size
+        self.camera.look_at((x + width / 2, y + height / 2))
+
+        indices = physics.query(self.camera.visible_area)
+        positions = physics.interpolate(self._alpha, indices).tolist()
+        visible = [physics.characters[i] for i in indices.tolist()]
+        for character, (x, y) in zip(visible, positions, strict=True):
+            character.render_pos = (x, y)
+
+        # characters leaving the view are removed from the sprites group,
+        # which repaints where they were
+        shown = set(visible)
+        self.sprites.remove(*(c for c in self.visible if c not in shown))
+        self.sprites.add(*visible)
+        self.visible = visible
 
     def dirty_all_sprites(self):
-        all_sprites = self.surfaces.sprites() + self.characters.sprites()
-        for sprite in all_sprites:
-            sprite.dirty = 1
+        self.sprites.redraw_all()
+
+    @property
+    def resident_bytes(self) -> int:
+        # surfaces are baked into the background, and character frames are
+        # shared assets, so only the background and level chunks count
+        total = config.surface_bytes(self.background.image)
+        if self.level is not None:
+            total += self.level.resident_bytes
+        return total
+
+    def unload(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.level is not None:
+            self.level.close()
+            self.level = None
+        for group in (self.sprites, self.background, self.surfaces, self.characters):
+            group.empty()
+        self.visible = []
 
     def _wipe(self):
         super()._wipe()
         self.player._reset()
+
+
+def _ignore_progress(stage: str, fraction: float):
+    pass  # noop
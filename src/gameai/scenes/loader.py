@@ -0,0 +1,210 @@
+import dataclasses
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from inspect import signature
+from typing import Any, Callable, Dict, List, Type
+
+import pygame
+
+from .scene import Scene, end_current_scene, new_scene
+
+LOADING_BAR_SIZE = (320, 12)
+LOADING_BAR_COLOR = "white"
+# share of a scene load spent reading its settings; the rest is reported by
+# the scene itself, if it can
+SETTINGS_FRACTION = 0.1
+
+
+@dataclasses.dataclass
+class LoadProgress:
+    """Progress of a scene being loaded
+
+    Args:
+        stage (str): name of the stage being run, or "done" once loaded
+        fraction (float): estimated fraction of the load completed
+        elapsed (float): seconds since loading started
+        timings (Dict[str, float]): seconds spent in each finished stage
+    """
+
+    stage: str
+    fraction: float
+    elapsed: float
+    timings: Dict[str, float] = dataclasses.field(default_factory=dict)
+
+
+# called by load functions at the start of each stage with the stage name and
+# the fraction of the load completed so far
+ReportStage = Callable[[str, float], None]
+
+
+class SceneLoader:
+    """Builds a scene on a worker thread
+
+    `load` is called on the worker with a function to report each stage it
+    starts and its progress through it, which records the time spent in
+    each stage and updates `progress`. The scene is handed back with
+    `result`, typically once `done`, so the caller's thread never waits on
+    parsing settings or loading images.
+
+    Args:
+        load (Callable[[ReportStage], Scene]): builds the scene
+        on_progress (Callable[[LoadProgress], None] | None): called on the
+            worker thread with each report, and once loading is done
+    """
+
+    def __init__(
+        self,
+        load: Callable[[ReportStage], Scene],
+        on_progress: Callable[[LoadProgress], None] | None = None,
+    ):
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._progress = LoadProgress("queued", 0.0, 0.0)
+        self._start = time.perf_counter()
+        self._stage_start = self._start
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="scene-loader")
+        self._future: Future = self._executor.submit(self._run, load)
+        # the worker isn't needed after this load, so let it exit once done
+        self._executor.shutdown(wait=False)
+
+    @property
+    def progress(self) -> LoadProgress:
+        with self._lock:
+            return dataclasses.replace(self._progress)
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def exception(self, timeout: float | None = None) -> BaseException | None:
+        """Returns what the load function raised, or None if it succeeded"""
+        return self._future.exception(timeout)
+
+    def result(
+        self,
+        timeout: float | None = None,
+        fallback: Callable[[], Scene] | None = None,
+    ) -> Scene:
+        """Returns the loaded scene, waiting for it if needed
+
+        Raises whatever the load function raised, unless there's a fallback.
+
+        Args:
+            timeout (float | None): seconds to wait, or None to wait until done
+            fallback (Callable[[], Scene] | None): called to load the scene on
+                the caller's thread if the background load failed
+        """
+        error = self._future.exception(timeout)
+        if error is None:
+            return self._future.result()
+        if fallback is None:
+            raise error
+        print(f"Failed to load scene in the background, loading it now: {error}")
+        return fallback()
+
+    def _run(self, load: Callable[[ReportStage], Scene]) -> Scene:
+        scene = load(self._report)
+        self._report("done", 1.0)
+        return scene
+
+    def _report(self, stage: str, fraction: float):
+        now = time.perf_counter()
+        with self._lock:
+            progress = self._progress
+            timings = dict(progress.timings)
+            # stages report progress as they go, and are timed until the next
+            if stage != progress.stage:
+                if progress.stage != "queued":
+                    timings[progress.stage] = now - self._stage_start
+                self._stage_start = now
+            self._progress = LoadProgress(stage, fraction, now - self._start, timings)
+            progress = dataclasses.replace(self._progress)
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+
+def load_scene(scene_type: Type[Any], report: ReportStage, *args, **kwargs) -> Scene:
+    """Loads a Loadable scene in stages, for use with SceneLoader
+
+    Reads and decodes the scene's settings, including any images they
+    reference, then builds the scene with `scene_type.load`, so later loads
+    return the same instance. Scenes whose constructor takes a `report`
+    argument are passed a reporter to follow their own stages with, such
+    as loading each asset, with fractions of their share of the load.
+
+    Args:
+        scene_type (Type[Loadable]): scene class to load
+        report (ReportStage): progress reporter passed in by SceneLoader
+        args, kwargs: passed on to the scene's constructor
+    """
+    report("settings", 0.0)
+    settings = scene_type._load_settings()
+    report("scene", SETTINGS_FRACTION)
+
+    def report_scene(stage: str, fraction: float):
+        report(stage, SETTINGS_FRACTION + (1 - SETTINGS_FRACTION) * fraction)
+
+    if "report" in signature(scene_type).parameters:
+        kwargs["report"] = report_scene
+    return scene_type.load(*args, settings=settings, **kwargs)
+
+
+class LoadingScene(Scene):
+    """Progress bar shown until a scene loader is done
+
+    Once the loader is done, the loading scene is replaced with the loaded
+    scene.
+
+    Args:
+        loader (SceneLoader): loader to wait for
+        screen (pygame.Surface): draw surface for rendering the scene
+        fallback (Callable[[], Scene] | None): loads the scene on the main
+            thread if the loader fails; otherwise its error is raised
+    """
+
+    def __init__(
+        self,
+        loader: SceneLoader,
+        screen: pygame.Surface,
+        fallback: Callable[[], Scene] | None = None,
+    ):
+        super().__init__(screen)
+        self.loader = loader
+        self.fallback = fallback
+        self.bar = pygame.Rect((0, 0), LOADING_BAR_SIZE)
+        self.bar.center = screen.get_rect().center
+        self._drawn_fraction = -1.0
+
+    def draw(self) -> List[pygame.Rect]:
+        fraction = self.loader.progress.fraction
+        if fraction == self._drawn_fraction:
+            return []
+        self._drawn_fraction = fraction
+        self.screen.fill("black", self.bar)
+        pygame.draw.rect(self.screen, LOADING_BAR_COLOR, self.bar, width=1)
+        filled = self.bar.inflate(-4, -4)
+        filled.width = round(filled.width * fraction)
+        self.screen.fill(LOADING_BAR_COLOR, filled)
+        return [self.bar]
+
+    def handle_event(self, event: pygame.event.Event):
+        pass  # noop
+
+    def tick(self, dt: float):
+        if self.loader.done():
+            end_current_scene()
+            new_scene(self.loader.result(fallback=self.fallback))
+
+    def dirty_all_sprites(self):
+        self.screen.fill("black")
+        self._drawn_fraction = -1.0
+
+
+__all__ = [
+    "SETTINGS_FRACTION",
+    "LoadProgress",
+    "LoadingScene",
+    "ReportStage",
+    "SceneLoader",
+    "load_scene",
+]
@@ -1,11 +1,12 @@
-from typing import List, Type
+from typing import Callable, List, Type
 
 import pygame
 
 from gameai import config
-from gameai.sprites import Button
+from gameai.sprites import BatchedDirty, Button
+from gameai.types import ColorValue
 
-from .cat import CatGame
+from .loader import LoadingScene, LoadProgress, ReportStage, SceneLoader, load_scene
 from .scene import Scene, end_current_scene, new_scene
 
 
@@ -16,14 +17,18 @@ class Menu(Scene):
         screen (pygame.Surface): draw surface for rendering the menu
     """
 
+    background: ColorValue = "black"
+
     def __init__(self, screen: pygame.Surface):
         super().__init__(screen)
         # need https://github.com/pygame/pygame/pull/4635 to be merged
         # to get rid of the pylance type assignment error here
-        self.buttons: pygame.sprite.LayeredDirty[Button] = pygame.sprite.LayeredDirty()  # type: ignore
+        self.buttons: BatchedDirty[Button] = BatchedDirty(  # type: ignore
+            background=self.background
+        )
 
     def draw(self) -> List[pygame.Rect]:
-        self.buttons.update(screen=self.screen)
+        self.buttons.update()
         return self.buttons.draw(self.screen)
 
     def handle_event(self, event: pygame.event.Event):
@@ -40,9 +45,19 @@ class Menu(Scene):
         pass  # noop
 
     def dirty_all_sprites(self):
-        for button in self.buttons:
-            if button.visible:
-                button.dirty = 1
+        self.buttons.redraw_all()
+
+    @property
+    def resident_bytes(self) -> int:
+        # buttons without text share their image asset
+        return sum(
+            config.surface_bytes(button.image)
+            for button in self.buttons
+            if button.image is not button.opts.image
+        )
+
+    def unload(self):
+        self.buttons.empty()
 
 
 class MainMenu(config.Loadable, Menu):
@@ -62,6 +77,11 @@ class MainMenu(config.Loadable, Menu):
         self.options_button = Button(settings.options_button, self._options)
         self.exit_button = Button(settings.exit_button, self._exit)
         self.buttons.add(self.play_button, self.options_button, self.exit_button)
+        self.show_loading_scene = settings.show_loading_scene
+        # the game is built in the background once the menu is showing; set
+        # the hook before then to follow its progress and timings
+        self.game_loader: SceneLoader | None = None
+        self.on_load_progress: Callable[[LoadProgress], None] | None = None
 
     def draw(self) -> List[pygame.Rect]:
         button_height = self.play_button.rect.height
@@ -75,8 +95,47 @@ class MainMenu(config.Loadable, Menu):
 
         return super().draw()
 
+    def tick(self, dt: float):
+        # start building the game while the player is still in the menu
+        self._start_loading()
+
+    def _start_loading(self) -> SceneLoader:
+        if self.game_loader is None:
+            self.game_loader = SceneLoader(self._load_game, self.on_load_progress)
+        return self.game_loader
+
+    def _load_game(self, report: ReportStage) -> Scene:
+        # defer importing the game scene to the loader's thread
+        from .cat import CatGame
+
+        return load_scene(CatGame, report, screen=self.screen)
+
+    def _load_game_now(self) -> Scene:
+        from .cat import CatGame
+
+        # the background load failed, so start the next one afresh
+        self.game_loader = None
+        return CatGame.load(screen=self.screen)
+
     def _play(self):
-        new_scene(CatGame.load(screen=self.screen))
+        loader = self._start_loading()
+        if (
+            loader.done()
+            and loader.exception() is None
+            and not config.loadable_cache.is_cached(loader.result())
+        ):
+            # the game has been evicted from the cache since it was built
+            self.game_loader = None
+            loader = self._start_loading()
+        if loader.done() or not self.show_loading_scene:
+            new_scene(loader.result(fallback=self._load_game_now))
+        else:
+            new_scene(LoadingScene(loader, self.screen, self._load_game_now))
+
+    def unload(self):
+        super().unload()
+        # a game still loading is left to finish, and is cached as usual
+        self.game_loader = None
 
     def _options(self):
         new_scene(OptionsMenu.load(screen=self.screen))
@@ -95,6 +154,7 @@ class OptionsMenu(config.Loadable, Menu):
 
     settings_file: str = config.OPTIONS_MENU_SETTINGS_FILE
     settings_type: Type[config.OptionsMenuSettings] = config.OptionsMenuSettings
+    background: ColorValue = "white"
 
     def __init__(self, settings: config.OptionsMenuSettings, screen: pygame.Surface):
         super().__init__(screen)
@@ -106,7 +166,6 @@ class OptionsMenu(config.Loadable, Menu):
     def draw(self) -> List[pygame.Rect]:
         # TODO: add panes for different option types (general, video, etc.) and
         # flesh out available options; add a toggle button type?
-        self.screen.fill("white")
         self._draw_left_panel()
         return super().draw()
 
@@ -4,6 +4,8 @@ from typing import List
 
 import pygame
 
+from gameai.config import loadable_cache
+
 
 class Scene(abc.ABC):
     """Defines methods for game scenes
@@ -32,6 +34,27 @@ class Scene(abc.ABC):
     def dirty_all_sprites(self):
         pass
 
+    # optional hook for scenes that move sprites, so not abstract
+    def interpolate(self, alpha: float):  # noqa: B027
+        """Positions sprites for drawing between the last two ticks
+
+        Args:
+            alpha (float): fraction of a tick elapsed since the last one
+        """
+
+    @property
+    def resident_bytes(self) -> int:
+        """Estimated memory held by the scene, other than shared assets"""
+        return 0
+
+    # optional hook for scenes that hold more than shared assets
+    def unload(self):  # noqa: B027
+        """Releases the scene's surfaces and other resources
+
+        Called when the scene is evicted from the loadable cache or ended
+        with `unload`. The scene can't be used afterwards.
+        """
+
     def _wipe(self):
         self.screen.fill("black")
         pygame.display.update()
@@ -48,12 +71,24 @@ def get_active_scene() -> Scene:
 
 def new_scene(scene: Scene):
     """Starts a new scene as the active scene"""
+    # scenes on the stack are in use, so mustn't be evicted from the cache
+    loadable_cache.pin(scene)
     __scenes.appendleft(scene)
 
 
-def end_current_scene() -> Scene:
-    """Ends the currently active scene and returns the next in the stack"""
-    __scenes.popleft()
+def end_current_scene(unload: bool = False) -> Scene:
+    """Ends the currently active scene and returns the next in the stack
+
+    Args:
+        unload (bool): unload the ended scene now, unless it's still further
+            down the stack, rather than keeping it cached to resume later
+    """
+    scene = __scenes.popleft()
+    loadable_cache.unpin(scene)
+    if unload and scene not in __scenes:
+        # scenes that aren't cached are unloaded directly
+        if not loadable_cache.evict(scene):
+            scene.unload()
     active_scene = get_active_scene()
     if active_scene is None:
         pygame.event.post(pygame.event.Event(pygame.QUIT))
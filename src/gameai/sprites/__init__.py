@@ -1,10 +1,19 @@
 from .button import Button
 from .character import Character2D
-from .collision import Collision2D, SupportsCollision
+from .collision import Collision2D, SpatialHash, SupportsCollision
+from .group import BatchedDirty, StaticLayer
+from .physics import PhysicsBody, PhysicsWorld
+from .surface import Surface2D
 
 __all__ = [
+    "BatchedDirty",
     "Button",
     "Character2D",
     "Collision2D",
+    "PhysicsBody",
+    "PhysicsWorld",
+    "SpatialHash",
+    "StaticLayer",
+    "Surface2D",
     "SupportsCollision",
 ]
@@ -15,12 +15,20 @@ class Button(pygame.sprite.DirtySprite):
     """
 
     _hovered: bool = False
+    # hover state the image was last drawn with; None if it's never been drawn
+    _rendered_hover: bool | None = None
 
     def __init__(self, opts: ButtonOptions, on_click: Callable):
         super().__init__()
 
         image_size = (opts.width, opts.height)
-        self.image = opts.image if opts.image else pygame.Surface(image_size)
+        if opts.image is None:
+            self.image = pygame.Surface(image_size)
+        elif opts.text:
+            # image assets are shared, so copy before drawing text onto it
+            self.image = opts.image.copy()
+        else:
+            self.image = opts.image
 
         self.opts = opts
         self.on_click = on_click
@@ -28,12 +36,18 @@ class Button(pygame.sprite.DirtySprite):
         self.rect = self.image.get_rect()
         self.rect.update(opts.topleft, image_size)
 
-    def update(self, *, screen: pygame.Surface):
+    def update(self):
+        # only redraw the button image when it's been marked dirty or its
+        # hover state has changed since it was last drawn; the group it's in
+        # blits it to the screen
+        if self.dirty or self._rendered_hover is not self.hovered:
+            self._render()
+
+    def _render(self):
         if self.opts.text and self.opts.text_opts is not None:
             self.image.fill(self.opts.color)
             draw_text(self.opts.text, self.image, self.opts.text_opts, self.hovered)
-        # just blit here, we make the actual update call in the Scene
-        screen.blit(self.image, self.rect)
+        self._rendered_hover = self.hovered
 
     @property
     def hovered(self):
@@ -2,21 +2,44 @@ import pygame
 
 from gameai import config
 from gameai.const import CAT_GAME_GRAVITY, CAT_GAME_TERMINAL_VELOCITY
+from gameai.controls import KeyState
 from gameai.types import Coordinate
 
 from .collision import CollidableObject2D, Collision2D
+from .physics import PhysicsBody
 from .surface import Surface2D
 
 
 # XXX: functionality should be split into
 # a separate side scroller specific subclass
 class Character2D(CollidableObject2D):
+    """Side scroller character
+
+    Characters move themselves with `move`, or can be added to a
+    `PhysicsWorld` to be stepped in a batch. While in a world, position and
+    movement state are read from the world's arrays through `body`, so
+    rects read from a bound character are read-only copies; assign `rect`
+    to move it.
+
+    Args:
+        settings (CharacterSettings): configuration options for the character
+    """
+
+    # set while the character is simulated by a PhysicsWorld
+    body: PhysicsBody | None = None
+    # where to draw the character, if not at its rect; set by scenes that
+    # interpolate between simulation steps
+    render_pos: Coordinate | None = None
+    # area the character was last drawn to; see BatchedDirty
+    draw_rect: pygame.Rect | None = None
 
     def __init__(self, settings: config.CharacterSettings):
         if settings.image is None:
             raise pygame.error("No image configured for character")
 
         super().__init__(settings)
+        # image is whichever of these the character is currently drawn with
+        self.image_upright = self.image
         self.image_inverted = pygame.transform.flip(self.image, True, False)
 
         self._velocity = pygame.Vector2()
@@ -27,7 +50,90 @@ class Character2D(CollidableObject2D):
         self.jumping = False
         self.inverted = False
 
-    def move(self, keys: pygame.key.ScancodeWrapper):
+    @property
+    def rect(self) -> pygame.Rect:
+        return self.body.rect() if self.body is not None else self._rect
+
+    @rect.setter
+    def rect(self, rect: pygame.Rect):
+        if self.body is not None:
+            self.body.move_to(rect.topleft)
+        else:
+            self._rect = rect
+
+    @property
+    def last_pos(self) -> Coordinate:
+        return self.body.last_pos if self.body is not None else self._last_pos
+
+    @last_pos.setter
+    def last_pos(self, pos: Coordinate):
+        self._last_pos = pos
+
+    @property
+    def velocity(self) -> pygame.Vector2:
+        return self.body.velocity if self.body is not None else self._velocity
+
+    @property
+    def jumping(self) -> bool:
+        return self.body.jumping if self.body is not None else self._jumping
+
+    @jumping.setter
+    def jumping(self, jumping: bool):
+        if self.body is not None:
+            self.body.jumping = jumping
+        else:
+            self._jumping = jumping
+
+    @property
+    def inverted(self) -> bool:
+        return self.body.inverted if self.body is not None else self._inverted
+
+    @inverted.setter
+    def inverted(self, inverted: bool):
+        if self.body is not None:
+            self.body.inverted = inverted
+        else:
+            self._inverted = inverted
+
+    @property
+    def standing_on(self) -> Surface2D | None:
+        if self.body is not None:
+            return self.body.standing_on  # type: ignore
+        return self._standing_on
+
+    @standing_on.setter
+    def standing_on(self, surface: Surface2D | None):
+        if self.body is not None:
+            self.body.standing_on = surface
+        else:
+            self._standing_on = surface
+
+    def bind(self, body: PhysicsBody):
+        """Hands the character's state over to a physics world"""
+        self.body = body
+
+    def unbind(self):
+        """Takes the character's state back from its physics world"""
+        body = self.body
+        if body is None:
+            return
+        rect, box, last_pos = body.rect(), body.collision_rect(), body.last_pos
+        velocity, jumping, inverted = body.velocity, body.jumping, body.inverted
+        standing_on = body.standing_on
+        self.body = None
+        self.render_pos = None
+        self._rect = pygame.Rect(rect)
+        self.collision_box.rect.update(box)
+        self._last_pos = last_pos
+        self._velocity = velocity
+        self._jumping = jumping
+        self._inverted = inverted
+        self._standing_on = standing_on  # type: ignore
+
+    def move(self, keys: pygame.key.ScancodeWrapper | KeyState):
+        if self.body is not None:
+            raise pygame.error("Characters in a physics world move with the world")
+
         x = self._velocity.x
         y = 0
 
@@ -85,6 +191,29 @@ class Character2D(CollidableObject2D):
         if collision.bottom and isinstance(collision.bottom, Surface2D):
             self.standing_on = collision.bottom
 
-    def update(self, *, screen: pygame.Surface):
-        img = self.image_inverted if self.inverted else self.image
-        screen.blit(img, self.rect)
+    def _reset(self):
+        self.render_pos = None
+        if self.body is not None:
+            x, y = self.settings.topleft
+            self.body.move_to((int(x), int(y)))
+        else:
+            super()._reset()
+
+    def update(self, offset: Coordinate = (0, 0)):
+        """Picks the image and position to draw with
+
+        Only dirties the sprite if either has changed.
+
+        Args:
+            offset (Coordinate): translation from world to screen
+                coordinates, eg. `Camera.offset`
+        """
+        image = self.image_inverted if self.inverted else self.image_upright
+        rect = self.rect.copy()
+        if self.render_pos is not None:
+            rect.topleft = self.render_pos
+        rect.move_ip(offset)
+        if image is not self.image or rect != self.draw_rect:
+            self.image = image
+            self.draw_rect = rect
+            self.dirty = 1
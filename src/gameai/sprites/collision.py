@@ -1,12 +1,18 @@
 import abc
 import dataclasses
-from typing import List, Protocol
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Protocol, Tuple
 
 import pygame
 
 from gameai import config
 from gameai.types import Coordinate
 
+DEFAULT_CELL_SIZE = 64
+
+Cell = Tuple[int, int]
+CellRange = Tuple[int, int, int, int]
+
 
 class SupportsCollision(Protocol):
     image: pygame.Surface
@@ -16,6 +22,115 @@ class SupportsCollision(Protocol):
     last_pos: Coordinate
 
 
+class SpatialHash:
+    """Uniform grid broadphase index of collision boxes
+
+    Objects are bucketed into every grid cell their collision box overlaps.
+    Static objects only need to be inserted once; moving objects should be
+    passed to `update` after they move, which is a noop unless they have
+    crossed into a different set of cells.
+
+    Args:
+        cell_size (int): width and height of each grid cell
+        key (Callable[[Any], pygame.Rect]): returns the rect to index an
+            object by; defaults to its collision box
+    """
+
+    def __init__(
+        self,
+        cell_size: int = DEFAULT_CELL_SIZE,
+        key: Callable[[Any], pygame.Rect] = attrgetter("collision_box.rect"),
+    ):
+        self.cell_size = cell_size
+        self.key = key
+        # use dicts as insertion-ordered sets so that query results (and
+        # so collision resolution order) are deterministic
+        self._cells: Dict[Cell, Dict[SupportsCollision, None]] = {}
+        self._ranges: Dict[SupportsCollision, CellRange] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, obj: SupportsCollision) -> bool:
+        return obj in self._ranges
+
+    def __iter__(self) -> Iterator[SupportsCollision]:
+        return iter(self._ranges)
+
+    def insert(self, *objects: SupportsCollision):
+        for obj in objects:
+            if obj in self._ranges:
+                self.update(obj)
+                continue
+            cell_range = self._cell_range(self.key(obj))
+            self._ranges[obj] = cell_range
+            self._add(obj, cell_range)
+
+    def remove(self, obj: SupportsCollision):
+        cell_range = self._ranges.pop(obj, None)
+        if cell_range is not None:
+            self._discard(obj, cell_range)
+
+    def update(self, obj: SupportsCollision):
+        """Re-buckets a moving object if it has changed cells"""
+        old_range = self._ranges.get(obj)
+        new_range = self._cell_range(self.key(obj))
+        if old_range == new_range:
+            return
+        if old_range is not None:
+            self._discard(obj, old_range)
+        self._ranges[obj] = new_range
+        self._add(obj, new_range)
+
+    def clear(self):
+        self._cells.clear()
+        self._ranges.clear()
+
+    def query(self, rect: pygame.Rect) -> List[SupportsCollision]:
+        """Returns objects in cells overlapping rect
+
+        This is a broadphase check, so candidates are not guaranteed to
+        collide with rect and should still be narrowed with an exact test.
+        """
+        candidates: Dict[SupportsCollision, None] = {}
+        left, top, right, bottom = self._cell_range(rect)
+        cells = self._cells
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.update(bucket)
+        return list(candidates)
+
+    def _cell_range(self, rect: pygame.Rect) -> CellRange:
+        size = self.cell_size
+        # right and bottom are exclusive edges, so step back a pixel unless
+        # the rect is empty along that axis
+        return (
+            rect.left // size,
+            rect.top // size,
+            max(rect.left, rect.right - 1) // size,
+            max(rect.top, rect.bottom - 1) // size,
+        )
+
+    def _add(self, obj: SupportsCollision, cell_range: CellRange):
+        left, top, right, bottom = cell_range
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                self._cells.setdefault((cx, cy), {})[obj] = None
+
+    def _discard(self, obj: SupportsCollision, cell_range: CellRange):
+        left, top, right, bottom = cell_range
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                bucket.pop(obj, None)
+                if not bucket:
+                    del self._cells[(cx, cy)]
+
+
 @dataclasses.dataclass
 class Collision2D:
     # x and y represent translation coordinates for the colliding
@@ -30,11 +145,13 @@ class Collision2D:
 
     @staticmethod
     def between(
-        target: SupportsCollision, objects: List[SupportsCollision]
+        target: SupportsCollision, objects: List[SupportsCollision] | SpatialHash
     ) -> "Collision2D":
         coll = Collision2D()
         last_x, last_y = target.last_pos
         target_box = target.collision_box.rect
+        if isinstance(objects, SpatialHash):
+            objects = objects.query(Collision2D.swept_rect(target))
         collisions = target_box.collideobjectsall(
             objects, key=lambda o: o.collision_box.rect
         )
@@ -83,6 +200,12 @@ class Collision2D:
 
         return coll
 
+    @staticmethod
+    def swept_rect(target: SupportsCollision) -> pygame.Rect:
+        """Returns the area covered by target's move from its last position"""
+        box = target.collision_box.rect
+        return box.union(pygame.Rect(target.last_pos, box.size))
+
 
 class CollidableObject2D(
     config.Loadable, pygame.sprite.DirtySprite, metaclass=abc.ABCMeta
@@ -0,0 +1,314 @@
+import itertools
+from typing import Dict, List, Set, Tuple
+
+import pygame
+
+from gameai.types import ColorValue, Coordinate
+
+from .collision import DEFAULT_CELL_SIZE, SpatialHash
+
+# once the areas to redraw cover this fraction of the clip area, redrawing
+# everything is cheaper than clipping each sprite to each area
+FULL_REDRAW_RATIO = 0.5
+
+
+def _merge(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    # union overlapping rects so no pixel is cleared or drawn twice
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect = rect.union(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class BatchedDirty(pygame.sprite.LayeredDirty):
+    """LayeredDirty group that draws each frame in a single batched blit
+
+    Sprites aren't expected to draw themselves in `update`: the group works
+    out which areas changed from the sprites marked dirty, restores the
+    background under them and redraws the visible sprites in those areas,
+    each once, in layer order. Everything is submitted in a single
+    `Surface.blits` call. Frames where nothing is dirty cost a scan of the
+    dirty flags and no blits.
+
+    Sprites are drawn at their `rect`, or at `draw_rect` if they define one,
+    eg. to draw a character between simulation steps. `source_rect` isn't
+    supported.
+
+    Args:
+        sprites (DirtySprite): sprites to add
+        background (pygame.Surface | ColorValue): image or colour to restore
+            under sprites that have moved or disappeared
+    """
+
+    def __init__(
+        self,
+        *sprites: pygame.sprite.DirtySprite,
+        background: pygame.Surface | ColorValue = "black",
+        **kwargs,
+    ):
+        super().__init__(*sprites, **kwargs)
+        self.background = background
+        # draw everything on the first frame, as nothing is on screen yet
+        self._redraw_all = True
+
+    def clear(self, surface: pygame.Surface, bgd: pygame.Surface | ColorValue):
+        """Sets the background restored under sprites"""
+        self.background = bgd
+        self._redraw_all = True
+
+    def add_internal(self, sprite: pygame.sprite.DirtySprite, layer=None):
+        super().add_internal(sprite, layer)
+        # a new sprite isn't on screen yet, even if it isn't marked dirty
+        if not sprite.dirty:
+            sprite.dirty = 1
+
+    def redraw_all(self):
+        """Redraws the background and every sprite on the next draw"""
+        self._redraw_all = True
+
+    def repaint(self, *areas: pygame.Rect):
+        """Redraws the background and sprites in these areas on the next draw"""
+        self.lostsprites.extend(areas)
+
+    def draw(
+        self, surface: pygame.Surface, bgd: pygame.Surface | None = None
+    ) -> List[pygame.Rect]:
+        """Draws the sprites that changed and returns the areas it updated"""
+        if bgd is not None:
+            self.clear(surface, bgd)
+        clip = self._clip if self._clip is not None else surface.get_rect()
+        sprites = self.sprites()
+        drawn = self.spritedict
+
+        # areas to redraw: where dirty sprites were, and where they are now
+        areas = self.lostsprites
+        self.lostsprites = []
+        redraw_all = self._redraw_all
+        for sprite in sprites:
+            if not (sprite.dirty or redraw_all):
+                continue
+            old = drawn[sprite]
+            if old and not redraw_all:
+                areas.append(old)
+            if sprite.visible:
+                # copy, as the sprite may move its rect in place
+                rect = drawn[sprite] = _draw_rect(sprite).copy()
+                if not redraw_all:
+                    areas.append(rect)
+            else:
+                drawn[sprite] = self._init_rect
+            if sprite.dirty == 1:
+                sprite.dirty = 0
+
+        if not redraw_all:
+            areas = [area.clip(clip) for area in areas]
+            covered = sum(area.width * area.height for area in areas)
+            redraw_all = covered >= clip.width * clip.height * FULL_REDRAW_RATIO
+        if redraw_all:
+            areas = [clip]
+        else:
+            areas = _merge([area for area in areas if area])
+            if not areas:
+                return []
+
+        blits = self._background_blits(surface, areas)
+        if redraw_all:
+            blits.extend(
+                (sprite.image, drawn[sprite], None, sprite.blendmode)
+                for sprite in sprites
+                if sprite.visible
+            )
+        else:
+            # areas don't overlap, so drawing each area's sprites in layer
+            # order draws all of them in layer order; hidden sprites have
+            # empty rects, which never collide
+            rects = [drawn[sprite] for sprite in sprites]
+            for area in areas:
+                for i in area.collidelistall(rects):
+                    sprite, rect = sprites[i], rects[i]
+                    dest = rect.clip(area)
+                    source = dest.move(-rect.x, -rect.y)
+                    blits.append((sprite.image, dest, source, sprite.blendmode))
+
+        previous_clip = surface.get_clip()
+        surface.set_clip(clip)
+        surface.blits(blits, doreturn=False)
+        surface.set_clip(previous_clip)
+        self._redraw_all = False
+        return areas
+
+    def _background_blits(
+        self, surface: pygame.Surface, areas: List[pygame.Rect]
+    ) -> List[tuple]:
+        if isinstance(self.background, pygame.Surface):
+            return [(self.background, area, area) for area in areas]
+        # fills can't be batched with blits, but they're cheap
+        for area in areas:
+            surface.fill(self.background, area)
+        return []
+
+
+class StaticLayer(pygame.sprite.LayeredUpdates):
+    """Sprites that don't move, baked into a single background image
+
+    Use `image` as the background of a `BatchedDirty` group drawing the
+    moving sprites, so static sprites cost nothing to draw unless something
+    moves over them, and even then only a background blit.
+
+    The image shows the part of the world at `origin`; scroll it with
+    `scroll_to`. Sprites are kept in a spatial hash, so baking costs
+    depend on the sprites in view rather than on the size of the level.
+
+    `refresh` re-bakes the image when static sprites in view are added,
+    removed, moved or given a new image, and returns the areas that changed
+    so they can be repainted. With a chunk size, only the chunks under a
+    change are re-baked, which keeps edits cheap. Sprites that draw into
+    their existing image in place, or that move into view from outside it,
+    need to be passed to `invalidate`.
+
+    Args:
+        size (Tuple[int, int]): size of the baked image
+        sprites (Sprite): static sprites to bake
+        background (pygame.Surface | ColorValue): image or colour under the
+            static sprites
+        chunk_size (int | None): width and height of the areas re-baked
+            independently, or None to always re-bake the whole image
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int],
+        *sprites: pygame.sprite.Sprite,
+        background: pygame.Surface | ColorValue = "black",
+        chunk_size: int | None = None,
+        **kwargs,
+    ):
+        self.image = pygame.Surface(size)
+        self.background = background
+        self.chunk_size = chunk_size
+        self.origin: Coordinate = (0, 0)
+        self._index = SpatialHash(chunk_size or DEFAULT_CELL_SIZE, key=_rect)
+        # insertion order, to draw sprites found in the index in layer order
+        self._order: Dict[pygame.sprite.Sprite, int] = {}
+        self._added = itertools.count()
+        # image and world rect of each sprite as last baked
+        self._baked: Dict[pygame.sprite.Sprite, Tuple[pygame.Surface, pygame.Rect]] = {}
+        # world areas to re-bake
+        self._stale: List[pygame.Rect] = [self._view()]
+        super().__init__(*sprites, **kwargs)
+
+    def add_internal(self, sprite: pygame.sprite.Sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._index.insert(sprite)
+        self._order[sprite] = next(self._added)
+        # baked on the next refresh, like any other change
+        self._baked.pop(sprite, None)
+
+    def remove_internal(self, sprite: pygame.sprite.Sprite):
+        self.invalidate(sprite)
+        self._index.remove(sprite)
+        del self._order[sprite]
+        super().remove_internal(sprite)
+
+    def invalidate(self, *sprites: pygame.sprite.Sprite):
+        """Re-bakes these sprites on the next refresh"""
+        for sprite in sprites:
+            baked = self._baked.pop(sprite, None)
+            if baked is not None:
+                self._stale.append(baked[1])
+            self._index.update(sprite)
+            self._stale.append(sprite.rect.copy())
+
+    def scroll_to(self, origin: Coordinate):
+        """Shows the part of the world with its top left corner at origin"""
+        if origin != self.origin:
+            self.origin = origin
+            self._stale.append(self._view())
+
+    def refresh(self) -> List[pygame.Rect]:
+        """Re-bakes the areas under sprites that changed and returns them"""
+        stale = self._stale
+        self._stale = []
+        changed = []
+        for sprite in self._index.query(self._view()):
+            baked = self._baked.get(sprite)
+            if baked is not None:
+                image, rect = baked
+                if image is sprite.image and rect == sprite.rect:
+                    continue
+                stale.append(rect)
+            stale.append(sprite.rect)
+            changed.append(sprite)
+        if not stale:
+            return []
+
+        for sprite in changed:
+            self._index.update(sprite)
+        bounds = self.image.get_rect()
+        x, y = self.origin
+        stale = [rect.move(-x, -y).clip(bounds) for rect in stale]
+        areas = self._chunks([rect for rect in stale if rect])
+        for area in areas:
+            self._bake(area)
+        for sprite in changed:
+            self._baked[sprite] = (sprite.image, sprite.rect.copy())
+        return areas
+
+    def _view(self) -> pygame.Rect:
+        return self.image.get_rect(topleft=self.origin)
+
+    def _chunks(self, rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        if not rects:
+            return []
+        bounds = self.image.get_rect()
+        if self.chunk_size is None:
+            return [bounds]
+        size = self.chunk_size
+        keys: Set[Tuple[int, int]] = set()
+        for rect in rects:
+            for x in range(rect.left // size, (rect.right - 1) // size + 1):
+                for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    keys.add((x, y))
+        return [
+            pygame.Rect(x * size, y * size, size, size).clip(bounds)
+            for x, y in sorted(keys)
+        ]
+
+    def _bake(self, area: pygame.Rect):
+        if isinstance(self.background, pygame.Surface):
+            self.image.blit(self.background, area, area)
+        else:
+            self.image.fill(self.background, area)
+        x, y = self.origin
+        layers, order = self._spritelayers, self._order
+        sprites = sorted(
+            self._index.query(area.move(x, y)),
+            key=lambda sprite: (layers[sprite], order[sprite]),
+        )
+        blits = []
+        for sprite in sprites:
+            rect = sprite.rect.move(-x, -y)
+            if rect.colliderect(area):
+                dest = rect.clip(area)
+                blits.append((sprite.image, dest, dest.move(-rect.x, -rect.y)))
+        self.image.blits(blits, doreturn=False)
+
+
+def _rect(sprite: pygame.sprite.Sprite) -> pygame.Rect:
+    return sprite.rect
+
+
+def _draw_rect(sprite: pygame.sprite.DirtySprite) -> pygame.Rect:
+    rect = getattr(sprite, "draw_rect", None)
+    return rect if rect is not None else sprite.rect
+
+
+__all__ = [
+    "BatchedDirty",
+    "FULL_REDRAW_RATIO",
+    "StaticLayer",
+]
@@ -0,0 +1,808 @@
+import zlib
+from typing import Any, Dict, List
+
+import numpy as np
+import pygame
+
+from gameai.const import CAT_GAME_GRAVITY, CAT_GAME_TERMINAL_VELOCITY
+from gameai.controls import CONTROL_KEYS, KeyState
+from gameai.types import Coordinate
+
+from .collision import DEFAULT_CELL_SIZE, SupportsCollision
+
+DEFAULT_CAPACITY = 64
+# up to this many characters, stepping each in turn beats batching
+SMALL_WORLD = 8
+# below this many character and surface pairs, skip the grid search
+BRUTE_FORCE_PAIRS = 256
+# largest number of cells in the surface grid's lookup table
+MAX_GRID_CELLS = 1 << 20
+
+_LEFT = CONTROL_KEYS[pygame.K_LEFT]
+_RIGHT = CONTROL_KEYS[pygame.K_RIGHT]
+_SPACE = CONTROL_KEYS[pygame.K_SPACE]
+
+# column order of the collision side flags, as in CollisionBox
+_TOP, _LEFT_SIDE, _RIGHT_SIDE, _BOTTOM = range(4)
+
+
+def _sides(box: Any) -> List[bool]:
+    return [box.top, box.left, box.right, box.bottom]
+
+
+def _last_per_body(valid: np.ndarray, bodies: np.ndarray) -> np.ndarray:
+    # pairs are sorted by body, so the last valid pair of each body is the
+    # one followed by a pair for a different body (or nothing)
+    idx = np.flatnonzero(valid)
+    if not len(idx):
+        return idx
+    b = bodies[idx]
+    return idx[np.append(b[1:] != b[:-1], True)]
+
+
+def _read_only(self, *args, **kwargs):
+    raise AttributeError(
+        "Rects of characters in a physics world are copies; assign the "
+        "character's rect or use PhysicsBody.move_to to move it"
+    )
+
+
+def _plain(method):
+    def plain(self, *args, **kwargs) -> pygame.Rect:
+        return pygame.Rect(method(self, *args, **kwargs))
+
+    return plain
+
+
+class BodyRect(pygame.Rect):
+    """Rect of a body in a PhysicsWorld, which can't be changed in place
+
+    It's a copy of the world's state, so changing it would silently have no
+    effect; anything that would change it raises AttributeError instead.
+    Rects made from it, eg. with `copy` or `move`, are ordinary rects.
+    """
+
+    __slots__ = ()
+
+    __setattr__ = __setitem__ = _read_only
+    clamp_ip = inflate_ip = move_ip = normalize = _read_only
+    scale_by_ip = union_ip = unionall_ip = update = _read_only
+
+    clamp = _plain(pygame.Rect.clamp)
+    clip = _plain(pygame.Rect.clip)
+    copy = _plain(pygame.Rect.copy)
+    fit = _plain(pygame.Rect.fit)
+    inflate = _plain(pygame.Rect.inflate)
+    move = _plain(pygame.Rect.move)
+    scale_by = _plain(pygame.Rect.scale_by)
+    union = _plain(pygame.Rect.union)
+    unionall = _plain(pygame.Rect.unionall)
+
+
+class BodyControls(KeyState):
+    """KeyState stored in a physics world, so writes need no copying each tick"""
+
+    __slots__ = ("_body",)
+
+    def __init__(self, body: "PhysicsBody"):
+        self._body = body
+
+    @property
+    def mask(self) -> int:  # type: ignore[override]
+        return int(self._body.world.controls[self._body.index])
+
+    @mask.setter
+    def mask(self, mask: int):
+        self._body.world.controls[self._body.index] = mask
+
+
+class PhysicsBody:
+    """Handle to a character's state in a PhysicsWorld
+
+    Values are read from the world's arrays when accessed, so rects returned
+    here are read-only copies; use `move_to` to reposition the body.
+    """
+
+    __slots__ = ("world", "index", "controls")
+
+    def __init__(self, world: "PhysicsWorld", index: int):
+        self.world = world
+        self.index = index
+        self.controls = BodyControls(self)
+
+    def rect(self) -> BodyRect:
+        w, i = self.world, self.index
+        x, y = (w.boxes[i, :2] + w.offsets[i]).tolist()
+        return BodyRect((x, y), w.sizes[i].tolist())
+
+    def collision_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.world.boxes[self.index].tolist())
+
+    def move_to(self, topleft: Coordinate):
+        """Moves the body so its image rect's top left corner is at topleft"""
+        w, i = self.world, self.index
+        w.boxes[i, :2] = np.asarray(topleft, dtype=np.int64) - w.offsets[i]
+        w.last[i] = w.boxes[i, :2]
+        # teleports aren't interpolated
+        w.previous[i] = w.boxes[i, :2]
+
+    @property
+    def last_pos(self) -> Coordinate:
+        x, y = self.world.last[self.index].tolist()
+        return (x, y)
+
+    @property
+    def velocity(self) -> pygame.Vector2:
+        return pygame.Vector2(self.world.velocity[self.index].tolist())
+
+    @velocity.setter
+    def velocity(self, velocity: Coordinate):
+        self.world.velocity[self.index] = velocity
+
+    @property
+    def jumping(self) -> bool:
+        return bool(self.world.jumping[self.index])
+
+    @jumping.setter
+    def jumping(self, jumping: bool):
+        self.world.jumping[self.index] = jumping
+
+    @property
+    def inverted(self) -> bool:
+        return bool(self.world.inverted[self.index])
+
+    @inverted.setter
+    def inverted(self, inverted: bool):
+        self.world.inverted[self.index] = inverted
+
+    @property
+    def standing_on(self) -> SupportsCollision | None:
+        surface = int(self.world.standing[self.index])
+        return self.world.surfaces[surface] if surface >= 0 else None
+
+    @standing_on.setter
+    def standing_on(self, surface: SupportsCollision | None):
+        self.world.standing[self.index] = self.world.surface_index(surface)
+
+
+class PhysicsWorld:
+    """Batched side scroller physics for many characters
+
+    Keeps the state of every character in contiguous NumPy arrays and steps
+    them all at once with vectorized operations, following the same rules
+    as `Character2D.move` and `Character2D.handle_collision`. Characters are
+    driven by the key state in `controls`, which each body's `controls`
+    writes to directly.
+
+    Surfaces are static: they're bucketed into a uniform grid, and each
+    step pairs characters with the surfaces in the cells their movement
+    swept through. Call `update_surface` after changing a surface. When a
+    character hits several surfaces on the same axis in one step, the
+    surface added last wins.
+
+    Batching has a fixed overhead of a few hundred microseconds per step,
+    so worlds of up to `SMALL_WORLD` characters are stepped one character
+    at a time instead, with the same results.
+
+    Args:
+        capacity (int): number of characters to allocate space for; arrays
+            grow as needed
+        cell_size (int): width and height of the surface grid cells
+    """
+
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, cell_size: int = DEFAULT_CELL_SIZE
+    ):
+        self.cell_size = cell_size
+        self.characters: List[Any] = []
+        self.surfaces: List[SupportsCollision] = []
+        self._surface_index: Dict[SupportsCollision, int] = {}
+        self._allocate(capacity)
+        self._allocate_surfaces()
+        # surface grid lookup table, rebuilt when surfaces change
+        self._grid_cell_size = cell_size
+        self._grid_origin = (0, 0)
+        self._grid_shape = (0, 0)
+        self._grid_start = np.zeros(1, np.int64)
+        self._grid_surfaces = np.empty(0, np.int64)
+        self._grid_dirty = False
+
+    def __len__(self) -> int:
+        return len(self.characters)
+
+    def __contains__(self, character: Any) -> bool:
+        return (
+            getattr(character, "body", None) is not None
+            and character.body.world is self
+        )
+
+    def add(self, character: Any) -> PhysicsBody:
+        """Moves a character's state into the world and binds it to a body
+
+        Args:
+            character (Character2D): character to simulate
+        """
+        i = len(self.characters)
+        if i == len(self.boxes):
+            self._allocate(2 * i)
+
+        box = character.collision_box.rect
+        rect = character.rect
+        self.boxes[i] = (box.x, box.y, box.width, box.height)
+        self.offsets[i] = (rect.x - box.x, rect.y - box.y)
+        self.sizes[i] = rect.size
+        self.last[i] = character.last_pos
+        self.previous[i] = (box.x, box.y)
+        self.velocity[i] = character.velocity
+        self.speed[i] = character.speed
+        self.jump_speed[i] = character.jump_speed
+        self.step_size[i] = character.speed / character.acceleration_frames
+        self.sides[i] = _sides(character.collision_box)
+        self.jumping[i] = character.jumping
+        self.inverted[i] = character.inverted
+        self.standing[i] = self.surface_index(character.standing_on)
+        self.controls[i] = 0
+
+        self.characters.append(character)
+        body = PhysicsBody(self, i)
+        character.bind(body)
+        return body
+
+    def remove(self, character: Any):
+        """Writes a character's state back to it and removes it from the world"""
+        body: PhysicsBody = character.body
+        i = body.index
+        character.unbind()
+
+        # swap the last character into the freed slot to keep arrays packed
+        last = len(self.characters) - 1
+        moved = self.characters.pop()
+        if i != last:
+            self.characters[i] = moved
+            for array in self._arrays():
+                array[i] = array[last]
+            moved.body.index = i
+
+    def add_surface(self, surface: SupportsCollision):
+        if surface in self._surface_index:
+            return
+        i = len(self.surfaces)
+        if i == len(self.surface_boxes):
+            self._allocate_surfaces(2 * i)
+        self.surfaces.append(surface)
+        self._surface_index[surface] = i
+        self._write_surface(i, surface)
+        self._grid_dirty = True
+
+    def update_surface(self, surface: SupportsCollision):
+        """Refreshes the position, visibility and friction of a surface"""
+        self._write_surface(self._surface_index[surface], surface)
+        self._grid_dirty = True
+
+    def remove_surface(self, surface: SupportsCollision):
+        i = self._surface_index.pop(surface)
+        last = len(self.surfaces) - 1
+        moved = self.surfaces.pop()
+        standing = self.standing[: len(self.characters)]
+        standing[standing == i] = -1
+        if i != last:
+            self.surfaces[i] = moved
+            self._surface_index[moved] = i
+            for array in self._surface_arrays():
+                array[i] = array[last]
+            standing[standing == last] = i
+        self._grid_dirty = True
+
+    def surface_index(self, surface: SupportsCollision | None) -> int:
+        if surface is None:
+            return -1
+        return self._surface_index.get(surface, -1)
+
+    def checksum(self) -> int:
+        """Returns a CRC32 of every character's position and movement state"""
+        n = len(self.characters)
+        crc = 0
+        for array in (
+            self.boxes,
+            self.velocity,
+            self.jumping,
+            self.inverted,
+            self.standing,
+        ):
+            crc = zlib.crc32(array[:n].tobytes(), crc)
+        return crc
+
+    def interpolate(
+        self, alpha: float, indices: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Returns image rect positions between the last two steps
+
+        Args:
+            alpha (float): fraction of the way from the position before the
+                last step (0) to the current position (1)
+            indices (np.ndarray | None): characters to interpolate, eg. from
+                `query`; all of them by default
+
+        Returns:
+            np.ndarray: (x, y) float positions, one row per character
+        """
+        n = len(self.characters)
+        if indices is None:
+            indices = slice(0, n)
+        previous = self.previous[indices]
+        current = self.boxes[indices, :2]
+        return previous + (current - previous) * alpha + self.offsets[indices]
+
+    def query(self, rect: pygame.Rect) -> np.ndarray:
+        """Returns the indices of characters whose image rects overlap rect"""
+        n = len(self.characters)
+        x, y = (self.boxes[:n, :2] + self.offsets[:n]).T
+        w, h = self.sizes[:n].T
+        return np.flatnonzero(
+            (x < rect.right)
+            & (x + w > rect.left)
+            & (y < rect.bottom)
+            & (y + h > rect.top)
+        )
+
+    def step(self):
+        """Moves every character one tick and resolves surface collisions"""
+        n = len(self.characters)
+        if n == 0:
+            return
+        self.previous[:n] = self.boxes[:n, :2]
+        if n <= SMALL_WORLD:
+            for i in range(n):
+                self._step_one(i)
+            return
+
+        controls = self.controls[:n]
+        left = (controls & _LEFT) != 0
+        right = (controls & _RIGHT) != 0
+        space = (controls & _SPACE) != 0
+
+        velocity = self.velocity[:n]
+        jumping = self.jumping[:n]
+        standing = self.standing[:n]
+        inverted = self.inverted[:n]
+
+        jumping |= standing < 0
+        # limit maneuvering in midair
+        step = np.where(jumping, self.step_size[:n] / 6, self.step_size[:n])
+        x = velocity[:, 0] + np.where(right, step, 0) - np.where(left, step, 0)
+
+        jump = space & ~jumping
+        y = np.where(
+            jump,
+            -self.jump_speed[:n],
+            np.where(jumping, velocity[:, 1] + CAT_GAME_GRAVITY, 0),
+        )
+        jumping |= jump
+        standing[jump] = -1
+
+        moving = (x != 0) & ~jumping
+        inverted[moving] = x[moving] < 0
+        sliding = np.flatnonzero(moving & (standing >= 0))
+        if len(sliding):
+            # use minimum here so if x < friction we drop x-speed to 0
+            friction = np.minimum(
+                self.surface_friction[standing[sliding]], np.abs(x[sliding])
+            )
+            x[sliding] -= np.where(inverted[sliding], -friction, friction)
+
+        speed = self.speed[:n]
+        velocity[:, 0] = np.clip(x, -speed, speed)
+        velocity[:, 1] = np.minimum(y, CAT_GAME_TERMINAL_VELOCITY)
+
+        boxes = self.boxes[:n]
+        last = self.last[:n]
+        last[:] = boxes[:, :2]
+        # rects truncate fractional moves towards zero
+        boxes[:, :2] += np.trunc(velocity).astype(np.int64)
+
+        self._collide(n)
+
+    def _step_one(self, i: int):
+        """Steps a single character with scalar maths, matching `step`"""
+        controls = int(self.controls[i])
+        vx, vy = self.velocity[i].tolist()
+        standing = int(self.standing[i])
+        jumping = bool(self.jumping[i]) or standing < 0
+        inverted = bool(self.inverted[i])
+
+        step = float(self.step_size[i])
+        if jumping:
+            step /= 6  # limit maneuvering in midair
+        x = (
+            vx
+            + (step if controls & _RIGHT else 0.0)
+            - (step if controls & _LEFT else 0.0)
+        )
+
+        jump = bool(controls & _SPACE) and not jumping
+        if jump:
+            y = -float(self.jump_speed[i])
+            jumping = True
+            standing = -1
+        else:
+            y = vy + CAT_GAME_GRAVITY if jumping else 0.0
+
+        if x != 0 and not jumping:
+            inverted = x < 0
+            if standing >= 0:
+                friction = min(float(self.surface_friction[standing]), abs(x))
+                x -= -friction if inverted else friction
+
+        speed = float(self.speed[i])
+        vx = min(max(x, -speed), speed)
+        vy = min(y, CAT_GAME_TERMINAL_VELOCITY)
+
+        last_x, last_y, w, h = self.boxes[i].tolist()
+        # rects truncate fractional moves towards zero
+        left, top = last_x + int(vx), last_y + int(vy)
+        right, bottom = left + w, top + h
+        t_top, t_left, t_right, t_bottom = self.sides[i].tolist()
+
+        dx = dy = 0
+        for s in self._surfaces_near(i, last_x, last_y, left, top, w, h):
+            s_left, s_top, s_w, s_h = self.surface_boxes[s].tolist()
+            s_right, s_bottom = s_left + s_w, s_top + s_h
+            if not (
+                w > 0
+                and h > 0
+                and s_w > 0
+                and s_h > 0
+                and left < s_right
+                and right > s_left
+                and top < s_bottom
+                and bottom > s_top
+            ):
+                continue
+            s_top_side, s_left_side, s_right_side, s_bottom_side = self.surface_sides[
+                s
+            ].tolist()
+            # the same side and direction checks as `_collide`, where later
+            # surfaces override earlier ones, and bottom and right override
+            # top and left
+            if (
+                t_right
+                and s_left_side
+                and right >= s_left
+                and left < s_left
+                and last_x + w <= s_left
+            ):
+                dx = s_left - right
+            elif (
+                t_left
+                and s_right_side
+                and left <= s_right
+                and right > s_right
+                and last_x >= s_right
+            ):
+                dx = s_right - left
+            if (
+                t_bottom
+                and s_top_side
+                and bottom >= s_top
+                and top < s_top
+                and last_y + h <= s_top
+            ):
+                dy = s_top - bottom
+                standing = s
+            elif (
+                t_top
+                and s_bottom_side
+                and top <= s_bottom
+                and bottom > s_bottom
+                and last_y >= s_bottom
+            ):
+                dy = s_bottom - top
+
+        # handle_collision moves by the correction, so the last position
+        # becomes the uncorrected position
+        self.last[i] = (left, top)
+        self.boxes[i, :2] = (left + dx, top + dy)
+        if dx:
+            vx = 0.0
+        if dy:
+            vy = 0.0
+            if dy < 0:
+                jumping = False
+        self.velocity[i] = (vx, vy)
+        self.jumping[i] = jumping
+        self.inverted[i] = inverted
+        self.standing[i] = standing
+
+    def _surfaces_near(
+        self, i: int, last_x: int, last_y: int, x: int, y: int, w: int, h: int
+    ) -> List[int]:
+        """Returns the sorted surfaces one character's move may collide with
+
+        Unlike `_candidate_pairs`, this always searches the grid, as testing
+        every surface in turn is slow without batching.
+        """
+        if not self.surfaces:
+            return []
+        if self._grid_dirty:
+            self._build_grid()
+        if not len(self._grid_surfaces):
+            return []
+
+        size = self._grid_cell_size
+        (origin_x, origin_y), (width, height) = self._grid_origin, self._grid_shape
+        x0, y0 = min(x, last_x), min(y, last_y)
+        x1, y1 = max(x, last_x) + w, max(y, last_y) + h
+        cx0, cy0 = x0 // size - origin_x, y0 // size - origin_y
+        cx1 = max(x0, x1 - 1) // size - origin_x
+        cy1 = max(y0, y1 - 1) // size - origin_y
+        start = self._grid_start
+        near = set()
+        for cx in range(max(cx0, 0), min(cx1, width - 1) + 1):
+            for cy in range(max(cy0, 0), min(cy1, height - 1) + 1):
+                cell = cx * height + cy
+                near.update(self._grid_surfaces[start[cell] : start[cell + 1]].tolist())
+        return sorted(near)
+
+    def _collide(self, n: int):
+        boxes = self.boxes[:n]
+        last = self.last[:n]
+        correction = np.zeros((n, 2), np.int64)
+
+        bodies, surfaces = self._candidate_pairs(n)
+        if len(bodies):
+            t = boxes[bodies]
+            s = self.surface_boxes[surfaces]
+            t_sides = self.sides[bodies]
+            s_sides = self.surface_sides[surfaces]
+            t_left, t_top, t_w, t_h = t.T
+            t_right, t_bottom = t_left + t_w, t_top + t_h
+            s_left, s_top, s_w, s_h = s.T
+            s_right, s_bottom = s_left + s_w, s_top + s_h
+            last_x, last_y = last[bodies].T
+
+            overlap = (
+                (t_w > 0)
+                & (t_h > 0)
+                & (s_w > 0)
+                & (s_h > 0)
+                & (t_left < s_right)
+                & (t_right > s_left)
+                & (t_top < s_bottom)
+                & (t_bottom > s_top)
+            )
+            # check that both objects collide in the direction of collision
+            # AND the object is passing through the collision box
+            # AND the direction of movement is towards the collision point
+            top = (
+                overlap
+                & t_sides[:, _TOP]
+                & s_sides[:, _BOTTOM]
+                & (t_top <= s_bottom)
+                & (t_bottom > s_bottom)
+                & (last_y >= s_bottom)
+            )
+            left = (
+                overlap
+                & t_sides[:, _LEFT_SIDE]
+                & s_sides[:, _RIGHT_SIDE]
+                & (t_left <= s_right)
+                & (t_right > s_right)
+                & (last_x >= s_right)
+            )
+            right = (
+                overlap
+                & t_sides[:, _RIGHT_SIDE]
+                & s_sides[:, _LEFT_SIDE]
+                & (t_right >= s_left)
+                & (t_left < s_left)
+                & (last_x + t_w <= s_left)
+            )
+            bottom = (
+                overlap
+                & t_sides[:, _BOTTOM]
+                & s_sides[:, _TOP]
+                & (t_bottom >= s_top)
+                & (t_top < s_top)
+                & (last_y + t_h <= s_top)
+            )
+
+            # as in Collision2D.between, later surfaces override earlier
+            # ones, and bottom and right override top and left
+            dx = np.where(right, s_left - t_right, s_right - t_left)
+            dy = np.where(bottom, s_top - t_bottom, s_bottom - t_top)
+            pick = _last_per_body(left | right, bodies)
+            correction[bodies[pick], 0] = dx[pick]
+            pick = _last_per_body(top | bottom, bodies)
+            correction[bodies[pick], 1] = dy[pick]
+            pick = _last_per_body(bottom, bodies)
+            self.standing[bodies[pick]] = surfaces[pick]
+
+        # handle_collision moves by the correction, so the last position
+        # becomes the uncorrected position
+        last[:] = boxes[:, :2]
+        boxes[:, :2] += correction
+        velocity = self.velocity[:n]
+        velocity[correction[:, 0] != 0, 0] = 0
+        velocity[correction[:, 1] != 0, 1] = 0
+        self.jumping[:n][correction[:, 1] < 0] = False
+
+    def _candidate_pairs(self, n: int):
+        """Returns sorted, unique (body, surface) pairs that may collide"""
+        empty = np.empty(0, np.int64)
+        if not self.surfaces:
+            return empty, empty
+        if self._grid_dirty:
+            self._build_grid()
+        if not len(self._grid_surfaces):
+            return empty, empty
+
+        m = len(self.surfaces)
+        if n * m <= BRUTE_FORCE_PAIRS:
+            # small worlds are cheaper to test exhaustively than to search
+            visible = np.flatnonzero(self.surface_visible[:m])
+            return np.repeat(np.arange(n), len(visible)), np.tile(visible, n)
+
+        # cells covered by each character's move from its last position
+        boxes = self.boxes[:n]
+        last = self.last[:n]
+        size = self._grid_cell_size
+        (origin_x, origin_y), (width, height) = self._grid_origin, self._grid_shape
+        x0 = np.minimum(boxes[:, 0], last[:, 0])
+        y0 = np.minimum(boxes[:, 1], last[:, 1])
+        x1 = np.maximum(boxes[:, 0], last[:, 0]) + boxes[:, 2]
+        y1 = np.maximum(boxes[:, 1], last[:, 1]) + boxes[:, 3]
+        cx0 = x0 // size - origin_x
+        cy0 = y0 // size - origin_y
+        span_x = np.maximum(x0, x1 - 1) // size - origin_x - cx0
+        span_y = np.maximum(y0, y1 - 1) // size - origin_y - cy0
+
+        all_bodies, all_surfaces = [], []
+        for dx in range(int(span_x.max()) + 1):
+            for dy in range(int(span_y.max()) + 1):
+                cx, cy = cx0 + dx, cy0 + dy
+                bodies = np.flatnonzero(
+                    (span_x >= dx)
+                    & (span_y >= dy)
+                    & (cx >= 0)
+                    & (cx < width)
+                    & (cy >= 0)
+                    & (cy < height)
+                )
+                cells = cx[bodies] * height + cy[bodies]
+                start = self._grid_start[cells]
+                counts = self._grid_start[cells + 1] - start
+                total = int(counts.sum())
+                if not total:
+                    continue
+                # expand each body's [start, start + count) run of grid entries
+                ends = np.cumsum(counts)
+                runs = np.arange(total) - np.repeat(ends - counts, counts)
+                all_bodies.append(np.repeat(bodies, counts))
+                all_surfaces.append(
+                    self._grid_surfaces[np.repeat(start, counts) + runs]
+                )
+
+        if not all_bodies:
+            return empty, empty
+        pairs = np.unique(np.concatenate(all_bodies) * m + np.concatenate(all_surfaces))
+        return pairs // m, pairs % m
+
+    def _build_grid(self):
+        m = len(self.surfaces)
+        visible = np.flatnonzero(self.surface_visible[:m])
+        self._grid_surfaces = np.empty(0, np.int64)
+        self._grid_dirty = False
+        if not len(visible):
+            return
+
+        left, top, w, h = self.surface_boxes[visible].T
+        right = np.maximum(left, left + w - 1)
+        bottom = np.maximum(top, top + h - 1)
+        # the grid is a dense table over the surfaces' bounds; coarsen the
+        # cells if the level is too large for that table to stay small
+        size = self.cell_size
+        while True:
+            origin = (int(left.min() // size), int(top.min() // size))
+            shape = (
+                int(right.max() // size) - origin[0] + 1,
+                int(bottom.max() // size) - origin[1] + 1,
+            )
+            if shape[0] * shape[1] <= MAX_GRID_CELLS:
+                break
+            size *= 2
+
+        cx0, cy0 = left // size - origin[0], top // size - origin[1]
+        cx1, cy1 = right // size - origin[0], bottom // size - origin[1]
+        cells, surfaces = [], []
+        for i, x0, y0, x1, y1 in zip(visible, cx0, cy0, cx1, cy1, strict=True):
+            cx, cy = np.meshgrid(np.arange(x0, x1 + 1), np.arange(y0, y1 + 1))
+            cells.append((cx * shape[1] + cy).ravel())
+            surfaces.append(np.full(cx.size, i, np.int64))
+
+        cells_ = np.concatenate(cells)
+        # sort entries by cell, keeping surfaces in index order within a cell
+        order = np.argsort(cells_, kind="stable")
+        counts = np.bincount(cells_, minlength=shape[0] * shape[1])
+        self._grid_start = np.concatenate(([0], np.cumsum(counts)))
+        self._grid_surfaces = np.concatenate(surfaces)[order]
+        self._grid_cell_size = size
+        self._grid_origin = origin
+        self._grid_shape = shape
+
+    def _write_surface(self, i: int, surface: SupportsCollision):
+        box = surface.collision_box.rect
+        self.surface_boxes[i] = (box.x, box.y, box.width, box.height)
+        self.surface_sides[i] = _sides(surface.collision_box)
+        self.surface_friction[i] = getattr(surface, "friction_coefficient", 0)
+        self.surface_visible[i] = getattr(surface, "visible", True)
+
+    def _arrays(self) -> List[np.ndarray]:
+        return [
+            self.boxes,
+            self.offsets,
+            self.sizes,
+            self.last,
+            self.previous,
+            self.velocity,
+            self.speed,
+            self.jump_speed,
+            self.step_size,
+            self.sides,
+            self.jumping,
+            self.inverted,
+            self.standing,
+            self.controls,
+        ]
+
+    def _surface_arrays(self) -> List[np.ndarray]:
+        return [
+            self.surface_boxes,
+            self.surface_sides,
+            self.surface_friction,
+            self.surface_visible,
+        ]
+
+    def _allocate(self, capacity: int):
+        old = self._arrays() if hasattr(self, "boxes") else None
+        # collision box as (x, y, width, height)
+        self.boxes = np.zeros((capacity, 4), np.int64)
+        # image rect position relative to the collision box, and image size
+        self.offsets = np.zeros((capacity, 2), np.int64)
+        self.sizes = np.zeros((capacity, 2), np.int64)
+        self.last = np.zeros((capacity, 2), np.int64)
+        # collision box position before the last step, for interpolation
+        self.previous = np.zeros((capacity, 2), np.int64)
+        self.velocity = np.zeros((capacity, 2), np.float64)
+        self.speed = np.zeros(capacity, np.float64)
+        self.jump_speed = np.zeros(capacity, np.float64)
+        self.step_size = np.zeros(capacity, np.float64)
+        # collision box sides as (top, left, right, bottom)
+        self.sides = np.zeros((capacity, 4), bool)
+        self.jumping = np.zeros(capacity, bool)
+        self.inverted = np.zeros(capacity, bool)
+        # index of the surface each character is standing on, or -1
+        self.standing = np.full(capacity, -1, np.int64)
+        self.controls = np.zeros(capacity, np.uint8)
+        if old is not None:
+            n = len(self.characters)
+            for new_array, old_array in zip(self._arrays(), old, strict=True):
+                new_array[:n] = old_array[:n]
+
+    def _allocate_surfaces(self, capacity: int = DEFAULT_CAPACITY):
+        old = self._surface_arrays() if hasattr(self, "surface_boxes") else None
+        self.surface_boxes = np.zeros((capacity, 4), np.int64)
+        self.surface_sides = np.zeros((capacity, 4), bool)
+        self.surface_friction = np.zeros(capacity, np.float64)
+        self.surface_visible = np.zeros(capacity, bool)
+        if old is not None:
+            m = len(self.surfaces)
+            for new_array, old_array in zip(self._surface_arrays(), old, strict=True):
+                new_array[:m] = old_array[:m]
+
+
+__all__ = [
+    "BodyControls",
+    "BodyRect",
+    "PhysicsBody",
+    "PhysicsWorld",
+]
@@ -1,5 +1,3 @@
-import pygame
-
 from gameai import config
 
 from .collision import CollidableObject2D
@@ -15,6 +13,3 @@ class Surface2D(CollidableObject2D):
     def __init__(self, settings: config.SurfaceSettings):
         super().__init__(settings)
         self.friction_coefficient = settings.friction_coefficient
-
-    def update(self, *, screen: pygame.Surface):
-        screen.blit(self.image, self.rect)
@@ -0,0 +1,433 @@
+import dataclasses
+import pathlib
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pygame
+
+from . import config
+
+# a tilemap file is a header followed by a palette, the tile ids, and the
+# collision boxes of each chunk; each section starts 8-byte aligned so the
+# arrays can be mapped straight from the file
+MAGIC = b"GAIT"
+FORMAT_VERSION = 1
+# magic, format version, tile size in pixels, chunk size in tiles, width and
+# height in tiles, number of collision boxes, friction of every box
+_HEADER = struct.Struct("<4sHHHxxIIIf4x")
+# RGBA colour of each tile id; id 0 is empty
+PALETTE_SIZE = 256
+
+DEFAULT_TILE_SIZE = 16
+DEFAULT_CHUNK_TILES = 32
+# chunks beyond the required area to load in the background, and beyond
+# which loaded chunks are evicted
+DEFAULT_LOAD_RADIUS = 1
+DEFAULT_EVICT_RADIUS = 2
+
+ChunkKey = Tuple[int, int]
+
+
+class TileMapFormatError(ValueError):
+    """Raised when a file isn't a valid tilemap"""
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def default_palette() -> np.ndarray:
+    """Returns a palette of empty tile 0, then black, then shades of grey"""
+    palette = np.zeros((PALETTE_SIZE, 4), np.uint8)
+    shades = np.linspace(0, 224, PALETTE_SIZE - 1).astype(np.uint8)
+    palette[1:, :3] = shades[:, None]
+    palette[1:, 3] = 255
+    return palette
+
+
+def _collision_boxes(
+    tiles: np.ndarray, chunk_tiles: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the collision boxes of solid tiles, sorted by chunk
+
+    Boxes cover horizontal runs of solid tiles, merged with identical runs
+    in the rows below, and never cross a chunk boundary.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (x, y, width, height) boxes in tiles,
+            and the chunk index of each box
+    """
+    height, width = tiles.shape
+    c = chunk_tiles
+    solid = np.zeros((height, width + 2), np.int8)
+    solid[:, 1:-1] = tiles != 0
+    # edges alternate between the start and end of a run in each row
+    rows, cols = np.nonzero(np.diff(solid, axis=1))
+    y, starts, ends = rows[::2], cols[::2], cols[1::2]
+
+    # split runs at chunk boundaries
+    first, last = starts // c, (ends - 1) // c
+    counts = last - first + 1
+    total = int(counts.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = np.repeat(first, counts) + offsets
+    y = np.repeat(y, counts)
+    x0 = np.maximum(np.repeat(starts, counts), cx * c)
+    x1 = np.minimum(np.repeat(ends, counts), (cx + 1) * c)
+    cy = y // c
+
+    # merge each run into the one above it if it has the same span
+    order = np.lexsort((y, x1, x0, cx, cy))
+    y, x0, x1, cx, cy = y[order], x0[order], x1[order], cx[order], cy[order]
+    same = np.zeros(len(y), bool)
+    same[1:] = (
+        (cy[1:] == cy[:-1])
+        & (cx[1:] == cx[:-1])
+        & (x0[1:] == x0[:-1])
+        & (x1[1:] == x1[:-1])
+        & (y[1:] == y[:-1] + 1)
+    )
+    heads = np.flatnonzero(~same)
+    heights = np.diff(np.append(heads, len(y)))
+    boxes = np.stack(
+        [x0[heads], y[heads], x1[heads] - x0[heads], heights], axis=1
+    ).astype(np.int32)
+    chunks_x = -(-width // c)
+    return boxes, cy[heads] * chunks_x + cx[heads]
+
+
+def save(
+    path: str | pathlib.Path,
+    tiles: np.ndarray,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    chunk_tiles: int = DEFAULT_CHUNK_TILES,
+    palette: np.ndarray | None = None,
+    friction: float = 0,
+):
+    """Writes a tilemap file
+
+    Every non-zero tile is solid. Collision boxes are worked out here, once,
+    so loading a chunk only reads them.
+
+    Args:
+        path (str | Path): file to write
+        tiles (np.ndarray): (height, width) uint8 tile ids
+        tile_size (int): width and height of a tile in pixels
+        chunk_tiles (int): width and height of a chunk in tiles
+        palette (np.ndarray | None): (256, 4) RGBA colour of each tile id;
+            `default_palette` if None
+        friction (float): friction coefficient of every collision box
+    """
+    tiles = np.ascontiguousarray(tiles, np.uint8)
+    height, width = tiles.shape
+    if palette is None:
+        palette = default_palette()
+    palette = np.ascontiguousarray(palette, np.uint8).reshape(PALETTE_SIZE, 4)
+    boxes, chunks = _collision_boxes(tiles, chunk_tiles)
+    chunk_count = -(-width // chunk_tiles) * -(-height // chunk_tiles)
+    starts = np.zeros(chunk_count + 1, np.int64)
+    starts[1:] = np.cumsum(np.bincount(chunks, minlength=chunk_count))
+
+    with open(path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                tile_size,
+                chunk_tiles,
+                width,
+                height,
+                len(boxes),
+                friction,
+            )
+        )
+        for array in (palette, tiles, starts, boxes):
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(array.tobytes())
+
+
+class TileCollider:
+    """Collision box of a run of solid tiles
+
+    Implements SupportsCollision without an image; tiles are drawn by their
+    chunk.
+    """
+
+    visible = True
+
+    def __init__(self, rect: pygame.Rect, friction: float):
+        self.rect = rect
+        self.collision_box = config.CollisionBox(True, True, True, True, rect.copy())
+        self.last_pos = rect.topleft
+        self.friction_coefficient = friction
+
+
+class Chunk(pygame.sprite.Sprite):
+    """Square block of tiles, drawn as one image
+
+    Args:
+        key (ChunkKey): chunk column and row
+        rect (pygame.Rect): area of the world the chunk covers
+        image (pygame.Surface | None): the chunk's tiles, or None if all of
+            them are empty
+        colliders (List[TileCollider]): collision boxes of the solid tiles
+    """
+
+    def __init__(
+        self,
+        key: ChunkKey,
+        rect: pygame.Rect,
+        image: pygame.Surface | None,
+        colliders: List[TileCollider],
+    ):
+        super().__init__()
+        self.key = key
+        self.rect = rect
+        self.image = image
+        self.colliders = colliders
+
+    @property
+    def resident_bytes(self) -> int:
+        if self.image is None:
+            return 0
+        return self.image.get_pitch() * self.image.get_height()
+
+
+class TileMap:
+    """Tilemap file mapped into memory
+
+    Opening a map only reads its header; tiles and collision boxes are read
+    from the file as chunks are built, so opening takes the same time
+    however large the level is.
+
+    Args:
+        path (str | Path): tilemap file to map
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        data = np.memmap(self.path, np.uint8, mode="r")
+        if len(data) < _HEADER.size:
+            raise TileMapFormatError(f"{path} is truncated")
+        magic, version, *fields = _HEADER.unpack(data[: _HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise TileMapFormatError(f"{path} is not a tilemap")
+        if version != FORMAT_VERSION:
+            raise TileMapFormatError(f"Unsupported tilemap version {version}")
+        tile_size, chunk_tiles, width, height, box_count, friction = fields
+        self.tile_size: int = tile_size
+        self.chunk_tiles: int = chunk_tiles
+        self.width: int = width
+        self.height: int = height
+        self.friction: float = friction
+        self.chunks_x = -(-width // chunk_tiles)
+        self.chunks_y = -(-height // chunk_tiles)
+
+        offset = _align(_HEADER.size)
+        sections = []
+        for count, dtype in (
+            (PALETTE_SIZE * 4, np.uint8),
+            (width * height, np.uint8),
+            (self.chunks_x * self.chunks_y + 1, np.int64),
+            (box_count * 4, np.int32),
+        ):
+            size = count * np.dtype(dtype).itemsize
+            if offset + size > len(data):
+                raise TileMapFormatError(f"{path} is truncated")
+            sections.append(data[offset : offset + size].view(dtype))
+            offset = _align(offset + size)
+        palette, tiles, self.chunk_starts, boxes = sections
+        self.palette = np.array(palette).reshape(PALETTE_SIZE, 4)
+        self.tiles = tiles.reshape(height, width)
+        self.boxes = boxes.reshape(box_count, 4)
+
+    @property
+    def chunk_pixels(self) -> int:
+        """Width and height of a chunk in pixels"""
+        return self.chunk_tiles * self.tile_size
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """Area of the world the map covers, in pixels"""
+        return pygame.Rect(
+            0, 0, self.width * self.tile_size, self.height * self.tile_size
+        )
+
+    def chunk_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        """Returns the first and last chunk columns and rows overlapping rect"""
+        size = self.chunk_pixels
+        return (
+            max(0, rect.left // size),
+            max(0, rect.top // size),
+            min(self.chunks_x - 1, max(rect.left, rect.right - 1) // size),
+            min(self.chunks_y - 1, max(rect.top, rect.bottom - 1) // size),
+        )
+
+    def build_chunk(self, key: ChunkKey) -> Chunk:
+        """Reads a chunk's tiles and collision boxes and renders its image"""
+        cx, cy = key
+        c, t = self.chunk_tiles, self.tile_size
+        # copy out of the map, so pages can be dropped once the chunk's built
+        tiles = np.array(self.tiles[cy * c : (cy + 1) * c, cx * c : (cx + 1) * c])
+        rows, cols = tiles.shape
+        rect = pygame.Rect(cx * c * t, cy * c * t, cols * t, rows * t)
+
+        image = None
+        if tiles.any():
+            pixels = self.palette[tiles].repeat(t, axis=0).repeat(t, axis=1)
+            image = pygame.image.frombytes(pixels.tobytes(), rect.size, "RGBA")
+
+        i = cy * self.chunks_x + cx
+        start, end = self.chunk_starts[i : i + 2].tolist()
+        boxes = (self.boxes[start:end] * t).tolist()
+        colliders = [TileCollider(pygame.Rect(box), self.friction) for box in boxes]
+        return Chunk(key, rect, image, colliders)
+
+
+@dataclasses.dataclass
+class StreamUpdate:
+    """Chunks that came and went in a `ChunkStreamer.update`
+
+    Args:
+        loaded (List[Chunk]): chunks to add to the scene
+        evicted (List[Chunk]): chunks to remove from the scene
+    """
+
+    loaded: List[Chunk]
+    evicted: List[Chunk]
+
+
+class ChunkStreamer:
+    """Keeps the chunks of a tilemap around an area loaded
+
+    Chunks overlapping the area passed to `update` are required: any that
+    aren't loaded yet are built on the spot. Chunks within `load_radius`
+    chunks of it are built ahead of time on a worker thread, and loaded
+    chunks further than `evict_radius` away are evicted, so the number of
+    resident chunks is bounded by the size of the area.
+
+    Args:
+        tilemap (TileMap): map to stream
+        load_radius (int): chunks around the area to load in the background
+        evict_radius (int): chunks around the area to keep loaded; at least
+            `load_radius`, so chunks at the edge don't thrash
+        background (bool): build chunks on a worker thread; otherwise only
+            required chunks are built, on the caller's thread
+    """
+
+    def __init__(
+        self,
+        tilemap: TileMap,
+        load_radius: int = DEFAULT_LOAD_RADIUS,
+        evict_radius: int = DEFAULT_EVICT_RADIUS,
+        background: bool = True,
+    ):
+        self.tilemap = tilemap
+        self.load_radius = load_radius
+        self.evict_radius = max(evict_radius, load_radius)
+        self.background = background
+        self.chunks: Dict[ChunkKey, Chunk] = {}
+        self._pending: Dict[ChunkKey, Future] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def resident_bytes(self) -> int:
+        """Pixel memory held by loaded chunk images"""
+        return sum(chunk.resident_bytes for chunk in self.chunks.values())
+
+    def update(self, area: pygame.Rect) -> StreamUpdate:
+        """Loads and evicts chunks around area
+
+        Args:
+            area (pygame.Rect): part of the world that must be loaded, in
+                pixels
+
+        Returns:
+            StreamUpdate: chunks loaded and evicted since the last update
+        """
+        tilemap = self.tilemap
+        left, top, right, bottom = tilemap.chunk_range(area)
+        loaded = []
+
+        # collect finished background builds, then build required chunks
+        # that are still missing
+        for key, future in list(self._pending.items()):
+            if future.done():
+                del self._pending[key]
+                loaded.append(self._add(future.result()))
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                key = (cx, cy)
+                if key in self.chunks:
+                    continue
+                future = self._pending.pop(key, None)
+                if future is not None and not future.cancel():
+                    chunk = future.result()
+                else:
+                    chunk = tilemap.build_chunk(key)
+                loaded.append(self._add(chunk))
+
+        if self.background:
+            r = self.load_radius
+            for cx in range(max(0, left - r), min(tilemap.chunks_x, right + r + 1)):
+                for cy in range(max(0, top - r), min(tilemap.chunks_y, bottom + r + 1)):
+                    key = (cx, cy)
+                    if key not in self.chunks and key not in self._pending:
+                        self._pending[key] = self._submit(key)
+
+        r = self.evict_radius
+
+        def far(key: ChunkKey) -> bool:
+            cx, cy = key
+            return not (left - r <= cx <= right + r and top - r <= cy <= bottom + r)
+
+        # chunks loaded this update that are already too far are dropped
+        # without ever being reported
+        fresh = {chunk.key for chunk in loaded}
+        evicted = []
+        for key in [key for key in self.chunks if far(key)]:
+            chunk = self.chunks.pop(key)
+            if key not in fresh:
+                evicted.append(chunk)
+        for key in [key for key in self._pending if far(key)]:
+            self._pending.pop(key).cancel()
+        loaded = [chunk for chunk in loaded if chunk.key in self.chunks]
+        return StreamUpdate(loaded, evicted)
+
+    def close(self) -> List[Chunk]:
+        """Stops the worker and returns the chunks that were loaded"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+        chunks = list(self.chunks.values())
+        self.chunks.clear()
+        return chunks
+
+    def _add(self, chunk: Chunk) -> Chunk:
+        self.chunks[chunk.key] = chunk
+        return chunk
+
+    def _submit(self, key: ChunkKey) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="chunk-streamer")
+        return self._executor.submit(self.tilemap.build_chunk, key)
+
+
+__all__ = [
+    "FORMAT_VERSION",
+    "MAGIC",
+    "Chunk",
+    "ChunkStreamer",
+    "StreamUpdate",
+    "TileCollider",
+    "TileMap",
+    "TileMapFormatError",
+    "default_palette",
+    "save",
+]
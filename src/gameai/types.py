@@ -22,3 +22,16 @@ class VerticalAlign(enum.Enum):
     TOP = 0
     CENTRE = 1
     BOTTOM = 2
+
+
+class ScaleMode(enum.Enum):
+    """Filter used to present the fixed-size draw surface on screen
+
+    SMOOTH scales with bilinear filtering. NEAREST uses nearest-neighbour
+    sampling, which is much cheaper. INTEGER only scales by whole multiples
+    using nearest-neighbour sampling and letterboxes the remaining space.
+    """
+
+    SMOOTH = "smooth"
+    NEAREST = "nearest"
+    INTEGER = "integer"
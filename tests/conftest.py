@@ -0,0 +1,32 @@
+import os
+import tempfile
+
+# set before pygame and gameai are imported, so tests never open a window
+# or write to the user's settings cache
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("GAMEAI_CACHE_DIR", tempfile.mkdtemp(prefix="gameai-tests-"))
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+
+from gameai import config  # noqa: E402
+from gameai.scenes import scene  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def headless():
+    pygame.display.init()
+    pygame.font.init()
+    config.Loadable.preload_settings()
+    yield
+    pygame.quit()
+
+
+@pytest.fixture
+def scene_stack():
+    """Empties the scene stack and the loadable cache after a test"""
+    yield
+    stack = getattr(scene, "__scenes")
+    while stack:
+        config.loadable_cache.unpin(stack.popleft())
+    config.loadable_cache.clear()
@@ -0,0 +1,141 @@
+import pygame
+from edbt import Status
+from edbt.nodes import Selector, Sequencer
+
+from gameai.behaviour import (
+    Action,
+    BehaviourAgent,
+    BehaviourRuntime,
+    Blackboard,
+    Check,
+    Guard,
+    OnEvent,
+    WaitFor,
+)
+
+
+def _composite(cls, *children):
+    node = cls()
+    for child in children:
+        node.add_child(child)
+    return node
+
+
+def _eat(agent: BehaviourAgent):
+    agent.blackboard["meals"] = agent.blackboard.get("meals", 0) + 1
+    agent.blackboard["hungry"] = False
+
+
+def _flee(agent: BehaviourAgent):
+    agent.blackboard["fled"] = agent.blackboard.get("fled", 0) + 1
+
+
+def _hungry_agent() -> BehaviourAgent:
+    return BehaviourAgent(
+        _composite(
+            Selector,
+            Guard("threatened", _composite(Sequencer, Action(_flee), WaitFor("safe"))),
+            _composite(Sequencer, WaitFor("hungry"), Check("hungry"), Action(_eat)),
+        )
+    )
+
+
+def test_blackboard_only_notifies_on_change():
+    blackboard = Blackboard(hungry=False)
+    changes = []
+    blackboard.add_observer("hungry", changes.append)
+    blackboard["hungry"] = False
+    blackboard["hungry"] = True
+    blackboard["hungry"] = True
+    assert changes == [True]
+
+
+def test_idle_agents_are_not_ticked():
+    runtime = BehaviourRuntime()
+    agents = [_hungry_agent() for _ in range(10)]
+    for agent in agents:
+        runtime.add(agent)
+    # every new tree gets one tick to reach the leaf it waits on
+    assert runtime.tick() == 10
+    assert runtime.tick() == 0
+    assert all(agent.status is Status.RUNNING for agent in agents)
+
+    agents[3].blackboard["hungry"] = True
+    assert runtime.tick() == 1
+    assert agents[3].blackboard["meals"] == 1
+    # the finished tree restarts and goes back to waiting
+    assert runtime.tick() == 1
+    assert runtime.tick() == 0
+    assert runtime.stats.wakes_per_tick == 12 / 5
+
+
+def test_wait_for_ignores_changes_that_fail_its_predicate():
+    runtime = BehaviourRuntime()
+    agent = BehaviourAgent(
+        _composite(Sequencer, WaitFor("hunger", lambda v: v > 5), Action(_eat))
+    )
+    runtime.add(agent)
+    agent.blackboard["hunger"] = 0
+    runtime.tick()
+
+    agent.blackboard["hunger"] = 3
+    assert runtime.tick() == 0
+    agent.blackboard["hunger"] = 6
+    assert runtime.tick() == 1
+    assert agent.blackboard["meals"] == 1
+
+
+def test_guard_preempts_lower_priority_branch():
+    runtime = BehaviourRuntime()
+    agent = _hungry_agent()
+    runtime.add(agent)
+    runtime.tick()
+
+    agent.blackboard["threatened"] = True
+    # the threat wakes the agent before it ever gets hungry
+    assert runtime.tick() == 1
+    assert agent.blackboard["fled"] == 1
+    agent.blackboard["hungry"] = True
+    assert runtime.tick() == 0
+    assert "meals" not in agent.blackboard
+
+    # once the threat passes, the guard interrupts its own branch
+    agent.blackboard["threatened"] = False
+    runtime.tick()
+    assert agent.blackboard["meals"] == 1
+
+
+def test_on_event_subscribes_while_running():
+    runtime = BehaviourRuntime()
+    keys = []
+    wait = OnEvent(pygame.KEYDOWN, lambda event: event.key == pygame.K_SPACE)
+    agent = BehaviourAgent(
+        _composite(Sequencer, wait, Action(lambda a: keys.append(wait.event.key))),
+        repeat=False,
+    )
+    runtime.add(agent)
+    runtime.tick()
+
+    runtime.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN))
+    runtime.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+    runtime.tick()
+    assert keys == []
+    runtime.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    runtime.tick()
+    assert keys == [pygame.K_SPACE]
+    assert agent.status is Status.INVALID
+
+    # finished trees that don't repeat stop receiving events
+    runtime.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    assert runtime.tick() == 0
+    # only events with a subscriber are delivered
+    assert runtime.stats.events == 2
+
+
+def test_removed_agents_are_not_ticked():
+    runtime = BehaviourRuntime()
+    agent = _hungry_agent()
+    runtime.add(agent)
+    runtime.remove(agent)
+    assert runtime.tick() == 0
+    assert agent.runtime is None
@@ -0,0 +1,80 @@
+from gameai.config import LoadableCache
+from gameai.config.cache import SETTINGS
+
+
+class Instance:
+    def __init__(self, size: int):
+        self.resident_bytes = size
+        self.unloaded = False
+
+    def unload(self):
+        self.unloaded = True
+
+
+def test_evicts_least_recently_used():
+    cache = LoadableCache(budget_bytes=250)
+    a, b, c = Instance(100), Instance(100), Instance(100)
+    cache.put("a", a)
+    cache.put("b", b)
+    cache.get("a")
+    cache.put("c", c)
+
+    assert "b" not in cache
+    assert b.unloaded
+    assert cache.get("a") is a and cache.get("c") is c
+    assert not a.unloaded and not c.unloaded
+    assert cache.evictions == 1
+
+
+def test_keeps_what_was_just_loaded():
+    cache = LoadableCache(budget_bytes=50)
+    big = Instance(100)
+    cache.put("big", big)
+    assert cache.get("big") is big
+
+
+def test_pinned_instances_are_not_evicted():
+    cache = LoadableCache(budget_bytes=150)
+    a, b = Instance(100), Instance(100)
+    cache.put("a", a)
+    cache.pin(a)
+    cache.pin(a)
+    cache.put("b", b)
+    assert "a" in cache and "b" in cache
+    assert not cache.evict(a)
+    assert [e.pinned for e in cache.stats()] == [True, False]
+
+    # a is still pinned once, so b goes instead
+    cache.unpin(a)
+    cache.trim()
+    assert "a" in cache and "b" not in cache
+
+    # nothing is evicted on unpinning, only on the next load or trim
+    cache.unpin(a)
+    assert "a" in cache
+    cache.put("c", Instance(100))
+    assert "a" not in cache and a.unloaded
+
+
+def test_instances_without_unload_are_not_evicted():
+    cache = LoadableCache(budget_bytes=50)
+    kept = type("Kept", (), {"resident_bytes": 100})()
+    cache.put("kept", kept)
+    cache.put("other", Instance(100))
+    assert "kept" in cache
+
+
+def test_evicts_settings_trees():
+    cache = LoadableCache(budget_bytes=1)
+    cache.put("a.yml", {"fps": 60}, kind=SETTINGS)
+    cache.put("b.yml", {"fps": 60}, kind=SETTINGS)
+    assert "a.yml" not in cache and "b.yml" in cache
+    assert cache.resident_bytes > 0
+
+
+def test_unlimited_budget_never_evicts():
+    cache = LoadableCache()
+    for i in range(10):
+        cache.put(str(i), Instance(10**9))
+    assert len(cache) == 10
+    assert cache.evictions == 0
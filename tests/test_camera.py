@@ -0,0 +1,84 @@
+import dataclasses
+
+import pygame
+import pytest
+
+from gameai import config
+from gameai.camera import CULL_MARGIN, Camera
+from gameai.game import GAME_HEIGHT, GAME_WIDTH
+from gameai.scenes.cat import CatGame
+from gameai.sprites import cat
+
+pytestmark = pytest.mark.usefixtures("scene_stack")
+
+SCREENS = 5
+
+
+def test_look_at_centres_within_bounds():
+    camera = Camera(
+        config.CameraSettings(
+            pygame.Rect(0, 0, 100, 50), bounds=pygame.Rect(0, 0, 1000, 50)
+        )
+    )
+    assert camera.look_at((500.4, 25))
+    assert camera.viewport.center == (500, 25)
+    assert camera.offset == (-450, 0)
+    assert not camera.look_at((500, 25))
+
+    assert camera.look_at((10, 300))
+    assert camera.viewport.topleft == (0, 0)
+    assert camera.look_at((990, 0))
+    assert camera.viewport.right == 1000
+
+    margin = 2 * CULL_MARGIN
+    assert camera.visible_area == camera.viewport.inflate(margin, margin)
+
+
+def test_unbounded_cameras_scroll_freely():
+    camera = Camera(config.CameraSettings(pygame.Rect(0, 0, 100, 50)))
+    camera.look_at((-500, -500))
+    assert camera.viewport.center == (-500, -500)
+
+
+def _game() -> CatGame:
+    width = SCREENS * GAME_WIDTH
+    camera = config.CameraSettings(
+        pygame.Rect(0, 0, GAME_WIDTH, GAME_HEIGHT),
+        bounds=pygame.Rect(0, 0, width, GAME_HEIGHT),
+    )
+    settings = dataclasses.replace(CatGame._load_settings(), camera=camera)
+    game = CatGame(settings, pygame.Surface((GAME_WIDTH, GAME_HEIGHT)))
+    # a character every 100px across the level
+    for x in range(0, width, 100):
+        character = cat.Player.new()
+        character.rect = character.rect.move(x - character.rect.x, 0)
+        game.characters.add(character)
+        game.physics.add(character)
+    return game
+
+
+def _in_view(game: CatGame):
+    area = game.camera.visible_area
+    return {c for c in game.characters if c.rect.colliderect(area)}
+
+
+def test_only_characters_in_view_are_drawn():
+    game = _game()
+    game.draw()
+    visible = set(game.visible)
+    assert game.player in visible
+    assert visible == _in_view(game)
+    assert set(game.sprites.sprites()) == visible
+    assert len(visible) < len(game.characters)
+    for character in visible:
+        assert character.draw_rect == character.rect.move(game.camera.offset)
+
+    # following the player to the far end swaps the drawn characters over
+    player = game.player
+    player.rect = player.rect.move(SCREENS * GAME_WIDTH - player.rect.right, 0)
+    game.draw()
+    assert game.camera.viewport.right == SCREENS * GAME_WIDTH
+    assert set(game.visible) == _in_view(game)
+    assert set(game.sprites.sprites()) == set(game.visible)
+    assert not (visible - {player}) & set(game.visible)
+    game.unload()
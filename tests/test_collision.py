@@ -0,0 +1,93 @@
+import random
+
+import pygame
+
+from gameai import config
+from gameai.sprites import Collision2D, SpatialHash
+
+
+class _Collidable:
+    def __init__(self, x: int, y: int, width: int = 48, height: int = 16):
+        rect = pygame.Rect(x, y, width, height)
+        self.rect = rect
+        self.collision_box = config.CollisionBox(True, True, True, True, rect.copy())
+        self.last_pos = rect.topleft
+
+    def move_to(self, x: int, y: int):
+        self.last_pos = self.collision_box.rect.topleft
+        self.collision_box.rect.topleft = (x, y)
+
+
+def test_query_returns_objects_in_overlapping_cells():
+    near, far = _Collidable(10, 10), _Collidable(500, 500)
+    index = SpatialHash(cell_size=64)
+    index.insert(near, far)
+
+    assert len(index) == 2
+    assert near in index and far in index
+    assert index.query(pygame.Rect(0, 0, 32, 32)) == [near]
+    assert index.query(pygame.Rect(480, 480, 32, 32)) == [far]
+    assert index.query(pygame.Rect(200, 200, 32, 32)) == []
+
+
+def test_query_is_in_insertion_order_within_a_cell():
+    objects = [_Collidable(x, 0, 8, 8) for x in (40, 0, 30, 10)]
+    index = SpatialHash(cell_size=64)
+    index.insert(*objects)
+
+    assert index.query(pygame.Rect(0, 0, 64, 64)) == objects
+
+
+def test_update_rebuckets_moved_objects():
+    obj = _Collidable(10, 10)
+    index = SpatialHash(cell_size=64)
+    index.insert(obj)
+
+    obj.move_to(300, 300)
+    index.update(obj)
+
+    assert index.query(pygame.Rect(0, 0, 32, 32)) == []
+    assert index.query(pygame.Rect(300, 300, 8, 8)) == [obj]
+    # inserting again updates rather than duplicating
+    obj.move_to(10, 10)
+    index.insert(obj)
+    assert len(index) == 1
+    assert index.query(pygame.Rect(0, 0, 32, 32)) == [obj]
+
+
+def test_remove_and_clear():
+    a, b = _Collidable(10, 10), _Collidable(20, 10)
+    index = SpatialHash(cell_size=64)
+    index.insert(a, b)
+
+    index.remove(a)
+    index.remove(a)
+    assert a not in index
+    assert index.query(pygame.Rect(0, 0, 64, 64)) == [b]
+
+    index.clear()
+    assert len(index) == 0
+    assert index.query(pygame.Rect(0, 0, 64, 64)) == []
+
+
+def test_between_matches_linear_scan():
+    rng = random.Random(0)
+    surfaces = [
+        _Collidable(col * 64 + rng.randrange(16), row * 64 + rng.randrange(48))
+        for row in range(20)
+        for col in range(20)
+    ]
+    index = SpatialHash()
+    index.insert(*surfaces)
+    target = _Collidable(0, 0, 32, 32)
+
+    hits = 0
+    for _ in range(500):
+        dest = rng.choice(surfaces).collision_box.rect
+        target.last_pos = (dest.x + rng.randrange(-20, 20), dest.y - 20)
+        target.collision_box.rect.topleft = (dest.x, dest.y - 10)
+        linear = Collision2D.between(target, surfaces)
+        assert Collision2D.between(target, index) == linear
+        hits += linear.bottom is not None
+    # make sure the walk actually collides with something
+    assert hits
@@ -0,0 +1,26 @@
+import pygame
+import pytest
+
+from gameai.controls import KeyState
+
+
+def test_press_and_release():
+    keys = KeyState()
+    keys.press(pygame.K_LEFT)
+    keys.set(pygame.K_SPACE, True)
+    assert keys[pygame.K_LEFT] and keys[pygame.K_SPACE]
+    assert not keys[pygame.K_RIGHT]
+    # keys that aren't controls always read as released
+    assert not keys[pygame.K_a]
+
+    keys.release(pygame.K_LEFT)
+    assert keys == KeyState.from_pressed(
+        {pygame.K_LEFT: False, pygame.K_RIGHT: False, pygame.K_SPACE: True}
+    )
+    keys.clear()
+    assert keys == KeyState()
+
+
+def test_is_unhashable():
+    with pytest.raises(TypeError):
+        {KeyState()}
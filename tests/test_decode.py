@@ -0,0 +1,149 @@
+import dataclasses
+import enum
+from inspect import isclass, signature
+from types import UnionType
+from typing import Any, Dict, List, Union, get_args, get_origin
+
+import pytest
+
+# every Loadable with a settings file has to be imported to be found
+import gameai.game  # noqa: F401
+import gameai.scenes.cat  # noqa: F401
+import gameai.scenes.menu  # noqa: F401
+import gameai.sprites.cat  # noqa: F401
+from gameai import config
+from gameai.config import io
+from gameai.config.settings_cache import SETTINGS_DIR
+
+
+def _legacy_from_config(cls, data: dict):
+    """Decodes data the way Configurable.from_config did before decoder plans"""
+    cls_fields = {field for field in signature(cls).parameters}
+
+    data = data or {}
+    defined_params, undefined_params = {}, {}
+    for k, v in data.items():
+        if k in cls_fields:
+            defined_params[k] = v
+        else:
+            undefined_params[k] = v
+
+    o = cls(**defined_params)
+    for k, v in undefined_params.items():
+        setattr(o, k, v)
+    for field in dataclasses.fields(o):
+        setattr(o, field.name, _legacy_field(field.type, getattr(o, field.name)))
+    return o
+
+
+def _legacy_field(type_, value) -> Any:
+    if value is None:
+        return None
+
+    if isinstance(value, config.Configurable):
+        return value
+    elif get_origin(type_) in (Union, UnionType):
+        for t in get_args(type_):
+            if isclass(t):
+                o = _legacy_class(t, value)
+                if o is not None:
+                    return o
+    elif isclass(type_):
+        instance = _legacy_class(type_, value)
+        if instance is not None:
+            return instance
+
+    if isinstance(value, list):
+        type_ = type_.__args__[0]
+        return list(_legacy_field(type_, o) for o in value)
+    elif isinstance(value, dict):
+        if hasattr(type_, "__args__") and len(type_.__args__) == 2:
+            return {k: _legacy_field(type_.__args__[1], v) for k, v in value.items()}
+        else:
+            return {k: v for k, v in value.items()}
+    return value
+
+
+def _legacy_class(type_: type, value: Any) -> Any:
+    if issubclass(type_, enum.Enum):
+        return type_(value)
+    elif issubclass(type_, config.Configurable):
+        return _legacy_from_config(type_, value)
+    # fonts, images and rects are decoded by the same shared registries
+    # either way, so results can be compared
+    decode = io._class_decoder(type_)
+    return decode(value) if decode is not None else None
+
+
+def _loadables(cls=config.Loadable) -> List[type]:
+    subclasses = []
+    for sub in cls.__subclasses__():
+        subclasses += [sub, *_loadables(sub)]
+    return subclasses
+
+
+def _settings_types() -> Dict[str, type]:
+    return {
+        cls.settings_file: cls.settings_type
+        for cls in _loadables()
+        if cls.__module__.startswith("gameai.") and hasattr(cls, "settings_file")
+    }
+
+
+def _assert_same(planned, legacy):
+    assert type(planned) is type(legacy)
+    assert planned == legacy
+    if dataclasses.is_dataclass(planned):
+        # settings the class doesn't declare are kept as attributes
+        assert vars(planned).keys() == vars(legacy).keys()
+        for name, value in vars(planned).items():
+            _assert_same(value, vars(legacy)[name])
+    elif isinstance(planned, list):
+        for a, b in zip(planned, legacy, strict=True):
+            _assert_same(a, b)
+    elif isinstance(planned, dict):
+        for k, v in planned.items():
+            _assert_same(v, legacy[k])
+
+
+def test_every_settings_file_has_a_type():
+    files = {path.name for path in SETTINGS_DIR.glob("*.yml")}
+    assert files
+    assert files <= _settings_types().keys()
+
+
+@pytest.mark.parametrize(
+    "filename", sorted(path.name for path in SETTINGS_DIR.glob("*.yml"))
+)
+def test_plans_decode_settings_like_reflection(filename):
+    settings_type = _settings_types()[filename]
+    data = config.settings_cache.load(filename)
+    _assert_same(
+        settings_type.from_config(data), _legacy_from_config(settings_type, data)
+    )
+
+
+@dataclasses.dataclass
+class _Nested(config.Configurable):
+    surfaces: List[config.SurfaceSettings] = dataclasses.field(default_factory=list)
+    by_name: Dict[str, config.CollisionBox] = dataclasses.field(default_factory=dict)
+    optional: config.CollisionBox | None = None
+    tags: List[str] = dataclasses.field(default_factory=list)
+
+
+def test_plans_decode_containers_like_reflection():
+    box = {"top": True, "left": False, "right": True, "bottom": False}
+    data = {
+        "surfaces": [
+            {"topleft": [1, 2], "width": 3, "height": 4, "collision_box": box}
+        ],
+        "by_name": {"floor": box},
+        "optional": box,
+        "tags": ["a", "b"],
+        "undeclared": {"kept": [1]},
+    }
+    planned = _Nested.from_config(data)
+    _assert_same(planned, _legacy_from_config(_Nested, data))
+    assert planned.undeclared == {"kept": [1]}
+    # decoded containers are copies, not the input's own lists and dicts
+    assert planned.tags is not data["tags"]
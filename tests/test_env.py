@@ -0,0 +1,69 @@
+import numpy as np
+import pygame
+import pytest
+
+from gameai.controls import CONTROL_KEYS
+from gameai.env import (
+    FRAME_SHAPE,
+    NUM_ACTIONS,
+    STATE_SIZE,
+    CatGameEnv,
+    VectorCatGameEnv,
+)
+
+pytestmark = pytest.mark.usefixtures("scene_stack")
+
+
+def test_step_requires_reset():
+    env = CatGameEnv()
+    with pytest.raises(pygame.error):
+        env.step(0)
+
+
+def test_state_observations():
+    env = CatGameEnv()
+    obs, info = env.reset()
+    assert obs["state"].shape == (STATE_SIZE,)
+    assert obs["state"].dtype == np.float32
+    assert "pixels" not in obs and info == {}
+
+    x = obs["state"][0]
+    obs, reward, terminated, truncated, _ = env.step(CONTROL_KEYS[pygame.K_RIGHT])
+    assert reward == obs["state"][0] - x
+    assert not terminated and not truncated
+    env.close()
+
+
+def test_pixels_are_views_of_the_frame_buffer():
+    env = CatGameEnv(pixels=True)
+    obs, _ = env.reset()
+    pixels = obs["pixels"]
+    assert pixels.shape == FRAME_SHAPE[:2] + (3,)
+    # the frame is drawn into the buffer, not copied into the observation
+    assert np.shares_memory(pixels, env._frame)
+    obs, *_ = env.step(0)
+    assert obs["pixels"] is not pixels and np.shares_memory(obs["pixels"], pixels)
+    drawn = pygame.surfarray.array3d(env.screen).transpose(1, 0, 2)
+    assert (obs["pixels"] == drawn).all()
+    env.close()
+
+
+def test_vector_env_batches_and_resets():
+    env = VectorCatGameEnv(3, pixels=True, max_steps=4)
+    obs, _ = env.reset(seed=0)
+    assert obs["state"].shape == (3, STATE_SIZE)
+    assert obs["pixels"].shape == (3, *FRAME_SHAPE[:2], 3)
+    for i, sub_env in enumerate(env.envs):
+        assert np.shares_memory(sub_env._state, env.states[i : i + 1])
+
+    rng = np.random.default_rng(0)
+    for _ in range(4):
+        obs, rewards, terminated, truncated, info = env.step(
+            rng.integers(NUM_ACTIONS, size=3)
+        )
+        assert rewards.shape == (3,)
+    # every episode was truncated and has started over
+    assert truncated.all()
+    assert sorted(info["final_state"]) == [0, 1, 2]
+    assert all(sub_env.steps == 0 for sub_env in env.envs)
+    env.close()
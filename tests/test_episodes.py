@@ -0,0 +1,39 @@
+import dataclasses
+
+import pytest
+
+from gameai.episodes import Episode, EpisodeRunner, run_episode, seeded_episodes
+
+pytestmark = pytest.mark.usefixtures("scene_stack")
+
+STEPS = 60
+
+
+def _outcome(result):
+    # timings and the worker that ran the episode vary between runs
+    return dataclasses.replace(result, elapsed=0, worker=0)
+
+
+def test_episodes_are_reproducible():
+    first = run_episode(Episode(3, STEPS))
+    assert _outcome(run_episode(Episode(3, STEPS))) == _outcome(first)
+    assert (first.seed, first.steps) == (3, STEPS)
+    assert first.distance > 0
+
+
+def test_seeded_episodes():
+    assert list(seeded_episodes(3, steps=10, seed=5)) == [
+        Episode(5, 10),
+        Episode(6, 10),
+        Episode(7, 10),
+    ]
+
+
+def test_runner_matches_running_in_process():
+    episodes = list(seeded_episodes(4, STEPS))
+    with EpisodeRunner(workers=2) as runner:
+        results = sorted(runner.run(episodes), key=lambda r: r.seed)
+
+    assert [_outcome(r) for r in results] == [
+        _outcome(run_episode(e)) for e in episodes
+    ]
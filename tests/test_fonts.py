@@ -0,0 +1,39 @@
+import pygame
+import pytest
+
+from gameai.config import FontRegistry
+
+
+@pytest.fixture(autouse=True)
+def fonts():
+    pygame.font.init()
+
+
+def test_reuses_fonts():
+    registry = FontRegistry()
+    font = registry.get("freesans", 12)
+    assert registry.get("freesans", 12) is font
+    assert registry.get("freesans", 12, bold=True) is not font
+    assert (registry.stats.hits, registry.stats.misses) == (1, 2)
+    assert len(registry) == 2
+
+
+def test_lists_and_generators_share_a_key(monkeypatch):
+    names = []
+
+    def sys_font(name, size, bold, italic):
+        names.append(name)
+        return pygame.font.Font(None, size)
+
+    monkeypatch.setattr(pygame.font, "SysFont", sys_font)
+    registry = FontRegistry()
+    font = registry.get((n for n in ["dejavusans", "freesans"]), 12)
+    assert names == [("dejavusans", "freesans")]
+    assert registry.get(["dejavusans", "freesans"], 12) is font
+
+
+def test_clear():
+    registry = FontRegistry()
+    font = registry.get(None, 12)
+    registry.clear()
+    assert registry.get(None, 12) is not font
@@ -0,0 +1,149 @@
+import dataclasses
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from gameai import config, scenes
+from gameai.game import Game
+from gameai.scenes.cat import CatGame
+from gameai.types import ScaleMode
+
+pytestmark = pytest.mark.usefixtures("scene_stack")
+
+
+def _game(**kwargs) -> Game:
+    settings = config.GameSettings(60, 640, 360, False, cache_budget_mb=None)
+    return Game(dataclasses.replace(settings, **kwargs), headless=True)
+
+
+def test_simulate_steps_at_the_tick_rate():
+    game = _game(tick_rate=30)
+    cat_game = CatGame.new(screen=game.draw_surface, deterministic=True)
+    stats = game.simulate(45, scene=cat_game)
+    assert stats.steps == 45
+    assert stats.sim_time == pytest.approx(1.5)
+    assert stats.frames_rendered == 0
+
+
+def test_simulate_until():
+    game = _game()
+    stats = game.simulate(until=lambda scene: True, render_every=1)
+    assert (stats.steps, stats.frames_rendered) == (1, 1)
+    with pytest.raises(ValueError):
+        game.simulate()
+
+
+class _Canvas(scenes.Scene):
+    """Scene that reports the rects tests have drawn to as dirty"""
+
+    def __init__(self, screen: pygame.Surface):
+        super().__init__(screen)
+        self.dirty_rects = []
+
+    def draw(self):
+        dirty_rects, self.dirty_rects = self.dirty_rects, []
+        return dirty_rects
+
+    def handle_event(self, event):
+        pass
+
+    def tick(self, dt):
+        pass
+
+    def dirty_all_sprites(self):
+        pass
+
+
+def _canvas(size, mode: ScaleMode):
+    game = _game(screen_width=size[0], screen_height=size[1], scale_mode=mode)
+    canvas = _Canvas(game.draw_surface)
+    scenes.new_scene(canvas)
+    game._rescale()
+    game._render()
+    return game, canvas
+
+
+def _render_both(game: Game, canvas: _Canvas, rects):
+    """Renders the dirty rects, then the full frame, and returns both"""
+    canvas.dirty_rects = rects
+    game._render()
+    dirty = pygame.surfarray.array3d(game.screen).astype(int)
+    game._full_redraw = True
+    game._render()
+    return dirty, pygame.surfarray.array3d(game.screen).astype(int)
+
+
+@pytest.mark.parametrize(
+    "size, mode, scaled_size",
+    [
+        ((1000, 700), ScaleMode.SMOOTH, (1000, 562)),
+        ((1000, 700), ScaleMode.NEAREST, (1000, 562)),
+        # integer scaling letterboxes rather than scaling by 1.5625
+        ((1000, 700), ScaleMode.INTEGER, (640, 360)),
+        ((2000, 1200), ScaleMode.INTEGER, (1920, 1080)),
+        # windows smaller than the draw surface are shrunk to fit
+        ((320, 240), ScaleMode.INTEGER, (320, 180)),
+    ],
+)
+def test_presentation_size(size, mode, scaled_size):
+    game, _ = _canvas(size, mode)
+    assert game._aspect_surface.get_size() == scaled_size
+    assert game._get_aspect_rect().center == game.screen.get_rect().center
+
+
+@pytest.mark.parametrize(
+    "size, mode",
+    [
+        ((1280, 720), ScaleMode.NEAREST),
+        ((1000, 700), ScaleMode.NEAREST),
+        ((1366, 768), ScaleMode.NEAREST),
+        ((1920, 1080), ScaleMode.INTEGER),
+        ((1000, 700), ScaleMode.INTEGER),
+    ],
+)
+def test_dirty_rects_match_full_frame(size, mode):
+    game, canvas = _canvas(size, mode)
+    rng = random.Random(0)
+    for _ in range(10):
+        rects = []
+        for _ in range(3):
+            rect = pygame.Rect(
+                rng.randrange(600), rng.randrange(320), rng.randint(1, 40), 20
+            )
+            game.draw_surface.fill([rng.randrange(256) for _ in "rgb"], rect)
+            rects.append(rect)
+        dirty, full = _render_both(game, canvas, rects)
+        assert (dirty == full).all()
+
+
+@pytest.mark.parametrize("size", [(1280, 720), (1000, 700), (600, 400)])
+def test_smooth_dirty_rects_update_every_changed_pixel(size):
+    game, canvas = _canvas(size, ScaleMode.SMOOTH)
+    rng = random.Random(0)
+    for _ in range(10):
+        game.draw_surface.fill("black")
+        game._full_redraw = True
+        game._render()
+        rect = pygame.Rect(
+            rng.randrange(600), rng.randrange(320), rng.randint(4, 40), 20
+        )
+        game.draw_surface.fill("white", rect)
+        dirty, full = _render_both(game, canvas, [rect])
+
+        # the filter blurs edges, so everything it touches must be updated
+        assert not ((full > 64) & (dirty == 0)).any()
+        # patches are only scaled on close to the same grid as a full frame,
+        # so pixels can differ by as much as their neighbours do
+        padded = np.pad(full, ((1, 1), (1, 1), (0, 0)), mode="edge")
+        width, height = full.shape[:2]
+        neighbours = np.stack(
+            [
+                padded[x : x + width, y : y + height]
+                for x in range(3)
+                for y in range(3)
+            ]
+        )
+        variation = np.abs(neighbours - full).max(axis=0)
+        assert (np.abs(dirty - full) <= variation).all()
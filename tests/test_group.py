@@ -0,0 +1,189 @@
+import random
+
+import pygame
+import pytest
+
+from gameai.sprites import BatchedDirty, StaticLayer
+
+SIZE = (160, 120)
+
+
+class _Sprite(pygame.sprite.DirtySprite):
+    def __init__(self, color, topleft, size=(12, 12)):
+        super().__init__()
+        self.image = pygame.Surface(size)
+        self.image.fill(color)
+        self.rect = self.image.get_rect(topleft=topleft)
+
+
+def _sprites(count: int, rng: random.Random):
+    return [
+        _Sprite(
+            (rng.randrange(256), rng.randrange(256), rng.randrange(256)),
+            (rng.randrange(-6, SIZE[0]), rng.randrange(-6, SIZE[1])),
+        )
+        for _ in range(count)
+    ]
+
+
+def _full_frame(group: pygame.sprite.LayeredDirty) -> pygame.Surface:
+    # what the frame should look like: every visible sprite in layer order
+    expected = pygame.Surface(SIZE)
+    expected.fill("white")
+    for sprite in group.sprites():
+        if sprite.visible:
+            expected.blit(sprite.image, sprite.rect)
+    return expected
+
+
+def _assert_same(a: pygame.Surface, b: pygame.Surface):
+    assert pygame.image.tobytes(a, "RGB") == pygame.image.tobytes(b, "RGB")
+
+
+def test_first_draw_redraws_everything():
+    screen = pygame.Surface(SIZE)
+    group = BatchedDirty(*_sprites(20, random.Random(0)), background="white")
+    assert group.draw(screen) == [screen.get_rect()]
+    _assert_same(screen, _full_frame(group))
+
+
+def test_clean_frames_draw_nothing():
+    screen = pygame.Surface(SIZE)
+    group = BatchedDirty(*_sprites(20, random.Random(0)), background="white")
+    group.draw(screen)
+    screen.fill("red")
+    assert group.draw(screen) == []
+    # nothing was redrawn over the fill
+    assert screen.get_at((0, 0)) == pygame.Color("red")
+
+
+def test_dirty_frames_match_full_redraws():
+    rng = random.Random(1)
+    screen = pygame.Surface(SIZE)
+    sprites = _sprites(40, rng)
+    group = BatchedDirty(background="white")
+    for i, sprite in enumerate(sprites):
+        group.add(sprite, layer=i % 3)
+    group.draw(screen)
+
+    for _ in range(30):
+        for sprite in rng.sample(sprites, 3):
+            sprite.rect.move_ip(rng.randint(-4, 4), rng.randint(-4, 4))
+            sprite.dirty = 1
+        hidden = rng.choice(sprites)
+        hidden.visible = not hidden.visible
+        areas = group.draw(screen)
+        _assert_same(screen, _full_frame(group))
+        # only the returned areas changed, and they don't overlap
+        for i, area in enumerate(areas):
+            assert area.collidelist(areas[i + 1 :]) == -1
+
+
+def test_removed_sprites_are_cleared():
+    screen = pygame.Surface(SIZE)
+    sprite = _Sprite("black", (10, 10))
+    group = BatchedDirty(sprite, background="white")
+    group.draw(screen)
+    group.remove(sprite)
+    assert group.draw(screen) == [pygame.Rect(10, 10, 12, 12)]
+    _assert_same(screen, _full_frame(group))
+
+
+def test_draw_rect_overrides_rect():
+    screen = pygame.Surface(SIZE)
+    sprite = _Sprite("black", (10, 10))
+    sprite.draw_rect = pygame.Rect(50, 50, 12, 12)
+    group = BatchedDirty(sprite, background="white")
+    group.draw(screen)
+    assert screen.get_at((55, 55)) == pygame.Color("black")
+    assert screen.get_at((15, 15)) == pygame.Color("white")
+
+
+def test_repaint_restores_a_background_image():
+    screen = pygame.Surface(SIZE)
+    background = pygame.Surface(SIZE)
+    background.fill("blue")
+    group = BatchedDirty(_Sprite("black", (10, 10)), background=background)
+    group.draw(screen)
+    screen.fill("red")
+    area = pygame.Rect(0, 0, 20, 20)
+    group.repaint(area)
+    assert group.draw(screen) == [area]
+    assert screen.get_at((0, 0)) == pygame.Color("blue")
+    assert screen.get_at((12, 12)) == pygame.Color("black")
+    assert screen.get_at((30, 30)) == pygame.Color("red")
+
+
+def _baked(layer: StaticLayer) -> pygame.Surface:
+    # what the layer should show: every sprite in layer order, at the origin
+    expected = pygame.Surface(SIZE)
+    expected.fill("white")
+    x, y = layer.origin
+    for sprite in layer.sprites():
+        expected.blit(sprite.image, sprite.rect.move(-x, -y))
+    return expected
+
+
+@pytest.mark.parametrize("chunk_size", [None, 32])
+def test_static_layer_rebakes_changes(chunk_size):
+    rng = random.Random(2)
+    sprites = _sprites(30, rng)
+    layer = StaticLayer(SIZE, background="white", chunk_size=chunk_size)
+    for i, sprite in enumerate(sprites):
+        layer.add(sprite, layer=i % 2)
+    assert layer.refresh() != []
+    _assert_same(layer.image, _baked(layer))
+    assert layer.refresh() == []
+
+    # moves and new images are found without being invalidated
+    sprites[0].rect.move_ip(5, 3)
+    sprites[1].image = sprites[2].image
+    areas = layer.refresh()
+    _assert_same(layer.image, _baked(layer))
+    if chunk_size is not None:
+        assert all(area.width <= chunk_size for area in areas)
+
+    layer.remove(sprites[3])
+    layer.add(_Sprite("black", (40, 40)))
+    layer.refresh()
+    _assert_same(layer.image, _baked(layer))
+
+
+def test_static_layer_in_place_changes_need_invalidating():
+    sprite = _Sprite("black", (10, 10))
+    layer = StaticLayer(SIZE, sprite, background="white")
+    layer.refresh()
+    sprite.image.fill("blue")
+    assert layer.refresh() == []
+    layer.invalidate(sprite)
+    assert layer.refresh() != []
+    assert layer.image.get_at((12, 12)) == pygame.Color("blue")
+
+
+def test_static_layer_scrolls():
+    far = _Sprite("black", (1000, 10))
+    layer = StaticLayer(SIZE, far, background="white", chunk_size=32)
+    layer.refresh()
+    assert layer.image.get_at((0, 10)) == pygame.Color("white")
+    layer.scroll_to((995, 0))
+    # the whole view is re-baked, a chunk at a time
+    areas = layer.refresh()
+    assert sum(area.width * area.height for area in areas) == SIZE[0] * SIZE[1]
+    assert all(area.width <= 32 and area.height <= 32 for area in areas)
+    _assert_same(layer.image, _baked(layer))
+    assert layer.image.get_at((5, 10)) == pygame.Color("black")
+
+
+def test_static_layer_as_a_batched_background():
+    screen = pygame.Surface(SIZE)
+    layer = StaticLayer(SIZE, _Sprite("black", (10, 10)), background="white")
+    layer.refresh()
+    group = BatchedDirty(_Sprite("red", (50, 50)), background=layer.image)
+    group.draw(screen)
+    assert screen.get_at((12, 12)) == pygame.Color("black")
+
+    layer.add(_Sprite("blue", (80, 80)))
+    group.repaint(*layer.refresh())
+    group.draw(screen)
+    assert screen.get_at((82, 82)) == pygame.Color("blue")
+    assert screen.get_at((52, 52)) == pygame.Color("red")
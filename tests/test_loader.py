@@ -0,0 +1,111 @@
+import dataclasses
+
+import numpy as np
+import pygame
+import pytest
+
+from gameai import tilemap
+from gameai.game import GAME_HEIGHT, GAME_WIDTH
+from gameai.scenes import (
+    LoadingScene,
+    MainMenu,
+    Scene,
+    SceneLoader,
+    get_active_scene,
+    load_scene,
+    new_scene,
+)
+from gameai.scenes.cat import CatGame
+from gameai.scenes.loader import SETTINGS_FRACTION
+
+pytestmark = pytest.mark.usefixtures("scene_stack")
+
+
+class Blank(Scene):
+    def draw(self):
+        return []
+
+    def handle_event(self, event):
+        pass
+
+    def tick(self, dt):
+        pass
+
+    def dirty_all_sprites(self):
+        pass
+
+
+def _screen() -> pygame.Surface:
+    return pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
+
+
+def _fail(report):
+    raise pygame.error("no such file")
+
+
+def test_reports_stages():
+    progress = []
+    loader = SceneLoader(
+        lambda report: load_scene(CatGame, report, screen=_screen()),
+        progress.append,
+    )
+    game = loader.result(5)
+    assert isinstance(game, CatGame)
+    assert loader.exception() is None
+
+    stages = [p.stage for p in progress]
+    assert stages[:2] == ["settings", "scene"]
+    assert "assets" in stages and stages[-1] == "done"
+    fractions = [p.fraction for p in progress]
+    assert fractions == sorted(fractions)
+    assert fractions[1] == SETTINGS_FRACTION and fractions[-1] == 1.0
+    assert set(progress[-1].timings) >= {"settings", "scene", "assets"}
+    game.unload()
+
+
+def test_reports_each_collider(tmp_path):
+    tiles = np.zeros((40, 100), np.uint8)
+    tiles[20] = 1
+    path = tmp_path / "level.map"
+    tilemap.save(path, tiles, chunk_tiles=8)
+    settings = dataclasses.replace(CatGame._load_settings(), level=str(path))
+
+    reports = []
+    game = CatGame(settings, _screen(), report=lambda *r: reports.append(r))
+    colliders = [f for stage, f in reports if stage == "colliders"]
+    # one report as the stage starts, then one per collision box
+    assert len(colliders) == 1 + len(game.physics.surfaces) > 2
+    assert colliders == sorted(colliders) and colliders[-1] == 1.0
+    game.unload()
+
+
+def test_failed_load_falls_back():
+    loader = SceneLoader(_fail)
+    assert isinstance(loader.exception(5), pygame.error)
+    with pytest.raises(pygame.error):
+        loader.result()
+
+    scene = Blank(_screen())
+    assert loader.result(fallback=lambda: scene) is scene
+
+
+def test_loading_scene_falls_back():
+    new_scene(Blank(_screen()))
+    scene = Blank(_screen())
+    loading = LoadingScene(SceneLoader(_fail), _screen(), lambda: scene)
+    new_scene(loading)
+    loading.loader.exception(5)
+
+    loading.tick(0)
+    assert get_active_scene() is scene
+
+
+def test_play_after_failed_load():
+    menu = MainMenu.new(screen=_screen())
+    menu.show_loading_scene = False
+    menu.game_loader = SceneLoader(_fail)
+    new_scene(menu)
+
+    menu._play()
+    assert isinstance(get_active_scene(), CatGame)
+    assert menu.game_loader is None
@@ -0,0 +1,89 @@
+import random
+
+import pygame
+import pytest
+
+from gameai.controls import KeyState
+from gameai.sprites import Collision2D, PhysicsWorld, cat
+
+STEPS = 300
+
+
+def _state(player, floor):
+    return (
+        tuple(player.rect),
+        tuple(player.velocity),
+        player.jumping,
+        player.standing_on is floor,
+    )
+
+
+def _reference(seed: int):
+    """Steps a lone character the way it moves outside of a physics world"""
+    rng = random.Random(seed)
+    player, floor = cat.Player.new(), cat.Floor.new()
+    states = []
+    for _ in range(STEPS):
+        player.move(KeyState(rng.getrandbits(3)))
+        player.handle_collision(Collision2D.between(player, [floor]))
+        states.append(_state(player, floor))
+    return states
+
+
+# both sides of PhysicsWorld.SMALL_WORLD, which are stepped differently
+@pytest.mark.parametrize("count", [3, 20])
+def test_step_matches_character_move(count):
+    floor = cat.Floor.new()
+    world = PhysicsWorld(capacity=4)
+    world.add_surface(floor)
+    players = [cat.Player.new() for _ in range(count)]
+    for player in players:
+        world.add(player)
+    rngs = [random.Random(seed) for seed in range(count)]
+
+    states = [[] for _ in range(count)]
+    for _ in range(STEPS):
+        for player, rng in zip(players, rngs, strict=True):
+            player.body.controls.mask = rng.getrandbits(3)
+        world.step()
+        for player, player_states in zip(players, states, strict=True):
+            player_states.append(_state(player, floor))
+
+    for seed in range(count):
+        assert states[seed] == _reference(seed)
+
+
+def test_remove_keeps_state():
+    world = PhysicsWorld()
+    world.add_surface(cat.Floor.new())
+    players = [cat.Player.new() for _ in range(3)]
+    for player in players:
+        world.add(player)
+    for _ in range(10):
+        world.step()
+
+    rects = [pygame.Rect(p.rect) for p in players]
+    world.remove(players[0])
+    assert players[0] not in world
+    assert len(world) == 2
+    # the last character moves into the gap, keeping its state
+    assert [p.rect for p in players] == rects
+
+
+def test_bound_rect_is_read_only():
+    world = PhysicsWorld()
+    player = cat.Player.new()
+    world.add(player)
+
+    rect = player.rect
+    with pytest.raises(AttributeError):
+        rect.x += 1
+    with pytest.raises(AttributeError):
+        rect.move_ip(1, 0)
+    # derived rects are ordinary ones
+    moved = rect.move(1, 0)
+    moved.x += 1
+    assert moved.x == rect.x + 2
+
+    player.rect = rect.move(5, 0)
+    assert player.rect.x == rect.x + 5
@@ -0,0 +1,75 @@
+import io
+import random
+
+import pygame
+import pytest
+
+from gameai.controls import CONTROL_KEYS, KeyState
+from gameai.game import GAME_HEIGHT, GAME_WIDTH
+from gameai.replay import Recorder, Replay, ReplayFormatError, replay
+from gameai.scenes.cat import CatGame
+
+TICKS = 300
+
+
+def _record() -> bytes:
+    game = CatGame.new(
+        screen=pygame.Surface((GAME_WIDTH, GAME_HEIGHT)), deterministic=True
+    )
+    log = io.BytesIO()
+    game.recorder = Recorder(log, 1 / 60)
+    # keep the buffer readable after the game closes the recorder
+    log.close = lambda: None
+    rng = random.Random(0)
+    for tick in range(TICKS):
+        if tick % 50 == 0:
+            game.handle_event(
+                pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode="a")
+            )
+            game.handle_event(
+                pygame.event.Event(pygame.MOUSEMOTION, pos=(1.5, 2), rel=(1, 1))
+            )
+        game.step(KeyState(rng.getrandbits(3)))
+    game.unload()
+    return log.getvalue()
+
+
+@pytest.fixture(scope="module")
+def log() -> bytes:
+    return _record()
+
+
+def test_round_trip(log):
+    recorded = Replay.from_bytes(log)
+    assert recorded.dt == 1 / 60
+    assert len(recorded.ticks) == TICKS
+
+    events = recorded.ticks[0].events
+    assert [e.type for e in events] == [pygame.KEYDOWN, pygame.MOUSEMOTION]
+    assert events[0].unicode == "a"
+    assert events[1].pos == (1.5, 2)
+
+    result = replay(recorded)
+    assert result.ticks == TICKS
+    assert result.diverged_at is None
+
+
+def test_detects_flipped_key(log):
+    recorded = Replay.from_bytes(log)
+    record = recorded.ticks[200]
+    record.keys = KeyState(record.keys.mask ^ CONTROL_KEYS[pygame.K_RIGHT])
+
+    result = replay(recorded)
+    assert result.diverged_at == 200
+    assert result.ticks == 201
+    assert result.actual_hash != result.expected_hash
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"not an input log at all", "truncated"], ids=repr
+)
+def test_rejects_invalid_logs(log, data):
+    if data == "truncated":
+        data = log[:-3]
+    with pytest.raises(ReplayFormatError):
+        Replay.from_bytes(data)
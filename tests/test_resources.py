@@ -0,0 +1,54 @@
+import pygame
+import pytest
+
+from gameai.config import AssetManager, surface_bytes
+
+
+@pytest.fixture
+def assets_dir(tmp_path):
+    image = pygame.Surface((4, 2), pygame.SRCALPHA)
+    image.fill("red")
+    pygame.image.save(image, str(tmp_path / "red.png"))
+    return tmp_path
+
+
+def test_shares_loaded_surfaces(assets_dir):
+    manager = AssetManager(assets_dir)
+    surface = manager.get("red.png")
+    assert surface.get_size() == (4, 2)
+    assert manager.get("red.png") is surface
+    assert "red.png" in manager
+
+    stats = manager.stats()
+    assert (stats.hits, stats.misses, stats.preloaded) == (1, 1, 0)
+    assert stats.resident_bytes == surface_bytes(surface)
+
+
+def test_preload_in_background(assets_dir):
+    manager = AssetManager(assets_dir)
+    manager.preload(["red.png"])
+    assert "red.png" in manager
+    assert manager.get("red.png").get_at((0, 0)) == pygame.Color("red")
+
+    stats = manager.stats()
+    assert (stats.hits, stats.misses, stats.preloaded) == (1, 0, 1)
+
+
+def test_failed_preload_is_retried(assets_dir):
+    manager = AssetManager(assets_dir)
+    manager.preload(["missing.png"])
+    with pytest.raises(FileNotFoundError):
+        manager.get("missing.png")
+    assert "missing.png" not in manager
+
+    (assets_dir / "missing.png").write_bytes((assets_dir / "red.png").read_bytes())
+    manager.preload(["missing.png"], background=False)
+    assert manager.get("missing.png").get_size() == (4, 2)
+
+
+def test_clear(assets_dir):
+    manager = AssetManager(assets_dir)
+    surface = manager.get("red.png")
+    manager.clear()
+    assert "red.png" not in manager
+    assert manager.get("red.png") is not surface
@@ -0,0 +1,109 @@
+import time
+
+from gameai.behaviour import ThinkScheduler
+from gameai.config import LODLevel
+
+LOD_LEVELS = (LODLevel(distance=100, interval=1), LODLevel(distance=1000, interval=4))
+
+
+def _scheduler(positions, **kwargs) -> ThinkScheduler:
+    kwargs.setdefault("budget_ms", None)
+    scheduler = ThinkScheduler(lod_levels=LOD_LEVELS, locate=positions.get, **kwargs)
+    scheduler.focus = (0, 0)
+    return scheduler
+
+
+def test_max_thinks_defers_the_rest_in_order():
+    agents = [f"agent{i}" for i in range(5)]
+    scheduler = _scheduler({}, max_thinks=2)
+    for agent in agents:
+        scheduler.request(agent)
+
+    thought = []
+    assert scheduler.run(thought.append) == 2
+    # agents still queued keep their place, others join the back
+    scheduler.request(agents[4])
+    scheduler.request(agents[0])
+    assert scheduler.run(thought.append) == 2
+    assert scheduler.run(thought.append) == 2
+    assert thought == agents + agents[:1]
+    assert scheduler.stats.deferred == 3 + 2
+    assert len(scheduler) == 0
+
+
+def test_near_agents_think_first():
+    positions = {"far": (500, 0), "near": (10, 0)}
+    scheduler = _scheduler(positions, max_thinks=1)
+    scheduler.request("far")
+    scheduler.request("near")
+
+    thought = []
+    scheduler.run(thought.append)
+    scheduler.run(thought.append)
+    assert thought == ["near", "far"]
+    assert scheduler.lod_level("far") == 1
+
+
+def test_far_agents_think_at_their_interval():
+    positions = {"far": (500, 0), "near": (10, 0)}
+    scheduler = _scheduler(positions)
+    frames = {"far": [], "near": []}
+    for _ in range(12):
+        for agent in positions:
+            scheduler.request(agent)
+        scheduler.run(lambda agent: frames[agent].append(scheduler.frame))
+
+    assert frames["near"] == list(range(1, 13))
+    assert frames["far"] == [1, 5, 9]
+    assert scheduler.stats.lod_skipped > 0
+
+    # moving closer takes effect once the agent's current wait ends
+    positions["far"] = (10, 0)
+    for _ in range(4):
+        scheduler.request("far")
+        scheduler.run(lambda agent: frames[agent].append(scheduler.frame))
+    assert frames["far"][-2:] == [15, 16]
+
+
+def test_forgotten_agents_are_skipped():
+    scheduler = _scheduler({})
+    scheduler.request("a")
+    scheduler.request("b")
+    scheduler.forget("a")
+    thought = []
+    assert scheduler.run(thought.append) == 1
+    assert thought == ["b"]
+    assert "a" not in scheduler
+
+
+def test_budget_is_shared_by_ticks_in_a_frame():
+    scheduler = _scheduler({}, budget_ms=1)
+    agents = [f"agent{i}" for i in range(100)]
+
+    def think(agent):
+        time.sleep(0.001)
+
+    for agent in agents:
+        scheduler.request(agent)
+    # a spent budget still lets one agent think, so the queue keeps moving
+    assert scheduler.run(think) == 1
+    assert scheduler.run(think) == 1
+    assert scheduler.stats.overruns == 2
+    scheduler.end_frame()
+    assert scheduler.run(think) == 1
+    assert scheduler.stats.thinks == 3
+    assert len(scheduler) == 97
+
+
+def test_deterministic_without_a_time_budget():
+    def run():
+        scheduler = _scheduler({f"agent{i}": (i * 10, 0) for i in range(50)})
+        scheduler.max_thinks = 7
+        thought = []
+        for frame in range(20):
+            for i in range(frame, 50, 3):
+                scheduler.request(f"agent{i}")
+            scheduler.run(lambda agent: thought.append((scheduler.frame, agent)))
+        return thought
+
+    assert run() == run()
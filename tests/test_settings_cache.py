@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from gameai.config import SettingsCache
+
+
+@pytest.fixture
+def settings_dir(tmp_path):
+    path = tmp_path / "settings"
+    path.mkdir()
+    (path / "game.yml").write_text("fps: 60\nsize: [640, 360]\n")
+    return path
+
+
+def _cache(settings_dir) -> SettingsCache:
+    return SettingsCache(settings_dir, settings_dir.parent / "cache")
+
+
+def test_reuses_parsed_settings(settings_dir):
+    first = _cache(settings_dir)
+    assert first.load("game.yml") == {"fps": 60, "size": [640, 360]}
+    assert (first.hits, first.misses) == (0, 1)
+
+    # a new cache reads the entry back from the cache file
+    second = _cache(settings_dir)
+    assert second.load("game.yml") == {"fps": 60, "size": [640, 360]}
+    assert (second.hits, second.misses) == (1, 0)
+
+
+def test_changed_file_is_parsed_again(settings_dir):
+    _cache(settings_dir).load("game.yml")
+    path = settings_dir / "game.yml"
+    path.write_text("fps: 30\nsize: [640, 360]\n")
+    # make sure the change shows even if the mtime doesn't
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    cache = _cache(settings_dir)
+    assert cache.load("game.yml")["fps"] == 30
+    assert cache.misses == 1
+
+
+def test_touched_file_is_matched_by_hash(settings_dir):
+    _cache(settings_dir).load("game.yml")
+    path = settings_dir / "game.yml"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    cache = _cache(settings_dir)
+    cache.load("game.yml")
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_corrupt_cache_file_is_ignored(settings_dir):
+    cache = _cache(settings_dir)
+    cache.load("game.yml")
+    cache.cache_file.write_bytes(b"\x00not json")
+
+    cache = _cache(settings_dir)
+    assert cache.load("game.yml")["fps"] == 60
+    assert cache.misses == 1
+
+
+def test_settings_json_cant_represent_are_not_cached(settings_dir):
+    (settings_dir / "dates.yml").write_text("released: 2024-01-01\n")
+    _cache(settings_dir).load("dates.yml")
+
+    cache = _cache(settings_dir)
+    assert str(cache.load("dates.yml")["released"]) == "2024-01-01"
+    assert cache.misses == 1
+
+
+def test_forget_reads_the_file_again(settings_dir):
+    cache = _cache(settings_dir)
+    cache.load("game.yml")
+    cache.forget("game.yml")
+    (settings_dir / "game.yml").write_text("fps: 144\n")
+
+    assert cache.load("game.yml") == {"fps": 144}
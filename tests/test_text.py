@@ -0,0 +1,86 @@
+import pygame
+import pytest
+
+from gameai import config
+from gameai.drawing import TextCache, text_cache
+from gameai.sprites import Button
+from gameai.types import Align, VerticalAlign
+
+
+@pytest.fixture
+def font():
+    return pygame.font.Font(None, 16)
+
+
+def test_reuses_rendered_text(font):
+    cache = TextCache()
+    img = cache.render("play", font, True, "white")
+    assert cache.render("play", font, True, "white") is img
+    assert cache.render("play", font, False, "white") is not img
+    assert cache.render("play", font, True, "red") is not img
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert cache.hit_rate == 0.25
+
+
+def test_colours_share_a_key_by_value(font):
+    cache = TextCache()
+    img = cache.render("play", font, True, pygame.Color(255, 0, 0))
+    assert cache.render("play", font, True, [255, 0, 0, 255]) is img
+    assert cache.render("play", font, True, (255, 0, 0, 255)) is img
+
+
+def test_evicts_least_recently_used(font):
+    cache = TextCache(maxsize=2)
+    a = cache.render("a", font, True, "white")
+    cache.render("b", font, True, "white")
+    # using a makes b the least recently used
+    cache.render("a", font, True, "white")
+    cache.render("c", font, True, "white")
+    assert len(cache) == 2
+    assert cache.render("a", font, True, "white") is a
+    misses = cache.misses
+    cache.render("b", font, True, "white")
+    assert cache.misses == misses + 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hit_rate == 0.0
+
+
+def _button(font) -> Button:
+    text_opts = config.TextOptions(
+        font, True, "white", "yellow", Align.CENTRE, VerticalAlign.CENTRE
+    )
+    opts = config.ButtonOptions(
+        text="play", color="black", text_opts=text_opts, width=80, height=20
+    )
+    return Button(opts, on_click=lambda: None)
+
+
+def _drawn(button: Button) -> int:
+    """Updates the button as its group would, and counts text renders"""
+    lookups = text_cache.hits + text_cache.misses
+    button.update()
+    # the group clears the dirty flag once it's blitted the sprite
+    button.dirty = 0
+    return text_cache.hits + text_cache.misses - lookups
+
+
+def test_button_redraws_only_on_change(font):
+    button = _button(font)
+    assert _drawn(button) == 1
+    assert _drawn(button) == 0
+    idle = pygame.image.tobytes(button.image, "RGB")
+
+    button.hovered = True
+    assert _drawn(button) == 1
+    button.hovered = True
+    assert _drawn(button) == 0
+    assert pygame.image.tobytes(button.image, "RGB") != idle
+
+    button.hovered = False
+    assert _drawn(button) == 1
+    assert pygame.image.tobytes(button.image, "RGB") == idle
+    # marking the button dirty, e.g. after a resize, also redraws it
+    button.dirty = 1
+    assert _drawn(button) == 1
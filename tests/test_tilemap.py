@@ -0,0 +1,92 @@
+import numpy as np
+import pygame
+import pytest
+
+from gameai import tilemap
+from gameai.tilemap import ChunkStreamer, TileMap, TileMapFormatError
+
+TILE_SIZE = 4
+CHUNK_TILES = 8
+
+
+@pytest.fixture
+def tiles() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (rng.random((50, 70)) < 0.3).astype(np.uint8) * rng.integers(
+        1, 10, (50, 70), dtype=np.uint8
+    )
+
+
+@pytest.fixture
+def tilemap_path(tmp_path, tiles):
+    path = tmp_path / "level.map"
+    tilemap.save(path, tiles, TILE_SIZE, CHUNK_TILES, friction=0.5)
+    return path
+
+
+def test_save_and_load(tilemap_path, tiles):
+    level = TileMap(tilemap_path)
+    assert (level.width, level.height) == (70, 50)
+    assert (level.chunks_x, level.chunks_y) == (9, 7)
+    assert level.friction == 0.5
+    assert np.array_equal(level.tiles, tiles)
+
+
+def test_chunk_colliders_cover_solid_tiles(tilemap_path, tiles):
+    level = TileMap(tilemap_path)
+    for cx in range(level.chunks_x):
+        for cy in range(level.chunks_y):
+            chunk = level.build_chunk((cx, cy))
+            covered = np.zeros_like(tiles, bool)
+            for collider in chunk.colliders:
+                x, y, w, h = (v // TILE_SIZE for v in collider.rect)
+                # boxes never overlap or cross the chunk's edge
+                assert not covered[y : y + h, x : x + w].any()
+                assert chunk.rect.contains(collider.rect)
+                covered[y : y + h, x : x + w] = True
+            area = np.s_[
+                cy * CHUNK_TILES : (cy + 1) * CHUNK_TILES,
+                cx * CHUNK_TILES : (cx + 1) * CHUNK_TILES,
+            ]
+            assert np.array_equal(covered[area], tiles[area] != 0)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.map"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(TileMapFormatError):
+        TileMap(path)
+
+
+def test_streamer_loads_and_evicts(tilemap_path):
+    level = TileMap(tilemap_path)
+    streamer = ChunkStreamer(level, evict_radius=1, background=False)
+    size = level.chunk_pixels
+
+    update = streamer.update(pygame.Rect(0, 0, size, size))
+    assert {chunk.key for chunk in update.loaded} == {(0, 0)}
+    assert update.evicted == []
+
+    update = streamer.update(pygame.Rect(size * 5, size * 5, size, size))
+    assert {chunk.key for chunk in update.loaded} == {(5, 5)}
+    assert {chunk.key for chunk in update.evicted} == {(0, 0)}
+    assert set(streamer.chunks) == {(5, 5)}
+    assert len(streamer.close()) == 1
+    assert len(streamer) == 0
+
+
+def test_streamer_loads_around_the_area_in_the_background(tilemap_path):
+    level = TileMap(tilemap_path)
+    streamer = ChunkStreamer(level, load_radius=1, evict_radius=1)
+    area = pygame.Rect(level.chunk_pixels * 3, level.chunk_pixels * 3, 1, 1)
+    try:
+        streamer.update(area)
+        for future in list(streamer._pending.values()):
+            future.result()
+        streamer.update(area)
+        assert set(streamer.chunks) == {
+            (x, y) for x in range(2, 5) for y in range(2, 5)
+        }
+    finally:
+        streamer.close()
+    assert streamer._executor is None